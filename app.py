@@ -1,15 +1,18 @@
 import streamlit as st
-import cv2
-import json
 import os
-import tempfile
-import time
 
 # Ensure the app can find the src module since it might be run from the root
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "src")))
 
-from alpamayo_demo.core.policy import AlpamayoPolicy
+from alpamayo_demo.core.cache import DEFAULT_CACHE_PATH, DecisionCache
+from alpamayo_demo.core.policy import AlpamayoPolicy, DEFAULT_GOAL_PROMPT
+from alpamayo_demo.utils.adaptive_sampling import AdaptiveSampler
+from alpamayo_demo.utils.clip_analysis import analyze_clip
+from alpamayo_demo.utils.clip_cache import ClipResultStore, clip_key, file_digest
+from alpamayo_demo.utils.data_loader import open_frame_stream
+from alpamayo_demo.utils.pipeline import BackgroundWorker
+from alpamayo_demo.utils.uploads import SpooledUpload
 
 st.set_page_config(
     page_title="Alpamayo R1 Autonomous Driving",
@@ -26,22 +29,65 @@ st.sidebar.header("Configuration")
 policy_type = st.sidebar.radio("Policy Type", ["Mock (Fast)", "Real Model (Requires API Setup)"])
 is_mock = policy_type == "Mock (Fast)"
 
-fps_input = st.sidebar.slider("Sampling FPS (Frames per second to analyze)", min_value=1, max_value=10, value=1)
+adaptive = st.sidebar.checkbox("Adaptive sampling", value=False,
+                               help="Sample slowly while decisions are stable and quickly when the scene changes")
+if adaptive:
+    fps_low, fps_high = st.sidebar.slider("Adaptive FPS range (calm - volatile)", min_value=0.2, max_value=10.0,
+                                          value=(0.5, 5.0), step=0.1)
+    budget_input = st.sidebar.number_input("Inference budget per clip (0 = unlimited)", min_value=0, value=0, step=5)
+    fps_input = fps_high
+else:
+    fps_input = st.sidebar.slider("Sampling FPS (Frames per second to analyze)", min_value=1, max_value=10, value=1)
 playback_speed = st.sidebar.slider("UI Playback Delay (seconds between frames)", min_value=0.1, max_value=2.0, value=0.5, step=0.1)
 
+use_cache = st.sidebar.checkbox("Reuse cached decisions", value=True,
+                                help=f"Decisions are stored in {DEFAULT_CACHE_PATH}")
+
+@st.cache_resource
+def get_decision_cache():
+    """One persistent decision cache shared by all sessions."""
+    return DecisionCache(DEFAULT_CACHE_PATH)
+
 # Initialize policy in session state to avoid reloading
-if 'policy' not in st.session_state or st.session_state.is_mock != is_mock:
-    st.session_state.policy = AlpamayoPolicy(mock=is_mock)
+if ('policy' not in st.session_state or st.session_state.is_mock != is_mock
+        or st.session_state.use_cache != use_cache):
+    st.session_state.policy = AlpamayoPolicy(mock=is_mock, cache=get_decision_cache() if use_cache else None)
     st.session_state.is_mock = is_mock
+    st.session_state.use_cache = use_cache
 
 # Default video path
 DEFAULT_VIDEO_PATH = "data/sample_video.mp4"
 
+# Frames decoded ahead of the policy on a background thread
+PREFETCH_DEPTH = 4
+
+# Analysed frames are kept for playback as JPEG thumbnails at most this wide
+PLAYBACK_WIDTH = 640
+
+# Newest thumbnails kept for playback and scrubbing; older ones are dropped
+# so long clips do not grow the session without bound
+MAX_PLAYBACK_FRAMES = 2000
+
+# Analyses with more failed decisions than this are not kept for replay
+MAX_ERROR_FRACTION = 0.5
+
+# Finished analyses kept in memory for instant replay
+MAX_CACHED_CLIPS = 8
+
+@st.cache_resource
+def get_result_store():
+    """Finished analyses shared by all sessions, keyed by `clip_key`."""
+    return ClipResultStore(MAX_CACHED_CLIPS)
+
+@st.cache_data(show_spinner="Hashing clip...")
+def clip_digest(path, size, mtime):
+    """Content hash of a clip; size and mtime only invalidate the memo."""
+    return file_digest(path)
+
 # Let user choose a file or use the built-in one
 video_source_option = st.sidebar.radio("Video Source", ["Use Default Sample Video", "Upload custom MP4"])
 
 video_path_to_use = None
-temp_file_obj = None
 
 if video_source_option == "Use Default Sample Video":
     if os.path.exists(DEFAULT_VIDEO_PATH):
@@ -50,120 +96,166 @@ if video_source_option == "Use Default Sample Video":
     else:
         st.sidebar.warning("Default video not found. Run `python scripts/create_sample_video.py` first, or upload a custom one.")
 else:
-    uploaded_file = st.sidebar.file_uploader("Upload a Waymo dashboard clip (MP4)", type=["mp4", "avi", "mov"])
+    uploaded_file = st.sidebar.file_uploader("Upload a Waymo dashboard clip (MP4) or segment (TFRecord)",
+                                             type=["mp4", "avi", "mov", "tfrecord"])
     if uploaded_file is not None:
-        # Save to temp file to read with OpenCV
-        temp_file_obj = tempfile.NamedTemporaryFile(delete=False, suffix='.mp4')
-        temp_file_obj.write(uploaded_file.read())
-        video_path_to_use = temp_file_obj.name
+        # Spool to a temp file for OpenCV once per upload (not on every
+        # rerun), through a bounded buffer. The file is deleted when the
+        # upload is replaced or the session ends. Decoding starts once the
+        # copy is done: Streamlit hands over uploads only when complete.
+        if st.session_state.get("upload_id") != uploaded_file.file_id:
+            if "upload" in st.session_state:
+                st.session_state.upload.close()
+            suffix = os.path.splitext(uploaded_file.name)[1] or ".mp4"
+            st.session_state.upload = SpooledUpload(uploaded_file, suffix=suffix)
+            st.session_state.upload_id = uploaded_file.file_id
+        video_path_to_use = st.session_state.upload.path
         
+def start_playback(worker, total_frames, sampler, key):
+    # Replace any analysis still running from a previous click
+    if 'worker' in st.session_state:
+        st.session_state.worker.stop()
+    st.session_state.worker = worker
+    st.session_state.total_frames = total_frames
+    st.session_state.sampler = sampler
+    st.session_state.analysis_key = key
+    st.session_state.playback_index = 0
+    st.session_state.celebrated = False
+    st.session_state.playback_finished = False
+
 if st.button("Start Analysis") and video_path_to_use:
-    
-    # Load Video
-    cap = cv2.VideoCapture(video_path_to_use)
-    if not cap.isOpened():
-        st.error(f"Failed to open video at {video_path_to_use}")
+
+    # Identical clip + settings + policy: replay the stored analysis
+    stat = os.stat(video_path_to_use)
+    settings = {"fps": fps_input}
+    if adaptive:
+        settings.update(fps_low=fps_low, fps_high=fps_high, budget=budget_input)
+    key = clip_key(clip_digest(video_path_to_use, stat.st_size, stat.st_mtime),
+                   st.session_state.policy.version, **settings)
+    cached = get_result_store().get(key)
+
+    if cached is not None:
+        st.success("Loaded cached analysis for this clip.")
+        start_playback(BackgroundWorker(cached["results"], max_results=MAX_PLAYBACK_FRAMES).start(),
+                       cached["total_frames"], cached["sampler"], key)
     else:
-        # Calculate frame skip
-        orig_fps = cap.get(cv2.CAP_PROP_FPS)
-        if orig_fps <= 0: orig_fps = 30 # fallback
-        frame_interval = max(1, int(orig_fps / fps_input))
-        
-        st.success("Video loaded successfully. Beginning pipeline...")
-        
-        # Prepare layout boxes
-        col1, col2 = st.columns([2, 1])
-        with col1:
-            st.subheader("Front Camera View")
-            video_placeholder = st.empty()
-            
-        with col2:
-            st.subheader("Alpamayo R1 Output")
-            decision_placeholder = st.empty()
-            
+        # Load Video (frames are decoded lazily into a small reusable ring that
+        # covers the prefetch queue plus the frames held by decoder and consumer)
+        try:
+            stream = open_frame_stream(video_path_to_use, sample_fps=fps_input,
+                                       buffer_size=PREFETCH_DEPTH + 2)
+        except ValueError:
+            stream = None
+            st.error(f"Failed to open video at {video_path_to_use}")
+
+        if stream is not None:
+            st.success("Video loaded successfully. Beginning pipeline...")
+            sampler = AdaptiveSampler(fps_low, fps_high, budget=budget_input or None) if adaptive else None
+            # Stopping the worker closes the analysis, which stops its
+            # prefetch thread and releases the stream
+            analysis = analyze_clip(stream, st.session_state.policy, DEFAULT_GOAL_PROMPT, sampler,
+                                    prefetch_depth=PREFETCH_DEPTH, thumbnail_width=PLAYBACK_WIDTH)
+            worker = BackgroundWorker(analysis, max_results=MAX_PLAYBACK_FRAMES)
+            start_playback(worker.start(), stream.total_frames, sampler, key)
+
+# Once analysis is done and playback has shown the last frame, the timer
+# is switched off; the fragment then only reruns on widget interaction
+@st.fragment(run_every=None if st.session_state.get("playback_finished") else playback_speed)
+def playback():
+    """Show the next analysed frame; reruns on its own every `playback_speed` s."""
+    worker = st.session_state.worker
+    total_frames = st.session_state.total_frames
+    # Only the newest MAX_PLAYBACK_FRAMES entries are kept: `results[i]` is
+    # analysed frame `first + i`. `done` is read first, so when it is set
+    # the snapshot holds every result
+    done = worker.done
+    first, results = worker.snapshot()
+    available = first + len(results)
+    if available == 0:
+        st.info("Analysing first frame...")
+        return
+
+    # Pausing turns playback into a timeline over everything analysed so far;
+    # thumbnails are already encoded, so scrubbing is instant
+    paused = st.toggle("Pause and scrub", key="paused")
+    # Playback that fell behind the kept window resumes at its oldest frame
+    index = max(st.session_state.playback_index, first)
+    if paused:
+        index = st.slider("Timeline", min_value=first + 1, max_value=max(available, first + 2),
+                          value=min(max(index, first + 1), available)) - 1
+        st.session_state.playback_index = index
+    elif index < available:
+        st.session_state.playback_index = index + 1
+    shown = min(index, available - 1)
+    entry = results[shown - first]
+    decision = entry["decision"]
+
+    # Analysis runs ahead of playback at full speed
+    last_analyzed = results[-1]["frame_count"]
+    st.progress(min(1.0, float(last_analyzed + 1) / total_frames) if total_frames > 0 else 0.0,
+                text=f"Analysed {available} frames in {worker.elapsed:.1f}s" + (" (done)" if done else ""))
+    st.progress(min(1.0, float(entry["frame_count"] + 1) / total_frames) if total_frames > 0 else 0.0,
+                text=f"Playback: frame {shown + 1} of {available}")
+
+    # Prepare layout boxes
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        st.subheader("Front Camera View")
+        st.image(entry["thumbnail"], use_container_width=True)
+
+    with col2:
+        st.subheader("Alpamayo R1 Output")
+        # Format nicely
+        if "error" in decision:
+            st.error(f"Inference error on frame {entry['frame_count']}: {decision['error']}")
+        else:
             # Use smaller columns for metrics
             mcol1, mcol2 = st.columns(2)
-            metric_decision = mcol1.empty()
-            metric_confidence = mcol2.empty()
-        
-        goal_prompt = """
-        You are an autonomous vehicle driving in an urban environment.
-        Analyze the current scene from the front camera and decide the next action.
-        Consider safety, traffic rules, and smooth driving.
-        Output your decision in the specified JSON format.
-        """
-
-        frame_count = 0
-        analyzed_count = 0
-        
-        # Progress bar
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        progress_bar = st.progress(0)
-        
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-                
-            frame_count += 1
-            
-            # Only process scheduled frames
-            if frame_count % frame_interval != 0:
-                continue
-                
-            analyzed_count += 1
-            
-            # Convert frame for Streamlit
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            # Run inference
-            try:
-                 decision_json = st.session_state.policy.decide(frame, goal_prompt)
-                 decision = json.loads(decision_json)
-                 decision['frame_id'] = analyzed_count
-            except Exception as e:
-                 st.error(f"Inference error on frame {frame_count}: {e}")
-                 decision = {"error": str(e)}
-
-            # Update UI
-            video_placeholder.image(frame_rgb, use_container_width=True, channels="RGB")
-            
-            # Format nicely
-            if "error" not in decision:
-                action_color = "green"
-                if decision.get('decision') in ['stop', 'brake']: action_color = "red"
-                elif decision.get('decision') in ['slow_down', 'yield']: action_color = "orange"
-                
-                metric_decision.metric("Action", decision.get('decision', 'N/A').upper())
-                metric_confidence.metric("Confidence", f"{decision.get('confidence', 0.0):.1%}")
-
-                decision_placeholder.markdown(f"""
-                **Scene:** `{decision.get('scene_type', 'N/A')}`  
-                **Traffic Light:** `{decision.get('traffic_light', 'N/A')}`  
-                **Reasoning:** _{decision.get('reason', 'N/A')}_
-                
-                **Detected Hazards:**
-                {', '.join(decision.get('hazards', [])) if decision.get('hazards') else 'None'}
-                """)
-                
-                # Full JSON expander
-                with decision_placeholder.expander("Show Raw JSON"):
-                    st.json(decision)
-            
-            # Update Progress
-            progress_val = min(1.0, float(frame_count) / total_frames) if total_frames > 0 else 0.0
-            progress_bar.progress(progress_val)
-            
-            # Sleep for UI playback effect (unless it's analyzing a very long real video)
-            time.sleep(playback_speed)
+            mcol1.metric("Action", decision.get('decision', 'N/A').upper())
+            mcol2.metric("Confidence", f"{decision.get('confidence', 0.0):.1%}")
+
+            st.markdown(f"""
+            **Scene:** `{decision.get('scene_type', 'N/A')}`  
+            **Traffic Light:** `{decision.get('traffic_light', 'N/A')}`  
+            **Reasoning:** _{decision.get('reason', 'N/A')}_
             
-        cap.release()
-        st.balloons()
+            **Detected Hazards:**
+            {', '.join(decision.get('hazards', [])) if decision.get('hazards') else 'None'}
+            """)
+
+            # Full JSON expander
+            with st.expander("Show Raw JSON"):
+                st.json(decision)
+
+    if worker.error is not None:
+        st.error(f"Analysis stopped: {worker.error}")
+    elif (done and worker.completed and first == 0 and st.session_state.analysis_key not in get_result_store()
+          and sum("error" in item["decision"] for item in results) <= MAX_ERROR_FRACTION * len(results)):
+        # Only complete, mostly successful analyses are replayed: a clip
+        # whose decisions failed (e.g. the model was down) is analysed
+        # again on the next click instead of replaying the errors
+        get_result_store().put(st.session_state.analysis_key, {
+            "results": results,
+            "total_frames": total_frames,
+            "sampler": st.session_state.sampler,
+        })
+    finished = done and index >= available - 1
+    if finished != st.session_state.playback_finished and not paused:
+        # Switch the timer off at the end (or back on after scrubbing back)
+        st.session_state.playback_finished = finished
+        st.rerun()
+    if finished:
+        if not st.session_state.celebrated:
+            st.session_state.celebrated = True
+            st.balloons()
         st.success("Analysis Complete!")
+        sampler = st.session_state.sampler
+        if sampler is not None:
+            st.caption(f"Adaptive sampling: {sampler.decisions} decisions, "
+                       f"{sampler.volatile_decisions} at the high rate")
+        cache = st.session_state.policy.cache
+        if cache is not None:
+            st.caption(f"Decision cache: {cache.hits} hits, {cache.misses} misses ({cache.hit_rate:.0%})")
 
-# Cleanup temp files
-if temp_file_obj:
-    try:
-        os.unlink(temp_file_obj.name)
-    except:
-        pass
+if 'worker' in st.session_state:
+    playback()
@@ -0,0 +1,39 @@
+"""
+Batch entry point: score many clips in parallel.
+
+Takes a directory of clips or a manifest file (one clip path per line),
+spreads the clips across a process pool with one Alpamayo policy per
+worker, and writes one JSON Lines decision log per clip.
+
+Usage:
+    python batch.py --clips data/ --output_dir logs/ --workers 8 --fps 1 --mock
+    python batch.py --clips nightly_manifest.txt --output_dir logs/
+"""
+
+import argparse
+from alpamayo_demo.utils.batch_runner import discover_clips, run_batch
+from alpamayo_demo.utils.data_loader import SAMPLING_MODES
+
+def main():
+    parser = argparse.ArgumentParser(description="Alpamayo R1 multi-clip batch runner")
+    parser.add_argument("--clips", type=str, default="data", help="Directory of clips or manifest file (default: data)")
+    parser.add_argument("--output_dir", type=str, default="decision_logs", help="Where to write per-clip decision logs")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--fps", type=int, default=1, help="Frames per second to sample")
+    parser.add_argument("--sampling", type=str, default="grab", choices=SAMPLING_MODES,
+                        help="How non-sampled frames are skipped (default: grab)")
+    parser.add_argument("--batch_size", type=int, default=1, help="Maximum frames per policy call")
+    parser.add_argument("--mock", action="store_true", help="Use mock Alpamayo policy")
+    args = parser.parse_args()
+
+    clips = discover_clips(args.clips)
+    if not clips:
+        print(f"No clips found in {args.clips}")
+        return
+
+    report = run_batch(clips, args.output_dir, workers=args.workers, sample_fps=args.fps,
+                       sampling=args.sampling, mock=args.mock, max_batch_size=args.batch_size)
+    print(report.summary())
+
+if __name__ == "__main__":
+    main()
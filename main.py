@@ -6,6 +6,10 @@ It demonstrates perception → reasoning → action → explanation pipeline.
 
 Usage:
     python main.py --video_path path/to/waymo_video.mp4 --fps 1
+    python main.py --video_path path/to/waymo_video.mp4 --output annotated.mp4   # headless
+    python main.py --video_path path/to/waymo_video.mp4 --cache                 # reuse decisions
+    python main.py --video_path path/to/waymo_video.mp4 --adaptive --budget 40  # adaptive rate
+    python main.py --video_path path/to/segment.tfrecord --cameras FRONT FRONT_LEFT FRONT_RIGHT
 
 Dependencies:
     - opencv-python
@@ -16,38 +20,171 @@ Dependencies:
 import argparse
 import cv2
 import json
-from alpamayo_demo.utils.data_loader import load_video_frames
-from alpamayo_demo.core.policy import AlpamayoPolicy
-from alpamayo_demo.utils.visualization import create_visualization_window
+import time
+from alpamayo_demo.utils.adaptive_sampling import AdaptiveSampler
+from alpamayo_demo.utils.data_loader import SAMPLING_MODES, TFRECORD_EXTENSIONS, open_frame_stream
+from alpamayo_demo.utils.waymo_tfrecord import CAMERA_NAMES, MultiCameraStream
+from alpamayo_demo.utils.frame_filter import DuplicateFrameSkipper
+from alpamayo_demo.core.cache import DEFAULT_CACHE_PATH, DecisionCache
+from alpamayo_demo.core.policy import AlpamayoPolicy, DEFAULT_GOAL_PROMPT, MULTI_CAMERA_GOAL_PROMPT
+from alpamayo_demo.physics.safety import DEFAULT_MIN_TTC, SafetyGate
+from alpamayo_demo.utils.pipeline import batched, prefetch
+from alpamayo_demo.utils.visualization import AnnotatedVideoWriter, create_visualization_window
 
 def main():
     parser = argparse.ArgumentParser(description="Alpamayo R1 Autonomous Driving Demo")
-    parser.add_argument("--video_path", type=str, default="data/sample_video.mp4", help="Path to Waymo video file (default: data/sample_video.mp4)")
+    parser.add_argument("--video_path", type=str, default="data/sample_video.mp4", help="Path to Waymo video file or .tfrecord segment (default: data/sample_video.mp4)")
+    parser.add_argument("--camera", type=str, default="FRONT", choices=CAMERA_NAMES,
+                        help="Camera to read from .tfrecord segments (default: FRONT)")
+    parser.add_argument("--cameras", type=str, nargs="+", default=None, choices=CAMERA_NAMES,
+                        help="Decide on time-aligned bundles of these .tfrecord cameras; the first is displayed")
     parser.add_argument("--fps", type=int, default=1, help="Frames per second to sample")
+    parser.add_argument("--sampling", type=str, default="grab", choices=SAMPLING_MODES,
+                        help="How non-sampled frames are skipped (default: grab)")
+    parser.add_argument("--prefetch", type=int, default=4,
+                        help="Frames decoded ahead of the policy on a background thread")
+    parser.add_argument("--batch_size", type=int, default=1,
+                        help="Maximum frames per policy call (batched inference)")
+    parser.add_argument("--batch_wait", type=float, default=0.05,
+                        help="Maximum seconds to wait for a partial batch to fill")
+    parser.add_argument("--output", type=str, default=None,
+                        help="Write an annotated video here instead of opening a window (headless)")
+    parser.add_argument("--cache", type=str, nargs="?", const=DEFAULT_CACHE_PATH, default=None,
+                        help=f"Reuse decisions from a persistent cache (default file: {DEFAULT_CACHE_PATH})")
+    parser.add_argument("--cache_size", type=int, default=100_000, help="Maximum cached decisions")
+    parser.add_argument("--dedup_threshold", type=float, default=None,
+                        help="Reuse the previous decision for frames whose 16x16 signature differs from "
+                             "the last decided frame by at most this many levels (e.g. 6; default: off)")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="Vary the sampling rate with decision volatility instead of using --fps")
+    parser.add_argument("--fps_low", type=float, default=0.5, help="Adaptive rate while decisions are stable")
+    parser.add_argument("--fps_high", type=float, default=5.0,
+                        help="Adaptive rate after a decision change, low confidence or hazards")
+    parser.add_argument("--budget", type=int, default=None,
+                        help="Maximum decisions for the clip (implies --adaptive)")
+    parser.add_argument("--min_ttc", type=float, default=DEFAULT_MIN_TTC,
+                        help="Override accelerate/maintain_speed below this time to collision in seconds "
+                             f"(default: {DEFAULT_MIN_TTC}; 0 disables the safety gate)")
+    parser.add_argument("--ego_speed", type=float, default=10.0,
+                        help="Ego speed in m/s assumed by the safety gate (default: 10)")
     parser.add_argument("--mock", action="store_true", help="Use mock Alpamayo policy")
     args = parser.parse_args()
-
-    # Load video frames
-    frames, fps = load_video_frames(args.video_path, sample_fps=args.fps)
+    if args.cameras:
+        if not args.video_path.lower().endswith(TFRECORD_EXTENSIONS):
+            parser.error("--cameras needs a .tfrecord segment")
+        if args.dedup_threshold is not None:
+            parser.error("--dedup_threshold compares single frames and cannot be combined with --cameras")
 
     # Initialize Alpamayo policy (mock or real)
-    policy = AlpamayoPolicy(mock=args.mock)
+    cache = DecisionCache(args.cache, max_entries=args.cache_size) if args.cache else None
+    policy = AlpamayoPolicy(mock=args.mock, max_batch_size=args.batch_size,
+                            max_batch_wait=args.batch_wait, cache=cache)
+
+    # Optional near-duplicate skipping in front of the policy
+    skipper = DuplicateFrameSkipper(args.dedup_threshold) if args.dedup_threshold is not None else None
+
+    # Time-to-collision check applied to every decision as it arrives
+    gate = SafetyGate(args.min_ttc) if args.min_ttc > 0 else None
 
     # Goal prompt for the agent
-    goal_prompt = """
-    You are an autonomous vehicle driving in an urban environment.
-    Analyze the current scene from the front camera and decide the next action.
-    Consider safety, traffic rules, and smooth driving.
-    Output your decision in the specified JSON format.
-    """
+    goal_prompt = MULTI_CAMERA_GOAL_PROMPT if args.cameras else DEFAULT_GOAL_PROMPT
 
+    # Stream frames from the video, decoding on a background thread while the
+    # policy runs. Headless export writes each annotated frame as soon as its
+    # decision arrives; only the interactive viewer keeps frames around.
+    frames = []
     decisions = []
-    for i, frame in enumerate(frames):
-        # Get decision from Alpamayo
-        decision_json = policy.decide(frame, goal_prompt)
-        decision = json.loads(decision_json)
-        decision['frame_id'] = i  # Ensure correct frame_id
-        decisions.append(decision)
+    frame_count = 0
+    inference_seconds = 0.0
+    if args.cameras:
+        # Headless export is done with each bundle once it is written, so
+        # bundles can live in a ring covering the prefetch queue, one batch
+        # and the bundles held by decoder and consumer
+        ring_size = args.prefetch + args.batch_size + 2 if args.output else None
+        stream = MultiCameraStream(args.video_path, cameras=args.cameras, sample_fps=args.fps,
+                                   buffer_size=ring_size)
+    else:
+        stream = open_frame_stream(args.video_path, sample_fps=args.fps, mode=args.sampling, camera=args.camera)
+    writer = None
+    if args.output:
+        writer = AnnotatedVideoWriter(args.output, fps=stream.fps / stream.sample_interval)
+
+    def decide_batch(batch_frames):
+        nonlocal inference_seconds
+        start = time.perf_counter()
+        if args.cameras:
+            batch_decisions = [policy.decide_bundle(bundle, goal_prompt, output="dict") for bundle in batch_frames]
+        elif skipper is not None:
+            batch_decisions = skipper.decide_batch(policy, batch_frames, goal_prompt)
+        else:
+            batch_decisions = policy.decide_batch(batch_frames, goal_prompt, output="dict")
+        inference_seconds += time.perf_counter() - start
+        if gate is not None:
+            gate.apply(batch_decisions, args.ego_speed)
+        return batch_decisions
+
+    sampler = None
+    frame_source = None
+    if args.adaptive or args.budget:
+        # Each decision picks the next frame, so frames are read on demand
+        # instead of prefetched and batched
+        sampler = AdaptiveSampler(args.fps_low, args.fps_high, budget=args.budget)
+        results = ([(frame, decision)] for _, _, frame, decision in
+                   sampler.iter_decisions(stream, lambda frame: decide_batch([frame])[0]))
+    else:
+        frame_source = prefetch(stream, maxsize=args.prefetch)
+        frame_batches = batched(frame_source, policy.max_batch_size, policy.max_batch_wait)
+        # Get decisions from Alpamayo, one model call per batch
+        results = (zip(batch_frames, decide_batch(batch_frames)) for batch_frames in
+                   ([frame for _, _, frame in batch] for batch in frame_batches))
+    try:
+        for batch_results in results:
+            for frame, decision in batch_results:
+                if args.cameras:
+                    frame = frame[args.cameras[0]]
+                decision['frame_id'] = frame_count  # Ensure correct frame_id
+                frame_count += 1
+                if writer is not None:
+                    writer.write(frame, decision)
+                else:
+                    # The viewer replays and steps back, so it needs every frame;
+                    # memory here grows with clip length (use --output for long clips)
+                    frames.append(frame)
+                    decisions.append(decision)
+    finally:
+        # Also on errors from the policy or the gate: stop the decode thread
+        # before releasing the capture it reads, and finalize the output file
+        if frame_source is not None:
+            frame_source.close()
+        stream.close()
+        if writer is not None:
+            writer.close()
+
+    stats = stream.stats
+    print(f"Sampled {stats.sampled} frames, skipped {stats.skipped} "
+          f"({stats.ms_per_sample:.1f} ms capture per sample, mode={args.sampling})")
+    if sampler is not None:
+        fixed = stream.total_frames / stream.sample_interval
+        print(f"Adaptive sampling: {sampler.decisions} decisions ({sampler.volatile_decisions} volatile) "
+              f"vs {fixed:.0f} at a fixed {args.fps} fps")
+    if skipper is not None and skipper.decided:
+        # Fresh decisions cost about inference_seconds / decided each; the
+        # skipped frames would have cost the same
+        without = inference_seconds * skipper.frames / skipper.decided
+        print(f"Skipped {skipper.skipped} of {skipper.frames} frames as near-duplicates "
+              f"({skipper.skip_ratio:.0%}); inference {inference_seconds:.2f}s vs ~{without:.2f}s "
+              f"without skipping ({without / max(inference_seconds, 1e-9):.1f}x)")
+    if gate is not None:
+        print(f"Safety gate: overrode {gate.overridden} of {gate.checked} decisions "
+              f"(TTC < {args.min_ttc:g}s at {args.ego_speed:g} m/s), {gate.us_per_decision:.0f} us per decision")
+    if cache is not None:
+        print(f"Decision cache: {cache.hits} hits, {cache.misses} misses "
+              f"({cache.hit_rate:.0%}), {len(cache)} entries in {args.cache}")
+        cache.close()
+
+    if writer is not None:
+        print(f"Wrote {writer.frames_written} annotated frames to {args.output}")
+        return
 
     # Visualize
     # Use the sampling FPS for visualization so it plays back at real-time speed relative to the sampling
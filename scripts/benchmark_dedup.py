@@ -0,0 +1,70 @@
+"""
+Benchmark near-duplicate frame skipping.
+
+Builds a synthetic 720p clip that alternates moving segments with static
+"waiting at a red light" runs (static scene plus sensor noise), then
+decides every frame with the mock policy, with and without
+`DuplicateFrameSkipper`, and reports frames skipped and end-to-end time.
+
+Usage:
+    python scripts/benchmark_dedup.py --frames 60 --static_ratio 0.5
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from alpamayo_demo.core.policy import AlpamayoPolicy, DEFAULT_GOAL_PROMPT
+from alpamayo_demo.utils.frame_filter import DuplicateFrameSkipper
+
+
+def make_clip(n, static_ratio, rng, height=720, width=1280):
+    """Moving segments interleaved with static runs of the same scene."""
+    base = rng.integers(0, 255, (height // 8, width // 8, 3), dtype=np.uint8)
+    base = np.kron(base, np.ones((8, 8, 1), dtype=np.uint8))
+    frames, shift, segment = [], 0, 10
+    for i in range(n):
+        static = (i // segment) % 2 == 1 and (i % segment) < static_ratio * 2 * segment
+        if not static:
+            shift += 24
+        frame = np.roll(base, shift, axis=1).astype(np.int16)
+        frame += rng.integers(-3, 4, frame.shape, dtype=np.int16)
+        frames.append(np.clip(frame, 0, 255).astype(np.uint8))
+    return frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark near-duplicate frame skipping")
+    parser.add_argument("--frames", type=int, default=60, help="Frames in the synthetic clip")
+    parser.add_argument("--static_ratio", type=float, default=0.5, help="Fraction of frames in static runs")
+    parser.add_argument("--threshold", type=float, default=6.0, help="Duplicate threshold (levels, 0-255)")
+    parser.add_argument("--batch_size", type=int, default=1, help="Frames per policy call")
+    args = parser.parse_args()
+
+    frames = make_clip(args.frames, args.static_ratio, np.random.default_rng(0))
+    policy = AlpamayoPolicy(mock=True, max_batch_size=args.batch_size)
+    batches = [frames[i:i + args.batch_size] for i in range(0, len(frames), args.batch_size)]
+
+    start = time.perf_counter()
+    for batch in batches:
+        policy.decide_batch(batch, DEFAULT_GOAL_PROMPT, output="dict")
+    baseline = time.perf_counter() - start
+
+    skipper = DuplicateFrameSkipper(args.threshold)
+    start = time.perf_counter()
+    for batch in batches:
+        skipper.decide_batch(policy, batch, DEFAULT_GOAL_PROMPT)
+    deduped = time.perf_counter() - start
+
+    print(f"{args.frames} frames, {skipper.skipped} skipped ({skipper.skip_ratio:.0%}), "
+          f"signatures {1000 * skipper.signature_seconds / skipper.frames:.2f} ms/frame")
+    print(f"every frame: {baseline:.2f}s   with skipping: {deduped:.2f}s   speedup: {baseline / deduped:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark display-frame rendering throughput.
+
+Compares the allocating path used previously by the viewer
+(`frame.copy()` + `create_display_frame`, which resizes, builds a panel
+and `np.hstack`s them) against `DisplayRenderer`, which writes into one
+preallocated canvas. Reported at 1080p and 4K, for unique decisions per
+frame (streaming export) and for replayed decisions (looped playback).
+
+Usage:
+    python scripts/benchmark_rendering.py --frames 200
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from alpamayo_demo.utils.visualization import DisplayRenderer, create_display_frame
+
+RESOLUTIONS = {"1080p": (1080, 1920), "4K": (2160, 3840)}
+
+
+def make_decision(i):
+    return {
+        "frame_id": i,
+        "scene_type": "intersection",
+        "agents": [{"type": "pedestrian", "position": "crossing"}],
+        "traffic_light": "red",
+        "hazards": ["pedestrian crossing"],
+        "decision": "stop",
+        "confidence": 0.9,
+        "reason": "Pedestrian detected at crosswalk, stopping before the line.",
+    }
+
+
+def fps(render, frames, decisions):
+    start = time.perf_counter()
+    for i, decision in enumerate(decisions):
+        render(frames[i % len(frames)], decision)
+    return len(decisions) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark display-frame rendering")
+    parser.add_argument("--frames", type=int, default=200, help="Frames rendered per measurement")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'resolution':<10} {'decisions':<9} {'allocating fps':>15} {'canvas fps':>11} {'speedup':>8}")
+    for name, (height, width) in RESOLUTIONS.items():
+        frames = [rng.integers(0, 255, (height, width, 3), dtype=np.uint8) for _ in range(4)]
+        for label, decisions in (("unique", [make_decision(i) for i in range(args.frames)]),
+                                 ("replayed", [make_decision(i % 4) for i in range(args.frames)])):
+            before = fps(lambda f, d: create_display_frame(f.copy(), d), frames, decisions)
+            renderer = DisplayRenderer(memoize_panels=label == "replayed")
+            after = fps(renderer.render, frames, decisions)
+            print(f"{name:<10} {label:<9} {before:>15.1f} {after:>11.1f} {after / before:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark vectorized bicycle-model rollouts.
+
+Rolls out a grid of constant (steering, speed) candidates with
+`alpamayo_demo.physics.kinematics.rollout` and with a Python loop over
+`kinematic_bicycle_step`, checks that both agree, and reports rollouts
+per second.
+
+Usage:
+    python scripts/benchmark_rollout.py --candidates 4096 --steps 50
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from alpamayo_demo.physics.kinematics import control_grid, kinematic_bicycle_step, rollout
+
+
+def loop_rollout(steering, speed):
+    """Reference: step every candidate point by point."""
+    n, steps = steering.shape
+    x = np.zeros((n, steps + 1))
+    for i in range(n):
+        px = py = theta = 0.0
+        for t in range(steps):
+            px, py, theta = kinematic_bicycle_step(px, py, theta, speed[i, t], steering[i, t])
+            x[i, t + 1] = px
+    return x
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vectorized bicycle-model rollouts")
+    parser.add_argument("--candidates", type=int, default=4096, help="Control sequences per decision")
+    parser.add_argument("--steps", type=int, default=50, help="Steps per sequence")
+    parser.add_argument("--repeats", type=int, default=20, help="Timed vectorized runs")
+    args = parser.parse_args()
+
+    side = math.isqrt(args.candidates)
+    steering, speed = control_grid(np.linspace(-0.4, 0.4, side), np.linspace(0.0, 20.0, side), args.steps)
+
+    rollout(steering, speed)
+    start = time.perf_counter()
+    for _ in range(args.repeats):
+        x, _, _ = rollout(steering, speed)
+    vectorized = (time.perf_counter() - start) / args.repeats
+
+    # The loop is slow; time a slice and scale
+    sample = min(len(steering), 256)
+    start = time.perf_counter()
+    reference = loop_rollout(steering[:sample], speed[:sample])
+    looped = (time.perf_counter() - start) * len(steering) / sample
+
+    error = np.abs(reference - x[:sample]).max()
+    print(f"{len(steering)} candidates x {args.steps} steps, max |dx| vs loop {error:.1e} m")
+    print(f"vectorized: {1000 * vectorized:.1f} ms ({len(steering) / vectorized:,.0f} rollouts/s)   "
+          f"python loop: ~{1000 * looped:.0f} ms   speedup: ~{looped / vectorized:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
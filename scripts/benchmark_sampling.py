@@ -0,0 +1,78 @@
+"""
+Benchmark frame sampling strategies in the data loader.
+
+Compares the decode-everything path ("read") against grab-based skipping
+and seek-based sampling on a long clip, and reports the capture time
+saved by each mode.
+
+Usage:
+    python scripts/benchmark_sampling.py --video_path data/long_drive.mp4 --fps 1
+    python scripts/benchmark_sampling.py --duration 600   # synthetic 10-minute clip
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from alpamayo_demo.utils.data_loader import SAMPLING_MODES, VideoFrameStream
+
+
+def create_long_clip(output_path, duration, fps=30, width=1280, height=720):
+    """Write a synthetic clip of `duration` seconds with per-frame motion."""
+    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+    out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+    rng = np.random.default_rng(0)
+    background = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    for i in range(int(duration * fps)):
+        frame = np.roll(background, 4 * i, axis=1)
+        cv2.putText(frame, f"Frame {i}", (10, 40), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+        out.write(frame)
+    out.release()
+
+
+def run_mode(video_path, sample_fps, mode):
+    stream = VideoFrameStream(video_path, sample_fps=sample_fps, mode=mode)
+    start = time.perf_counter()
+    for _ in stream:
+        pass
+    return time.perf_counter() - start, stream.stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark frame sampling modes")
+    parser.add_argument("--video_path", type=str, default=None, help="Clip to benchmark (default: synthetic clip)")
+    parser.add_argument("--duration", type=float, default=120, help="Synthetic clip length in seconds")
+    parser.add_argument("--fps", type=int, default=1, help="Frames per second to sample")
+    args = parser.parse_args()
+
+    temp_dir = None
+    video_path = args.video_path
+    if video_path is None:
+        temp_dir = tempfile.TemporaryDirectory()
+        video_path = os.path.join(temp_dir.name, "long_clip.mp4")
+        print(f"Creating {args.duration:.0f}s synthetic clip...")
+        create_long_clip(video_path, args.duration)
+
+    print(f"Sampling {video_path} at {args.fps} fps")
+    print(f"{'mode':<6} {'wall (s)':>9} {'capture (s)':>12} {'ms/sample':>10} {'sampled':>8} {'speedup':>8}")
+    baseline = None
+    for mode in SAMPLING_MODES:
+        wall, stats = run_mode(video_path, args.fps, mode)
+        baseline = baseline or stats.capture_seconds
+        speedup = baseline / stats.capture_seconds if stats.capture_seconds else float("inf")
+        print(f"{mode:<6} {wall:>9.2f} {stats.capture_seconds:>12.2f} {stats.ms_per_sample:>10.1f} "
+              f"{stats.sampled:>8} {speedup:>7.1f}x")
+
+    if temp_dir is not None:
+        temp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Microbenchmark for decision schema validation.
+
+Reports the per-decision cost of the precomputed validator for JSON strings,
+parsed dicts and whole batches, and of columnar bulk validation, next to
+the original per-call schema walk.
+
+Usage:
+    python scripts/benchmark_validation.py --count 100000
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from alpamayo_demo.core.columnar import validate_decisions_columnar
+from alpamayo_demo.core.schema import DECISION_SCHEMA, validate_decision, validate_decisions
+
+SAMPLE_DECISION = {
+    "frame_id": 12,
+    "scene_type": "intersection",
+    "agents": [{"type": "pedestrian", "position": "crossing"}, {"type": "vehicle", "position": "ahead"}],
+    "traffic_light": "red",
+    "hazards": ["pedestrian crossing"],
+    "decision": "stop",
+    "confidence": 0.89,
+    "reason": "Pedestrian detected at crosswalk",
+}
+
+
+def legacy_validate(decision):
+    """The original validator: nested schema lookups and list scans per call."""
+    for field in DECISION_SCHEMA["properties"].keys():
+        if field not in decision:
+            raise ValueError(f"Missing required field: {field}")
+    props = DECISION_SCHEMA["properties"]
+    if decision["scene_type"] not in props["scene_type"]["enum"]:
+        raise ValueError("Invalid scene_type")
+    if decision["traffic_light"] not in props["traffic_light"]["enum"]:
+        raise ValueError("Invalid traffic_light")
+    if decision["decision"] not in props["decision"]["enum"]:
+        raise ValueError("Invalid decision")
+    for agent in decision["agents"]:
+        if agent["type"] not in props["agents"]["items"]["properties"]["type"]["enum"]:
+            raise ValueError("Invalid agent type")
+        if agent["position"] not in props["agents"]["items"]["properties"]["position"]["enum"]:
+            raise ValueError("Invalid agent position")
+    if not (0.0 <= decision["confidence"] <= 1.0):
+        raise ValueError("Confidence out of range")
+    return decision
+
+
+def per_decision_us(fn, count):
+    return 1e6 * min(timeit.repeat(fn, number=1, repeat=3)) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark decision validation")
+    parser.add_argument("--count", type=int, default=100000, help="Decisions per measurement")
+    args = parser.parse_args()
+
+    dicts = [dict(SAMPLE_DECISION, frame_id=i) for i in range(args.count)]
+    strings = [json.dumps(d) for d in dicts]
+
+    results = [
+        ("legacy (dict, no type checks)", lambda: [legacy_validate(d) for d in dicts]),
+        ("validate_decision(dict)", lambda: [validate_decision(d) for d in dicts]),
+        ("validate_decision(json str)", lambda: [validate_decision(s) for s in strings]),
+        ("validate_decisions(batch)", lambda: validate_decisions(dicts)),
+        ("validate_decisions_columnar", lambda: validate_decisions_columnar(dicts)),
+    ]
+    print(f"{'path':<32} {'us/decision':>12}")
+    for name, fn in results:
+        print(f"{name:<32} {per_decision_us(fn, args.count):>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# scripts/generate_math_fixtures.jl
+#
+# Writes reference outputs of src/math_foundations.jl to
+# tests/fixtures/math_foundations/*.csv, which tests/test_math_foundations.py
+# checks the NumPy port (alpamayo_demo.physics.math_foundations) against.
+#
+# Inputs are deterministic (sine waves, no RNG) so the cases are the same
+# on every machine. Values are written with `repr`, which round-trips
+# Float64 exactly.
+#
+# Usage:
+#     julia scripts/generate_math_fixtures.jl
+
+include(joinpath(@__DIR__, "..", "src", "math_foundations.jl"))
+using .MathFoundations
+
+const OUT = joinpath(@__DIR__, "..", "tests", "fixtures", "math_foundations")
+mkpath(OUT)
+
+function write_csv(name, header, rows)
+    open(joinpath(OUT, name), "w") do io
+        println(io, join(header, ","))
+        for row in rows
+            println(io, join(map(repr, row), ","))
+        end
+    end
+end
+
+wave(i, k) = sin(i * k)
+
+# Pure pursuit: targets all around the vehicle, plus a target on the vehicle
+rows = []
+for i in 1:64
+    x, y = 5.0 * wave(i, 1.3), 5.0 * wave(i, 2.1)
+    rx, ry = x + 10.0 * wave(i, 0.7), y + 10.0 * wave(i, 3.7)
+    θ, L = 3.0 * wave(i, 0.9), 2.5 + wave(i, 5.3)^2
+    push!(rows, (rx, ry, x, y, θ, L, pure_pursuit_steering(rx, ry, x, y, θ, L)))
+end
+push!(rows, (1.5, -2.0, 1.5, -2.0, 0.3, 2.7, pure_pursuit_steering(1.5, -2.0, 1.5, -2.0, 0.3, 2.7)))
+write_csv("pure_pursuit_steering.csv", ("rx", "ry", "x", "y", "theta", "wheelbase", "delta"), rows)
+
+# PID: one controller threaded through a setpoint change
+rows = []
+integral, prev = 0.0, 0.0
+kp, ki, kd, dt = 0.8, 0.2, 0.05, 0.1
+for i in 1:50
+    target = i <= 25 ? 10.0 : 4.0
+    current = 8.0 * (1 - exp(-i / 10)) + 0.3 * wave(i, 2.3)
+    out, new_integral, err = pid_control(target, current, kp, ki, kd, integral, prev, dt)
+    push!(rows, (target, current, kp, ki, kd, integral, prev, dt, out, new_integral, err))
+    global integral = new_integral
+    global prev = err
+end
+write_csv("pid_control.csv",
+          ("target", "current", "kp", "ki", "kd", "integral_err", "prev_err", "dt",
+           "output", "new_integral_err", "error"), rows)
+
+# TTC: closing, opening and equal speeds, plus a zero gap
+rows = []
+for i in 1:64
+    v_ego, v_target = 15.0 + 10.0 * wave(i, 1.1), 15.0 + 10.0 * wave(i, 2.9)
+    d = 40.0 * abs(wave(i, 0.5))
+    push!(rows, (v_ego, v_target, d, time_to_collision(v_ego, v_target, d)))
+end
+for (v_ego, v_target, d) in ((10.0, 10.0, 5.0), (8.0, 12.0, 5.0), (12.0, 8.0, 0.0))
+    push!(rows, (v_ego, v_target, d, time_to_collision(v_ego, v_target, d)))
+end
+write_csv("time_to_collision.csv", ("v_ego", "v_target", "distance", "ttc"), rows)
+
+println("Wrote fixtures to ", OUT)
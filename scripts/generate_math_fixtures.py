@@ -0,0 +1,113 @@
+"""
+Generate the math_foundations fixtures without Julia.
+
+Provenance of tests/fixtures/math_foundations/*.csv: they were written by
+this script, not by `scripts/generate_math_fixtures.jl`, because no Julia
+toolchain was available. It mirrors the .jl generator case for case (same
+deterministic inputs, same columns, `Inf` spelled as Julia prints it) and
+evaluates a scalar transcription of `src/math_foundations.jl` with
+`math.*`, independent of the NumPy port the tests check. The fixtures
+therefore pin the port to the scalar formulas, not to Julia itself; run
+the .jl generator to replace them with true Julia outputs.
+
+Usage:
+    python scripts/generate_math_fixtures.py
+"""
+
+import math
+import os
+
+OUT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures", "math_foundations"))
+
+
+# --- Scalar transcription of src/math_foundations.jl ---
+
+def pure_pursuit_steering(rx, ry, current_x, current_y, current_theta, wheelbase):
+    dx = rx - current_x
+    dy = ry - current_y
+    alpha = math.atan2(dy, dx) - current_theta
+    # Julia lowers `dx^2` to `dx * dx`
+    l_d = math.sqrt(dx * dx + dy * dy)
+    if l_d == 0.0:
+        return 0.0
+    return math.atan((2 * wheelbase * math.sin(alpha)) / l_d)
+
+
+def pid_control(target, current, kp, ki, kd, integral_err, prev_err, dt):
+    error = target - current
+    p = kp * error
+    new_integral_err = integral_err + (error * dt)
+    i = ki * new_integral_err
+    d = kd * ((error - prev_err) / dt)
+    return p + i + d, new_integral_err, error
+
+
+def time_to_collision(v_ego, v_target, distance):
+    relative_speed = v_ego - v_target
+    if relative_speed <= 0:
+        return math.inf
+    return distance / relative_speed
+
+
+# --- Fixture cases, as in scripts/generate_math_fixtures.jl ---
+
+def wave(i, k):
+    return math.sin(i * k)
+
+
+def format_value(value):
+    """Shortest round-tripping repr, with infinities spelled like Julia."""
+    if math.isinf(value):
+        return "Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def write_csv(name, header, rows):
+    with open(os.path.join(OUT, name), "w") as f:
+        f.write(",".join(header) + "\n")
+        for row in rows:
+            f.write(",".join(format_value(v) for v in row) + "\n")
+
+
+def main():
+    os.makedirs(OUT, exist_ok=True)
+
+    # Pure pursuit: targets all around the vehicle, plus a target on the vehicle
+    rows = []
+    for i in range(1, 65):
+        x, y = 5.0 * wave(i, 1.3), 5.0 * wave(i, 2.1)
+        rx, ry = x + 10.0 * wave(i, 0.7), y + 10.0 * wave(i, 3.7)
+        theta, wheelbase = 3.0 * wave(i, 0.9), 2.5 + wave(i, 5.3) * wave(i, 5.3)
+        rows.append((rx, ry, x, y, theta, wheelbase, pure_pursuit_steering(rx, ry, x, y, theta, wheelbase)))
+    rows.append((1.5, -2.0, 1.5, -2.0, 0.3, 2.7, pure_pursuit_steering(1.5, -2.0, 1.5, -2.0, 0.3, 2.7)))
+    write_csv("pure_pursuit_steering.csv", ("rx", "ry", "x", "y", "theta", "wheelbase", "delta"), rows)
+
+    # PID: one controller threaded through a setpoint change
+    rows = []
+    integral, prev = 0.0, 0.0
+    kp, ki, kd, dt = 0.8, 0.2, 0.05, 0.1
+    for i in range(1, 51):
+        target = 10.0 if i <= 25 else 4.0
+        current = 8.0 * (1 - math.exp(-i / 10)) + 0.3 * wave(i, 2.3)
+        out, new_integral, err = pid_control(target, current, kp, ki, kd, integral, prev, dt)
+        rows.append((target, current, kp, ki, kd, integral, prev, dt, out, new_integral, err))
+        integral, prev = new_integral, err
+    write_csv("pid_control.csv",
+              ("target", "current", "kp", "ki", "kd", "integral_err", "prev_err", "dt",
+               "output", "new_integral_err", "error"), rows)
+
+    # TTC: closing, opening and equal speeds, plus a zero gap
+    rows = []
+    for i in range(1, 65):
+        v_ego, v_target = 15.0 + 10.0 * wave(i, 1.1), 15.0 + 10.0 * wave(i, 2.9)
+        d = 40.0 * abs(wave(i, 0.5))
+        rows.append((v_ego, v_target, d, time_to_collision(v_ego, v_target, d)))
+    for v_ego, v_target, d in ((10.0, 10.0, 5.0), (8.0, 12.0, 5.0), (12.0, 8.0, 0.0)):
+        rows.append((v_ego, v_target, d, time_to_collision(v_ego, v_target, d)))
+    write_csv("time_to_collision.csv", ("v_ego", "v_target", "distance", "ttc"), rows)
+
+    print(f"Wrote fixtures to {OUT}")
+
+
+if __name__ == "__main__":
+    main()
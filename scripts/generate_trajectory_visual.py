@@ -3,20 +3,28 @@ Generate a polished trajectory + decision visualization for the README.
 
 This script simulates a vehicle navigating an urban route using the kinematic
 bicycle model, overlaying Alpamayo R1-style decisions at each waypoint.
+With `--log`, the trajectory is instead driven by a real decision log
+(from `batch.py`) through the closed-loop simulation, and the image is
+written next to the log rather than over the README asset.
+
+Usage:
+    python scripts/generate_trajectory_visual.py
+    python scripts/generate_trajectory_visual.py --log decision_logs/clip.jsonl
+    python scripts/generate_trajectory_visual.py --log decision_logs/clip.jsonl --out clip.png
 """
 
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from matplotlib.collections import LineCollection
+import argparse
 import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
 
-def kinematic_bicycle_step(x, y, theta, v, delta, L, dt):
-    """Kinematic bicycle model (mirrors the Julia implementation)."""
-    dx = v * np.cos(theta)
-    dy = v * np.sin(theta)
-    dtheta = (v / L) * np.tan(delta)
-    return x + dx * dt, y + dy * dt, theta + dtheta * dt
+from alpamayo_demo.physics.kinematics import rollout
+from alpamayo_demo.physics.simulation import load_decision_log, simulate_clips
 
 def generate_trajectory():
     """Simulate a realistic urban driving trajectory with varying decisions."""
@@ -49,22 +57,33 @@ def generate_trajectory():
         (0.02, 10.0, 40, "maintain_speed", 0.89),
     ]
     
-    xs, ys, speeds, decisions, confidences = [], [], [], [], []
-    x, y, theta = 0.0, 0.0, np.pi / 6  # start heading NE
-    
-    for steer, speed, frames, decision, conf in segments:
-        for i in range(frames):
-            xs.append(x)
-            ys.append(y)
-            speeds.append(speed)
-            decisions.append(decision)
-            confidences.append(conf)
-            x, y, theta = kinematic_bicycle_step(x, y, theta, speed, steer, L, dt)
-    
-    return np.array(xs), np.array(ys), np.array(speeds), decisions, confidences
+    steers, speeds, frames, decisions, confidences = zip(*segments)
+    steering = np.repeat(steers, frames)
+    speeds = np.repeat(speeds, frames).astype(float)
+    decisions = [d for d, n in zip(decisions, frames) for _ in range(n)]
+    confidences = [c for c, n in zip(confidences, frames) for _ in range(n)]
+
+    # Whole route in one vectorized rollout, starting at the origin heading NE;
+    # each point is the state before its control step
+    xs, ys, _ = rollout(steering, speeds, 0.0, 0.0, np.pi / 6, wheelbase=L, dt=dt)
+    return xs[:-1], ys[:-1], speeds, decisions, confidences
+
+def simulate_log(log_path):
+    """Drive the route from a decision log with the closed-loop simulation."""
+    actions, interval = load_decision_log(log_path)
+    result = simulate_clips([actions], decision_interval=interval or 1.0, initial_speed=5.0)
+    decisions = [a for a in actions for _ in range(result.steps_per_decision)]
+    return result.x[0, :-1], result.y[0, :-1], result.speed[0, :-1], decisions, [1.0] * len(decisions)
+
+def default_output_path(log_path=None):
+    """README asset for the built-in route; `<log>_trajectory.png` for a decision log."""
+    if log_path:
+        return os.path.splitext(log_path)[0] + "_trajectory.png"
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets",
+                        "trajectory_decisions.png")
 
-def plot_trajectory(xs, ys, speeds, decisions, confidences):
-    """Create the publication-quality visualization."""
+def plot_trajectory(xs, ys, speeds, decisions, confidences, out_path=None):
+    """Create the publication-quality visualization and save it to `out_path`."""
     
     # Color map for decisions
     decision_colors = {
@@ -158,14 +177,22 @@ def plot_trajectory(xs, ys, speeds, decisions, confidences):
     
     plt.tight_layout()
     
-    out_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets")
-    os.makedirs(out_dir, exist_ok=True)
-    out_path = os.path.join(out_dir, "trajectory_decisions.png")
+    out_path = out_path or default_output_path()
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
     fig.savefig(out_path, dpi=180, bbox_inches="tight", facecolor=fig.get_facecolor())
     plt.close()
     print(f"Saved visualization to {out_path}")
     return out_path
 
 if __name__ == "__main__":
-    xs, ys, speeds, decisions, confidences = generate_trajectory()
-    plot_trajectory(xs, ys, speeds, decisions, confidences)
+    parser = argparse.ArgumentParser(description="Render the trajectory and decision map")
+    parser.add_argument("--log", type=str, default=None, help="Decision log (.jsonl) to simulate instead")
+    parser.add_argument("--out", type=str, default=None,
+                        help="Output image (default: assets/trajectory_decisions.png, "
+                             "or <log>_trajectory.png with --log)")
+    args = parser.parse_args()
+    if args.log:
+        xs, ys, speeds, decisions, confidences = simulate_log(args.log)
+    else:
+        xs, ys, speeds, decisions, confidences = generate_trajectory()
+    plot_trajectory(xs, ys, speeds, decisions, confidences, args.out or default_output_path(args.log))
@@ -0,0 +1,107 @@
+"""
+Replay decision logs through the closed-loop vehicle simulation.
+
+Reads the per-clip JSON Lines logs written by `batch.py`, simulates every
+clip at once with `alpamayo_demo.physics.simulation.simulate_clips`, and
+prints fleet-level driving metrics. With `--baseline`, the clips shared by
+both log directories are simulated for each and clips whose metrics moved
+beyond the tolerances are listed, so a policy change can be checked for how
+it changes the driving, not only the decisions.
+
+Usage:
+    python scripts/simulate_decisions.py --logs decision_logs/
+    python scripts/simulate_decisions.py --logs new_logs/ --baseline decision_logs/
+    python scripts/simulate_decisions.py --synthetic 5000 --decisions 30   # throughput
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from alpamayo_demo.core.columnar import ACTIONS
+from alpamayo_demo.physics.simulation import METRICS, load_decision_log, simulate_clips
+
+# Metric change that counts as a regression: absolute, or relative to the baseline
+TOLERANCES = {"distance": (2.0, 0.05), "mean_speed": (0.5, 0.05), "max_decel": (1.0, 0.0),
+              "stopped_seconds": (1.0, 0.0), "max_cross_track": (0.5, 0.0)}
+
+
+def load_logs(directory):
+    """Actions per clip name and the most common decision interval."""
+    logs, intervals = {}, []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".jsonl"):
+            actions, interval = load_decision_log(os.path.join(directory, name))
+            logs[name] = actions
+            if interval:
+                intervals.append(interval)
+    return logs, (float(np.median(intervals)) if intervals else 1.0)
+
+
+def simulate(logs, interval):
+    start = time.perf_counter()
+    result = simulate_clips(list(logs.values()), decision_interval=interval)
+    elapsed = time.perf_counter() - start
+    print(f"Simulated {len(result)} clips in {elapsed:.2f}s ({60 * len(result) / elapsed:,.0f} clips/min)")
+    return result.metrics()
+
+
+def summarize(metrics):
+    for name in METRICS:
+        values = metrics[name]
+        print(f"  {name:>16}: mean {values.mean():8.2f}   p95 {np.percentile(values, 95):8.2f}   "
+              f"max {values.max():8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Closed-loop simulation of decision logs")
+    parser.add_argument("--logs", type=str, default=None, help="Directory of per-clip .jsonl decision logs")
+    parser.add_argument("--baseline", type=str, default=None, help="Logs of the same clips from a reference run")
+    parser.add_argument("--interval", type=float, default=None,
+                        help="Seconds between decisions (default: from log timestamps, else 1)")
+    parser.add_argument("--synthetic", type=int, default=0, help="Simulate this many random clips instead")
+    parser.add_argument("--decisions", type=int, default=30, help="Decisions per synthetic clip")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        rng = np.random.default_rng(0)
+        logs = {f"clip_{i}": rng.choice(ACTIONS, args.decisions) for i in range(args.synthetic)}
+        summarize(simulate(logs, args.interval or 1.0))
+        return
+    if args.logs is None:
+        parser.error("--logs or --synthetic is required")
+
+    logs, interval = load_logs(args.logs)
+    if not logs:
+        parser.error(f"No .jsonl logs in {args.logs}")
+    interval = args.interval or interval
+    if args.baseline is None:
+        summarize(simulate(logs, interval))
+        return
+
+    baseline, _ = load_logs(args.baseline)
+    shared = sorted(set(logs) & set(baseline))
+    if not shared:
+        parser.error("The two runs have no clips in common")
+    current = simulate({name: logs[name] for name in shared}, interval)
+    reference = simulate({name: baseline[name] for name in shared}, interval)
+    summarize(current)
+
+    changed = np.zeros(len(shared), dtype=bool)
+    for name, (absolute, relative) in TOLERANCES.items():
+        delta = np.abs(current[name] - reference[name])
+        changed |= delta > np.maximum(absolute, relative * np.abs(reference[name]))
+    print(f"{changed.sum()} of {len(shared)} clips drive differently from the baseline")
+    for i in np.flatnonzero(changed):
+        diffs = ", ".join(f"{name} {reference[name][i]:.1f}->{current[name][i]:.1f}" for name in METRICS)
+        print(f"  {shared[i]}: {diffs}")
+    sys.exit(1 if changed.any() else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Columnar bulk validation for large decision logs.
+
+Converts a list of decisions into NumPy columns (enum codes, float32
+confidence, agent counts) and checks every row with vectorized operations.
+Instead of raising on the first failure, validation returns a per-row
+bitmask of `ERR_*` flags, which suits offline audits over hundreds of
+thousands of decisions.
+
+Classes:
+    - DecisionColumns: Column arrays for a batch of decisions
+
+Functions:
+    - validate_columns: Per-row error mask for a `DecisionColumns`
+    - validate_decisions_columnar: Convert and validate in one call
+    - describe_errors: Human-readable names of the flags in a mask value
+"""
+
+import math
+from itertools import chain
+from typing import Any, List, Sequence
+
+import numpy as np
+
+from alpamayo_demo.core.schema import DECISION_SCHEMA, Decision
+
+_PROPS = DECISION_SCHEMA["properties"]
+_AGENT_PROPS = _PROPS["agents"]["items"]["properties"]
+
+# Enum vocabularies; a column stores the index into these tuples
+SCENE_TYPES = tuple(_PROPS["scene_type"]["enum"])
+TRAFFIC_LIGHTS = tuple(_PROPS["traffic_light"]["enum"])
+ACTIONS = tuple(_PROPS["decision"]["enum"])
+AGENT_TYPES = tuple(_AGENT_PROPS["type"]["enum"])
+AGENT_POSITIONS = tuple(_AGENT_PROPS["position"]["enum"])
+
+# Frame ids must fit the int64 column
+FRAME_ID_MIN = _PROPS["frame_id"]["minimum"]
+FRAME_ID_MAX = _PROPS["frame_id"]["maximum"]
+
+# Optional numeric agent fields, checked for type and schema bounds
+AGENT_KINEMATICS = ("distance", "speed")
+
+# Codes for values outside the vocabulary
+CODE_INVALID = -1
+CODE_MISSING = -2
+
+# Per-row error flags
+ERR_MISSING_FIELD = 1 << 0
+ERR_FRAME_ID = 1 << 1
+ERR_SCENE_TYPE = 1 << 2
+ERR_TRAFFIC_LIGHT = 1 << 3
+ERR_DECISION = 1 << 4
+ERR_CONFIDENCE = 1 << 5
+ERR_AGENTS = 1 << 6
+ERR_AGENT_TYPE = 1 << 7
+ERR_AGENT_POSITION = 1 << 8
+ERR_HAZARDS = 1 << 9
+ERR_REASON = 1 << 10
+ERR_AGENT_KINEMATICS = 1 << 11
+ERR_NOT_OBJECT = 1 << 12
+
+ERROR_NAMES = {
+    ERR_MISSING_FIELD: "missing_field",
+    ERR_FRAME_ID: "frame_id",
+    ERR_SCENE_TYPE: "scene_type",
+    ERR_TRAFFIC_LIGHT: "traffic_light",
+    ERR_DECISION: "decision",
+    ERR_CONFIDENCE: "confidence",
+    ERR_AGENTS: "agents",
+    ERR_AGENT_TYPE: "agent_type",
+    ERR_AGENT_POSITION: "agent_position",
+    ERR_HAZARDS: "hazards",
+    ERR_REASON: "reason",
+    ERR_AGENT_KINEMATICS: "agent_kinematics",
+    ERR_NOT_OBJECT: "not_object",
+}
+
+_MISSING = object()
+
+
+def _code_map(vocabulary):
+    codes = {value: i for i, value in enumerate(vocabulary)}
+    codes[_MISSING] = CODE_MISSING
+    return codes
+
+
+_SCENE_CODES = _code_map(SCENE_TYPES)
+_LIGHT_CODES = _code_map(TRAFFIC_LIGHTS)
+_ACTION_CODES = _code_map(ACTIONS)
+_AGENT_TYPE_CODES = _code_map(AGENT_TYPES)
+_AGENT_POSITION_CODES = _code_map(AGENT_POSITIONS)
+
+
+def _encode(codes, value):
+    try:
+        return codes.get(value, CODE_INVALID)
+    except TypeError:  # unhashable value, e.g. a list
+        return CODE_INVALID
+
+
+def _encode_column(rows, field, codes):
+    try:
+        encoded = [codes.get(row.get(field, _MISSING), CODE_INVALID) for row in rows]
+    except TypeError:
+        encoded = [_encode(codes, row.get(field, _MISSING)) for row in rows]
+    return np.array(encoded, dtype=np.int8)
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _kinematics_ok(agents, field):
+    """Whether `field` of each agent is absent, or a number within its schema bounds."""
+    schema = _AGENT_PROPS[field]
+    values = [agent.get(field, _MISSING) for agent in agents]
+    present = np.fromiter((v is not _MISSING for v in values), dtype=bool, count=len(values))
+    numeric = np.fromiter((_is_number(v) for v in values), dtype=bool, count=len(values))
+    numbers = np.array([v if ok else math.nan for v, ok in zip(values, numeric)], dtype=np.float64)
+    ok = numeric
+    # NaN fails both comparisons, as in the row validator
+    if "minimum" in schema:
+        ok &= numbers >= schema["minimum"]
+    if "maximum" in schema:
+        ok &= numbers <= schema["maximum"]
+    return ~present | ok
+
+
+def _as_number(value):
+    return value if _is_number(value) else math.nan
+
+
+def _flatten_lists(values, n):
+    """
+    Split a column of list-valued fields into CSR form.
+
+    Returns:
+        tuple: (counts, offsets, flat) where `counts` is -1 for rows whose
+        value is not a list/tuple and `flat` concatenates all the lists
+    """
+    lists = [v if isinstance(v, (list, tuple)) else None for v in values]
+    counts = np.fromiter((-1 if v is None else len(v) for v in lists), dtype=np.int32, count=n)
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.maximum(counts, 0), out=offsets[1:])
+    flat = list(chain.from_iterable(v for v in lists if v))
+    return counts, offsets, flat
+
+
+def _rows_of(offsets):
+    """Owning row index of every flattened element."""
+    return np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+
+
+class DecisionColumns:
+    """
+    Column arrays for a batch of decisions.
+
+    Agents are stored flat (CSR layout): the agents of row `i` are
+    `agent_type[agent_offsets[i]:agent_offsets[i + 1]]`.
+
+    Attributes:
+        frame_id (int64): Frame ids, -1 where missing or not an int64
+        frame_id_ok (bool): Whether frame_id is absent or an int64
+        scene_type, traffic_light, decision (int8): Enum codes
+        confidence (float32): Confidence, NaN where missing or not a number.
+            Range checks run on the float32 values, so values within float32
+            rounding of a bound are accepted.
+        has_confidence (bool): Whether the confidence field is present
+        agent_count (int32): Number of agents, -1 where not an array
+        agent_offsets (int64): Row offsets into the flat agent columns
+        agent_type, agent_position (int8): Flat agent enum codes
+        agent_kinematics_ok (bool): Whether each agent's optional
+            `AGENT_KINEMATICS` fields are numbers within the schema bounds
+        hazards_ok, reason_ok (bool): Whether hazards / reason are well typed
+        is_object (bool): Whether the row is a dict at all; other rows
+            (e.g. a corrupt log line parsed as a list or null) are
+            validated as empty dicts and flagged only as not objects
+        missing (bool): Whether any required field is missing
+    """
+
+    def __init__(self, decisions: Sequence[Any]):
+        rows = [d.to_dict() if isinstance(d, Decision) else d for d in decisions]
+        n = len(rows)
+        self.size = n
+
+        self.is_object = np.fromiter((isinstance(row, dict) for row in rows), dtype=bool, count=n)
+        rows = [row if ok else {} for row, ok in zip(rows, self.is_object)]
+
+        required = frozenset(DECISION_SCHEMA["required"])
+        self.missing = np.fromiter((not row.keys() >= required for row in rows), dtype=bool, count=n)
+        self.missing &= self.is_object
+
+        frame_ids = [row.get("frame_id", -1) for row in rows]
+        self.frame_id_ok = np.fromiter(
+            (isinstance(f, int) and not isinstance(f, bool) and FRAME_ID_MIN <= f <= FRAME_ID_MAX
+             for f in frame_ids), dtype=bool, count=n)
+        self.frame_id = np.array(
+            [f if ok else -1 for f, ok in zip(frame_ids, self.frame_id_ok)], dtype=np.int64)
+
+        self.scene_type = _encode_column(rows, "scene_type", _SCENE_CODES)
+        self.traffic_light = _encode_column(rows, "traffic_light", _LIGHT_CODES)
+        self.decision = _encode_column(rows, "decision", _ACTION_CODES)
+
+        self.has_confidence = np.fromiter(("confidence" in row for row in rows), dtype=bool, count=n)
+        self.confidence = np.fromiter(
+            (_as_number(row.get("confidence", math.nan)) for row in rows), dtype=np.float32, count=n)
+
+        agents = [row.get("agents", ()) for row in rows]
+        self.agent_count, self.agent_offsets, flat = _flatten_lists(agents, n)
+        flat = [a if isinstance(a, dict) else {} for a in flat]
+        self.agent_type = _encode_column(flat, "type", _AGENT_TYPE_CODES)
+        self.agent_position = _encode_column(flat, "position", _AGENT_POSITION_CODES)
+        self.agent_kinematics_ok = np.ones(len(flat), dtype=bool)
+        for field in AGENT_KINEMATICS:
+            self.agent_kinematics_ok &= _kinematics_ok(flat, field)
+
+        # Hazard items are type-checked flat, then reduced back to rows
+        hazard_count, hazard_offsets, flat = _flatten_lists([row.get("hazards", ()) for row in rows], n)
+        bad_items = np.fromiter((not isinstance(h, str) for h in flat), dtype=bool, count=len(flat))
+        self.hazards_ok = hazard_count >= 0
+        self.hazards_ok[_rows_of(hazard_offsets)[bad_items]] = False
+
+        self.reason_ok = np.fromiter(
+            (isinstance(r, str) for r in (row.get("reason", "") for row in rows)),
+            dtype=bool, count=n)
+
+    def __len__(self):
+        return self.size
+
+
+def validate_columns(columns: DecisionColumns) -> np.ndarray:
+    """
+    Check every row of `columns` with vectorized operations.
+
+    Args:
+        columns (DecisionColumns): Converted decisions
+
+    Returns:
+        numpy array: uint16 bitmask of `ERR_*` flags per row; 0 means valid
+    """
+    n = len(columns)
+    errors = np.zeros(n, dtype=np.uint16)
+
+    errors[~columns.is_object] |= ERR_NOT_OBJECT
+    errors[columns.missing] |= ERR_MISSING_FIELD
+    errors[~columns.frame_id_ok] |= ERR_FRAME_ID
+    errors[columns.scene_type == CODE_INVALID] |= ERR_SCENE_TYPE
+    errors[columns.traffic_light == CODE_INVALID] |= ERR_TRAFFIC_LIGHT
+    errors[columns.decision == CODE_INVALID] |= ERR_DECISION
+
+    # NaN (non-numeric) fails both comparisons; absence is reported as missing
+    conf = columns.confidence
+    conf_ok = (conf >= 0.0) & (conf <= 1.0)
+    errors[~conf_ok & columns.has_confidence] |= ERR_CONFIDENCE
+
+    errors[columns.agent_count < 0] |= ERR_AGENTS
+    agent_rows = _rows_of(columns.agent_offsets)
+    np.bitwise_or.at(errors, agent_rows[columns.agent_type < 0], ERR_AGENT_TYPE)
+    np.bitwise_or.at(errors, agent_rows[columns.agent_position < 0], ERR_AGENT_POSITION)
+    np.bitwise_or.at(errors, agent_rows[~columns.agent_kinematics_ok], ERR_AGENT_KINEMATICS)
+
+    errors[~columns.hazards_ok] |= ERR_HAZARDS
+    errors[~columns.reason_ok] |= ERR_REASON
+    return errors
+
+
+def validate_decisions_columnar(decisions: Sequence[Any]) -> np.ndarray:
+    """
+    Validate a whole decision log without stopping at the first failure.
+
+    Args:
+        decisions: Sequence of decision dicts or `Decision` objects
+
+    Returns:
+        numpy array: uint16 bitmask of `ERR_*` flags per row; 0 means valid
+    """
+    return validate_columns(DecisionColumns(decisions))
+
+
+def describe_errors(mask: int) -> List[str]:
+    """
+    Name the error flags set in one row's mask value.
+
+    Args:
+        mask (int): Value from the array returned by `validate_columns`
+
+    Returns:
+        list: Flag names, e.g. ["scene_type", "confidence"]
+    """
+    return [name for flag, name in ERROR_NAMES.items() if int(mask) & flag]
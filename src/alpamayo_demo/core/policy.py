@@ -5,39 +5,112 @@ This module provides a black-box interface to Alpamayo R1 model.
 For demo purposes, includes a mock implementation that simulates decisions.
 
 The real Alpamayo would take video frames and a language prompt,
-then output structured decisions.
+then output structured decisions. When it runs behind an inference
+server, `adecide` / `adecide_batch` keep several requests in flight
+instead of waiting out each round trip (see `alpamayo_demo.core.remote`).
 """
 
+import asyncio
+import collections
 import json
 import random
 import time
 
+from alpamayo_demo.core.cache import bundle_key, frame_key
+from alpamayo_demo.core.schema import Decision
+
+# Bump when the model or the mock changes so cached decisions are not reused
+POLICY_VERSION = "2"
+
+# Simulated latency of the mock: a fixed per-call cost (prompt encoding,
+# transfer, scheduling) plus a smaller per-frame cost
+MOCK_CALL_LATENCY = 0.1
+MOCK_FRAME_LATENCY = 0.01
+
+# Goal prompt used by the CLI, the batch runner and the Streamlit app
+DEFAULT_GOAL_PROMPT = """
+You are an autonomous vehicle driving in an urban environment.
+Analyze the current scene from the front camera and decide the next action.
+Consider safety, traffic rules, and smooth driving.
+Output your decision in the specified JSON format.
+"""
+
+# Goal prompt for `decide_bundle` with several synchronized cameras
+MULTI_CAMERA_GOAL_PROMPT = """
+You are an autonomous vehicle driving in an urban environment.
+Analyze the current scene from the synchronized camera views and decide the next action.
+Consider safety, traffic rules, and smooth driving.
+Output your decision in the specified JSON format.
+"""
+
+# Return formats accepted by `decide` / `decide_batch`:
+#   json     - pretty-printed JSON string (original behaviour)
+#   dict     - plain dict
+#   decision - slotted `Decision` object
+OUTPUT_FORMATS = ("json", "dict", "decision")
+
 class AlpamayoPolicy:
     """
     Alpamayo R1 policy oracle.
 
     In production, this would interface with the actual Alpamayo model.
     For demo, provides mock responses.
+
+    Args:
+        mock (bool): Use the mock decision maker
+        max_batch_size (int): Maximum frames sent to the model per call
+        max_batch_wait (float): Maximum seconds a streaming caller should
+            hold a partial batch before flushing it (see
+            `alpamayo_demo.utils.pipeline.batched`)
+        max_in_flight (int): Maximum concurrent requests issued by
+            `adecide_stream` / `adecide_batch`
+        client: Async inference client used by `adecide` when not mocking,
+            e.g. `alpamayo_demo.core.remote.RemoteInferenceClient`; any
+            object with an `async decide(frame, prompt) -> dict` works
+        cache (DecisionCache, optional): Decision cache consulted before the
+            model (see `alpamayo_demo.core.cache`)
     """
 
-    def __init__(self, mock=True):
+    def __init__(self, mock=True, max_batch_size=8, max_batch_wait=0.05, max_in_flight=8,
+                 client=None, cache=None):
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be at least 1: {max_batch_size}")
+        if max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be at least 1: {max_in_flight}")
         self.mock = mock
+        self.max_batch_size = max_batch_size
+        self.max_batch_wait = max_batch_wait
+        self.max_in_flight = max_in_flight
+        self.client = client
+        self.cache = cache
         if not mock:
             # Initialize real Alpamayo model here
             # self.model = AlpamayoR1Model.load(...)
             pass
 
-    def decide(self, frame, prompt):
+    @property
+    def version(self):
+        """Identifies the backend for the decision cache key."""
+        return f"{'mock' if self.mock else 'alpamayo-r1'}-{POLICY_VERSION}"
+
+    def decide(self, frame, prompt, output="json"):
         """
         Make a driving decision based on current frame and prompt.
 
         Args:
             frame: Video frame (numpy array)
             prompt (str): Language prompt describing the task
+            output (str): Return format, one of `OUTPUT_FORMATS`. Use
+                "dict" or "decision" on hot paths to skip the JSON round trip.
 
         Returns:
-            str: JSON string with decision
+            str | dict | Decision: Decision in the requested format
         """
+        _check_output(output)
+        [response] = self._cached([frame], prompt, lambda misses: [self._decide_one(misses[0], prompt)])
+        return _format_decision(response, output)
+
+    def _decide_one(self, frame, prompt):
         if self.mock:
             return self._mock_decide(frame, prompt)
         else:
@@ -45,6 +118,178 @@ class AlpamayoPolicy:
             # return self.model.infer(frame, prompt)
             raise NotImplementedError("Real Alpamayo integration not implemented")
 
+    def decide_batch(self, frames, prompt, output="json"):
+        """
+        Make driving decisions for several frames sharing one prompt.
+
+        Frames are sent to the model in chunks of at most `max_batch_size`
+        so the prompt encoding and per-call overhead are paid once per
+        chunk instead of once per frame. With a cache, only the frames it
+        misses reach the model.
+
+        Args:
+            frames: Sequence of video frames (numpy arrays)
+            prompt (str): Language prompt describing the task
+            output (str): Return format, one of `OUTPUT_FORMATS`
+
+        Returns:
+            list: Decisions in the requested format, one per frame, in
+            input order
+        """
+        _check_output(output)
+        responses = self._cached(list(frames), prompt, lambda misses: self._decide_chunks(misses, prompt))
+        return [_format_decision(response, output) for response in responses]
+
+    def _decide_chunks(self, frames, prompt):
+        responses = []
+        for start in range(0, len(frames), self.max_batch_size):
+            chunk = frames[start:start + self.max_batch_size]
+            if self.mock:
+                responses.extend(self._mock_decide_batch(chunk, prompt))
+            else:
+                # Real implementation would encode the prompt once and run
+                # the frames through the model as one batch
+                # return self.model.infer_batch(chunk, prompt)
+                raise NotImplementedError("Real Alpamayo integration not implemented")
+        return responses
+
+    def decide_bundle(self, bundle, prompt, output="json"):
+        """
+        Make one driving decision from time-aligned frames of several cameras.
+
+        The views go to the model in a single call, so the call overhead is
+        paid once per bundle rather than once per camera.
+
+        Args:
+            bundle (dict): Camera name -> frame, e.g. from
+                `alpamayo_demo.utils.waymo_tfrecord.MultiCameraStream`
+            prompt (str): Language prompt describing the task
+            output (str): Return format, one of `OUTPUT_FORMATS`
+
+        Returns:
+            str | dict | Decision: Decision in the requested format
+        """
+        _check_output(output)
+        if not bundle:
+            raise ValueError("Camera bundle is empty")
+        [response] = self._cached([bundle], prompt, lambda misses: [self._decide_bundle(misses[0], prompt)],
+                                  key=bundle_key)
+        return _format_decision(response, output)
+
+    def _decide_bundle(self, bundle, prompt):
+        if self.mock:
+            # Simulate one call over all views: call overhead plus per-view cost
+            time.sleep(MOCK_CALL_LATENCY + MOCK_FRAME_LATENCY * (len(bundle) - 1))
+            return self.mock_response(next(iter(bundle.values())), prompt)
+        else:
+            # Real implementation would pass every view with its camera name
+            # return self.model.infer_multiview(bundle, prompt)
+            raise NotImplementedError("Real Alpamayo integration not implemented")
+
+    def _cached(self, frames, prompt, compute, key=frame_key):
+        """
+        Answer frames from the cache where possible and run `compute` on
+        the rest (one call for all misses), storing what it returns.
+        `key` hashes one input (a frame, or a bundle with `bundle_key`).
+        """
+        if self.cache is None or not frames:
+            return compute(frames)
+        keys = [key(frame, prompt, self.version) for frame in frames]
+        responses = self.cache.get_many(keys)
+        misses = [i for i, response in enumerate(responses) if response is None]
+        if misses:
+            computed = compute([frames[i] for i in misses])
+            self.cache.put_many([(keys[i], response) for i, response in zip(misses, computed)])
+            for i, response in zip(misses, computed):
+                responses[i] = response
+        return responses
+
+    async def adecide(self, frame, prompt, output="json"):
+        """
+        Async counterpart of `decide`.
+
+        The mock awaits the same latency `decide` sleeps; otherwise the
+        request goes to `self.client`. Cache hits return immediately.
+
+        Args:
+            frame: Video frame (numpy array)
+            prompt (str): Language prompt describing the task
+            output (str): Return format, one of `OUTPUT_FORMATS`
+
+        Returns:
+            str | dict | Decision: Decision in the requested format
+        """
+        _check_output(output)
+        key = None
+        if self.cache is not None:
+            key = frame_key(frame, prompt, self.version)
+            response = self.cache.get(key)
+            if response is not None:
+                return _format_decision(response, output)
+        if self.mock:
+            await asyncio.sleep(MOCK_CALL_LATENCY)
+            response = self.mock_response(frame, prompt)
+        elif self.client is None:
+            raise NotImplementedError("Real Alpamayo integration needs an inference client")
+        else:
+            response = await self.client.decide(frame, prompt)
+        if key is not None:
+            self.cache.put(key, response)
+        return _format_decision(response, output)
+
+    async def adecide_stream(self, frames, prompt, output="json"):
+        """
+        Decide frames concurrently, yielding decisions in input order.
+
+        At most `max_in_flight` requests are outstanding; the next frame
+        is pulled from `frames` only when a slot frees up, so long or
+        endless iterables are fine. A slow request holds back the ones
+        behind it (head-of-line) but never reorders them.
+
+        Args:
+            frames: Iterable of video frames
+            prompt (str): Language prompt describing the task
+            output (str): Return format, one of `OUTPUT_FORMATS`
+
+        Yields:
+            str | dict | Decision: One decision per frame, in input order
+        """
+        _check_output(output)
+        in_flight = collections.deque()
+        frames = iter(frames)
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(in_flight) < self.max_in_flight:
+                    try:
+                        frame = next(frames)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    in_flight.append(asyncio.ensure_future(self.adecide(frame, prompt, output)))
+                if not in_flight:
+                    return
+                yield await in_flight.popleft()
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+    async def adecide_batch(self, frames, prompt, output="json"):
+        """
+        Decide a sequence of frames with up to `max_in_flight` concurrent
+        requests.
+
+        Args:
+            frames: Sequence of video frames (numpy arrays)
+            prompt (str): Language prompt describing the task
+            output (str): Return format, one of `OUTPUT_FORMATS`
+
+        Returns:
+            list: Decisions in the requested format, one per frame, in
+            input order
+        """
+        return [decision async for decision in self.adecide_stream(frames, prompt, output)]
+
     def _mock_decide(self, frame, prompt):
         """
         Mock decision maker that simulates Alpamayo responses.
@@ -53,8 +298,24 @@ class AlpamayoPolicy:
         In reality, would use sophisticated vision-language models.
         """
         # Simulate processing time
-        time.sleep(0.1)
+        time.sleep(MOCK_CALL_LATENCY)
+        return self.mock_response(frame, prompt)
 
+    def _mock_decide_batch(self, frames, prompt):
+        """
+        Batched mock: one call overhead for the whole batch plus a small
+        per-frame cost, mimicking how a batched VLA backend amortizes work.
+        """
+        time.sleep(MOCK_CALL_LATENCY + MOCK_FRAME_LATENCY * (len(frames) - 1))
+        return [self.mock_response(frame, prompt) for frame in frames]
+
+    def mock_response(self, frame, prompt):
+        """
+        Build one randomized mock decision dict, without simulated latency.
+
+        Public so that stand-ins for the model (e.g. the stub server in
+        `alpamayo_demo.core.remote`) can answer like the mock policy.
+        """
         # Mock scene analysis (in real implementation, this would be from the model)
         scene_types = ["intersection", "straight_road", "crosswalk", "parking_lot"]
         scene_type = random.choice(scene_types)
@@ -64,9 +325,16 @@ class AlpamayoPolicy:
         if random.random() > 0.5:
             agent_types = ["vehicle", "pedestrian", "cyclist"]
             positions = ["left", "right", "ahead", "crossing"]
+            agent_type = random.choice(agent_types)
+            position = random.choice(positions)
+            # Lead vehicles drive away along the ego heading; everything else
+            # barely moves along it
+            moving_ahead = agent_type == "vehicle" and position == "ahead"
             agents.append({
-                "type": random.choice(agent_types),
-                "position": random.choice(positions)
+                "type": agent_type,
+                "position": position,
+                "distance": round(random.uniform(3.0, 60.0), 1),
+                "speed": round(random.uniform(0.0, 15.0) if moving_ahead else random.uniform(-0.5, 0.5), 1)
             })
 
         # Mock traffic light
@@ -100,8 +368,8 @@ class AlpamayoPolicy:
         ]
         reason = random.choice(reasons)
 
-        # Construct JSON response
-        response = {
+        # Construct response
+        return {
             "frame_id": 0,  # Placeholder, will be set by caller
             "scene_type": scene_type,
             "agents": agents,
@@ -112,4 +380,16 @@ class AlpamayoPolicy:
             "reason": reason
         }
 
-        return json.dumps(response, indent=2)
+
+def _check_output(output):
+    if output not in OUTPUT_FORMATS:
+        raise ValueError(f"Invalid output format: {output}")
+
+
+def _format_decision(response, output):
+    """Convert a raw response dict into the requested output format."""
+    if output == "dict":
+        return response
+    if output == "decision":
+        return Decision.from_dict(response)
+    return json.dumps(response, indent=2)
@@ -0,0 +1,215 @@
+"""
+Remote inference client and local stub server.
+
+The real Alpamayo model is expected to run behind an inference server.
+This module defines a small wire protocol for it: newline-delimited JSON
+over TCP, one request per line, each tagged with an id so many requests
+can be in flight on one connection and answered out of order.
+
+Request:  {"id": 3, "prompt": "...", "frame": "<base64 JPEG>"}
+Response: {"id": 3, "decision": {...}}  or  {"id": 3, "error": "..."}
+
+Classes:
+    - RemoteInferenceClient: Async multiplexing client
+
+Functions:
+    - serve_stub: Start a local server that answers with mock decisions
+      after a simulated latency (like `_mock_decide`'s sleep)
+"""
+
+import argparse
+import asyncio
+import base64
+import itertools
+import json
+import random
+
+import cv2
+
+from alpamayo_demo.core.policy import AlpamayoPolicy, MOCK_CALL_LATENCY
+
+# Seconds `RemoteInferenceClient.decide` waits for a response
+DEFAULT_TIMEOUT = 30.0
+
+
+def encode_frame(frame, quality=90):
+    """JPEG-encode a BGR frame and return it as base64 text."""
+    ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError("Could not JPEG-encode frame")
+    return base64.b64encode(buf.tobytes()).decode("ascii")
+
+
+class RemoteInferenceClient:
+    """
+    Async client for a remote inference server.
+
+    Requests share one connection; responses are matched to requests by id,
+    so any number may be in flight at once (the caller bounds concurrency).
+    If the server drops the connection, requests in flight fail with
+    `ConnectionError` and the next `decide` reconnects.
+
+    Args:
+        host (str): Server host
+        port (int): Server port
+        timeout (float): Seconds to wait for each response
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, timeout=DEFAULT_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._reader = None
+        self._writer = None
+        self._pending = {}
+        self._ids = itertools.count()
+        self._listener = None
+        self._connect_lock = None
+
+    async def connect(self):
+        """Open the connection (done lazily by `decide`)."""
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self._writer is None:
+                self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+                self._listener = asyncio.ensure_future(self._listen())
+
+    async def _listen(self):
+        reader, writer = self._reader, self._writer
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                future = self._pending.pop(message["id"], None)
+                if future is None or future.done():
+                    continue
+                if "error" in message:
+                    future.set_exception(RuntimeError(f"Remote inference failed: {message['error']}"))
+                else:
+                    future.set_result(message["decision"])
+        finally:
+            # The connection is unusable: fail what is in flight and let the
+            # next request open a new one
+            if self._writer is writer:
+                self._reader = self._writer = None
+            writer.close()
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Inference server closed the connection"))
+            self._pending.clear()
+
+    async def decide(self, frame, prompt):
+        """
+        Send one frame and prompt; wait for the decision.
+
+        Returns:
+            dict: Decision as returned by the server
+
+        Raises:
+            ConnectionError: If the connection is lost before the response
+            TimeoutError: If no response arrives within `timeout` seconds
+        """
+        payload = {"prompt": prompt, "frame": encode_frame(frame)}
+        await self.connect()
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            self._writer.write(json.dumps({"id": request_id, **payload}).encode() + b"\n")
+            await self._writer.drain()
+            return await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"No response from inference server within {self.timeout}s") from None
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def close(self):
+        """Close the connection."""
+        writer = self._writer
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+        if self._listener is not None:
+            await self._listener
+            self._listener = None
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+
+async def serve_stub(host="127.0.0.1", port=0, latency=MOCK_CALL_LATENCY, jitter=0.0):
+    """
+    Start a stub inference server answering with mock decisions.
+
+    Each request is handled concurrently and answered after `latency`
+    plus up to `jitter` seconds, so responses may arrive out of order.
+
+    Args:
+        host (str): Interface to bind
+        port (int): Port to bind; 0 picks a free port
+        latency (float): Simulated inference time in seconds
+        jitter (float): Extra random latency in seconds
+
+    Returns:
+        asyncio.base_events.Server: Running server; the bound port is
+        `server.sockets[0].getsockname()[1]`
+    """
+    policy = AlpamayoPolicy(mock=True)
+
+    async def answer(request, writer, lock):
+        await asyncio.sleep(latency + random.uniform(0.0, jitter))
+        try:
+            if not request.get("frame"):
+                raise ValueError("request has no frame")
+            # Not `policy.decide`: its simulated latency would block the event
+            # loop, and latency is already simulated above
+            response = {"id": request["id"], "decision": policy.mock_response(None, request["prompt"])}
+        except Exception as e:
+            response = {"id": request.get("id"), "error": str(e)}
+        async with lock:
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+
+    async def handle(reader, writer):
+        lock = asyncio.Lock()
+        tasks = set()
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            task = asyncio.ensure_future(answer(json.loads(line), writer, lock))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+async def _serve_forever(host, port, latency, jitter):
+    server = await serve_stub(host, port, latency, jitter)
+    print(f"Stub inference server on {host}:{server.sockets[0].getsockname()[1]} "
+          f"(latency {latency}s + up to {jitter}s)")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stub Alpamayo inference server")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=MOCK_CALL_LATENCY, help="Simulated latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency (s)")
+    args = parser.parse_args()
+    asyncio.run(_serve_forever(args.host, args.port, args.latency, args.jitter))
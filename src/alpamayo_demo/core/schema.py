@@ -1,16 +1,18 @@
 """
 Decision schema validation for Alpamayo outputs.
 
-Defines the expected JSON structure and validates responses.
+Defines the expected JSON structure, a compact in-memory `Decision`
+record, and validates responses.
 """
 
 import json
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Union
 
 DECISION_SCHEMA = {
     "type": "object",
     "properties": {
-        "frame_id": {"type": "integer"},
+        # The int64 range, which columnar validation stores frame ids in
+        "frame_id": {"type": "integer", "minimum": -2**63, "maximum": 2**63 - 1},
         "scene_type": {
             "type": "string",
             "enum": ["intersection", "straight_road", "crosswalk", "parking_lot"]
@@ -21,7 +23,11 @@ DECISION_SCHEMA = {
                 "type": "object",
                 "properties": {
                     "type": {"type": "string", "enum": ["vehicle", "pedestrian", "cyclist"]},
-                    "position": {"type": "string", "enum": ["left", "right", "ahead", "crossing"]}
+                    "position": {"type": "string", "enum": ["left", "right", "ahead", "crossing"]},
+                    # Optional kinematics for the safety gate: gap in meters and
+                    # speed along the ego heading in m/s
+                    "distance": {"type": "number", "minimum": 0.0},
+                    "speed": {"type": "number"}
                 },
                 "required": ["type", "position"]
             }
@@ -44,12 +50,354 @@ DECISION_SCHEMA = {
     "required": ["scene_type", "agents", "traffic_light", "hazards", "decision", "confidence", "reason"]
 }
 
-def validate_decision(decision_json: str) -> Dict[str, Any]:
+DECISION_FIELDS = tuple(DECISION_SCHEMA["properties"])
+
+
+class Decision:
+    """
+    Compact, slotted record of one policy decision.
+
+    Mirrors `DECISION_SCHEMA` field for field. Used on the hot path in place
+    of JSON strings; serialize with `to_json` only at the output boundary.
+    """
+
+    __slots__ = DECISION_FIELDS
+
+    def __init__(self, scene_type: str, agents: List[Dict[str, str]], traffic_light: str,
+                 hazards: List[str], decision: str, confidence: float, reason: str,
+                 frame_id: int = 0):
+        self.frame_id = frame_id
+        self.scene_type = scene_type
+        self.agents = agents
+        self.traffic_light = traffic_light
+        self.hazards = hazards
+        self.decision = decision
+        self.confidence = confidence
+        self.reason = reason
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Decision":
+        """Build a Decision from a schema-shaped dict (extra keys ignored)."""
+        return cls(**{field: data[field] for field in DECISION_FIELDS if field in data})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the decision as a plain dict in schema field order."""
+        return {field: getattr(self, field) for field in DECISION_FIELDS}
+
+    def to_json(self, indent: int = None) -> str:
+        """Serialize the decision to a JSON string."""
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def __eq__(self, other):
+        if not isinstance(other, Decision):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in DECISION_FIELDS)
+
+    def __repr__(self):
+        return (f"Decision(frame_id={self.frame_id}, decision={self.decision!r}, "
+                f"confidence={self.confidence})")
+
+
+# JSON Schema type name -> accepted Python types. bool is rejected where an
+# integer or number is expected.
+_TYPES = {
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "array": (list, tuple),
+    "object": dict,
+}
+_NUMERIC_TYPES = frozenset(("integer", "number"))
+
+# Exact classes the fast path accepts per type name; subclasses (numpy
+# scalars, str subclasses) are left to the full check
+_EXACT_TYPES = {
+    "string": frozenset((str,)),
+    "integer": frozenset((int,)),
+    "number": frozenset((int, float)),
+    "boolean": frozenset((bool,)),
+    "array": frozenset((list, tuple)),
+    "object": frozenset((dict,)),
+}
+
+# Marks an absent optional field
+_ABSENT = object()
+_INF = float("inf")
+
+
+def _type_error(path, type_name, value):
+    return ValueError(f"Invalid type for {path or 'decision'}: "
+                      f"expected {type_name}, got {type(value).__name__}")
+
+
+def _enum_error(label, value):
+    return ValueError(f"Invalid {label}: {value}")
+
+
+def _range_error(label, minimum, maximum, value):
+    if maximum is None:
+        bounds = f"at least {minimum}"
+    elif minimum is None:
+        bounds = f"at most {maximum}"
+    else:
+        bounds = f"between {minimum} and {maximum}"
+    return ValueError(f"{label.capitalize()} must be {bounds}: {value}")
+
+
+def _missing_error(path):
+    return ValueError(f"Missing required field: {path}")
+
+
+def _value_checks(schema, label, path):
+    """(types, type_name, enum, minimum, maximum, label, path) of one node."""
+    enum = frozenset(schema["enum"]) if "enum" in schema else None
+    return (_TYPES.get(schema.get("type")), schema.get("type"), enum, schema.get("minimum"),
+            schema.get("maximum"), label, path)
+
+
+def _field_checks(schema, label="", path=""):
+    """
+    Flatten the properties of an object node into the full checks.
+
+    Each check is `(key, *_value_checks(...), items)`; `items` is set for
+    arrays as `(*_value_checks(item), required, fields)`, with
+    `required`/`fields` describing object items (None for scalar items).
+    Objects inside arrays inside objects are as deep as it goes.
+    """
+    checks = []
+    for key, sub in schema.get("properties", {}).items():
+        sub_label = f"{label} {key}" if label else key
+        sub_path = f"{path}.{key}" if path else key
+        if sub.get("type") == "object" or (path and "items" in sub):
+            raise ValueError(f"Schema nesting too deep for DecisionValidator at {sub_path}")
+        items = None
+        if "items" in sub:
+            item = sub["items"]
+            # Items of an array called "agents" are reported as "agent ..."
+            item_label = sub_label[:-1] if sub_label.endswith("s") else sub_label
+            item_path = sub_path + "[{}]"
+            required = fields = None
+            if item.get("type") == "object":
+                required = tuple(item.get("required", ()))
+                fields = _field_checks(item, item_label, item_path)
+            items = _value_checks(item, item_label, item_path) + (required, fields)
+        checks.append((key,) + _value_checks(sub, sub_label, sub_path) + (items,))
+    return tuple(checks)
+
+
+def _bounds(schema):
+    """(minimum, maximum) with open ends as infinities, or None if unbounded."""
+    minimum, maximum = schema.get("minimum"), schema.get("maximum")
+    if minimum is None and maximum is None:
+        return None
+    return (-_INF if minimum is None else minimum, _INF if maximum is None else maximum)
+
+
+def _fast_checks(schema):
+    """
+    Split the properties of an object node into the fast path's checks.
+
+    Returns:
+        tuple: (enums, typed, bounded, arrays, n_required, optional)
+            - enums: (key, values) for required string enums, where
+              membership alone proves the type
+            - typed: (key, classes) for other required typed fields
+            - bounded: (key, classes, minimum, maximum) for the bounded
+              ones of those
+            - arrays: (key, default, item classes, item checks, item range)
+              for typed arrays; `default` stands in for a missing array
+              and only passes the type check if the array is optional.
+              Item checks are `_fast_checks` of object items
+            - n_required: size of an object holding only the keys above
+              (so `optional` can be skipped), or -1
+            - optional: (key, required, classes, values, minimum, maximum)
+              for everything else, mostly optional fields
+    """
+    required = set(schema.get("required", ()))
+    enums, typed, bounded, arrays, optional = [], [], [], [], []
+    for key, sub in schema.get("properties", {}).items():
+        type_name, enum = sub.get("type"), sub.get("enum")
+        classes, bounds = _EXACT_TYPES.get(type_name), _bounds(sub)
+        if key in required and enum is not None and type_name in (None, "string") \
+                and all(isinstance(value, str) for value in enum):
+            enums.append((key, frozenset(enum)))
+        elif type_name == "array" and enum is None and bounds is None:
+            item = sub.get("items", {})
+            item_checks = _fast_checks(item) if item.get("type") == "object" else None
+            arrays.append((key, _ABSENT if key in required else (), _EXACT_TYPES.get(item.get("type")),
+                           item_checks, _bounds(item)))
+        elif key in required and classes is not None and enum is None:
+            if bounds is None:
+                typed.append((key, classes))
+            else:
+                bounded.append((key, classes) + bounds)
+        else:
+            optional.append((key, key in required, classes, None if enum is None else frozenset(enum))
+                            + (bounds or (None, None)))
+    # Required keys the schema does not describe only need to be present
+    optional.extend((key, True, None, None, None, None) for key in required - set(schema.get("properties", {})))
+    n_required = -1 if any(check[1] for check in optional) else len(required)
+    return tuple(enums), tuple(typed), tuple(bounded), tuple(arrays), n_required, tuple(optional)
+
+
+def _optional_ok(obj, optional):
+    """The `optional` checks of `_fast_checks` for one object."""
+    for key, required, classes, values, minimum, maximum in optional:
+        value = obj.get(key, _ABSENT)
+        if value is _ABSENT:
+            if required:
+                return False
+        elif ((classes is not None and type(value) not in classes) or (values is not None and value not in values)
+              or (minimum is not None and not minimum <= value <= maximum)):
+            return False
+    return True
+
+
+def _fields_ok(obj, checks):
+    """
+    Fast path over a decision's fields, including array items.
+
+    Object items are checked inline rather than by recursing, which would
+    cost a call per agent. Returns False, or raises KeyError/TypeError
+    (missing key, unhashable or unorderable value), where the full check
+    has to find the error.
+    """
+    enums, typed, bounded, arrays, n_required, optional = checks
+    for key, values in enums:
+        if obj[key] not in values:
+            return False
+    for key, classes in typed:
+        if type(obj[key]) not in classes:
+            return False
+    for key, classes, minimum, maximum in bounded:
+        value = obj[key]
+        # Negated comparisons so that NaN fails them
+        if type(value) not in classes or not minimum <= value <= maximum:
+            return False
+    for key, default, item_classes, item_checks, item_bounds in arrays:
+        items = obj.get(key, default)
+        if type(items) is not list and type(items) is not tuple:
+            return False
+        if item_checks is not None:
+            item_enums, item_typed, item_bounded, _, item_n_required, item_optional = item_checks
+            for item in items:
+                if type(item) is not dict:
+                    return False
+                for item_key, values in item_enums:
+                    if item[item_key] not in values:
+                        return False
+                for item_key, classes in item_typed:
+                    if type(item[item_key]) not in classes:
+                        return False
+                for item_key, classes, minimum, maximum in item_bounded:
+                    value = item[item_key]
+                    if type(value) not in classes or not minimum <= value <= maximum:
+                        return False
+                if len(item) != item_n_required and not _optional_ok(item, item_optional):
+                    return False
+        elif item_classes is not None or item_bounds is not None:
+            for item in items:
+                if (item_classes is not None and type(item) not in item_classes) or (
+                        item_bounds is not None and not item_bounds[0] <= item <= item_bounds[1]):
+                    return False
+    return len(obj) == n_required or _optional_ok(obj, optional)
+
+
+def _is_instance(value, types, type_name):
+    if types is None:
+        return True
+    return isinstance(value, types) and not (type_name in _NUMERIC_TYPES and isinstance(value, bool))
+
+
+def _check_value(value, types, type_name, enum, minimum, maximum, label, path):
+    if not _is_instance(value, types, type_name):
+        raise _type_error(path, type_name, value)
+    if enum is not None and value not in enum:
+        raise _enum_error(label, value)
+    # Negated comparisons so that NaN fails them
+    if (minimum is not None and not value >= minimum) or (maximum is not None and not value <= maximum):
+        raise _range_error(label, minimum, maximum, value)
+
+
+class DecisionValidator:
     """
-    Validate a decision JSON string against the schema.
+    Validator precomputed once from a JSON schema.
+
+    The schema is flattened into tuples of per-field checks: frozenset
+    enums, the exact classes each type accepts and bounds with open ends
+    as infinities. A valid decision costs one pass over those tuples, with
+    no schema lookups, recursion or closures. When the fast path rejects
+    a decision, or cannot tell (e.g. a numpy scalar), the full checks run
+    to accept it or report the first error with its path.
+
+    Honours `type`, `enum`, `minimum`, `maximum`, `items`, `properties`
+    and `required`, for an object whose fields are scalars or arrays of
+    scalars or flat objects (the shape of `DECISION_SCHEMA`).
+    """
+
+    def __init__(self, schema: Dict[str, Any]):
+        if schema.get("type") != "object":
+            raise ValueError("DecisionValidator needs an object schema")
+        self._required = tuple(schema.get("required", ()))
+        self._fields = _field_checks(schema)
+        self._fast = _fast_checks(schema)
+
+    def validate(self, decision: Any) -> Any:
+        """
+        Validate an already-parsed decision.
+
+        Raises:
+            ValueError: If validation fails
+        """
+        try:
+            if type(decision) is dict and _fields_ok(decision, self._fast):
+                return decision
+        except (KeyError, TypeError):
+            pass
+        self._check(decision)
+        return decision
+
+    def _check(self, decision):
+        """Full checks with error messages; slower but exact."""
+        if not isinstance(decision, dict):
+            raise _type_error("", "object", decision)
+        for key in self._required:
+            if key not in decision:
+                raise _missing_error(key)
+
+        for key, types, type_name, enum, minimum, maximum, label, path, items in self._fields:
+            if key not in decision:
+                continue
+            value = decision[key]
+            _check_value(value, types, type_name, enum, minimum, maximum, label, path)
+            if items is None:
+                continue
+            (item_types, item_type_name, item_enum, item_min, item_max, item_label, item_path,
+             required, fields) = items
+            for i, item in enumerate(value):
+                _check_value(item, item_types, item_type_name, item_enum, item_min, item_max, item_label,
+                             item_path.format(i))
+                if fields is None:
+                    continue
+                for name in required:
+                    if name not in item:
+                        raise _missing_error(f"{item_path.format(i)}.{name}")
+                for name, *checks, _ in fields:
+                    if name in item:
+                        _check_value(item[name], *checks[:-1], checks[-1].format(i))
+
+
+_VALIDATOR = DecisionValidator(DECISION_SCHEMA)
+
+
+def validate_decision(decision_json: Union[str, Dict[str, Any], Decision]) -> Dict[str, Any]:
+    """
+    Validate a decision against the schema.
 
     Args:
-        decision_json (str): JSON string to validate
+        decision_json: JSON string, already-parsed dict, or `Decision`.
+            Dicts and Decisions are validated without a JSON round trip.
 
     Returns:
         dict: Parsed and validated decision
@@ -57,36 +405,39 @@ def validate_decision(decision_json: str) -> Dict[str, Any]:
     Raises:
         ValueError: If validation fails
     """
-    try:
-        decision = json.loads(decision_json)
-    except json.JSONDecodeError as e:
-        raise ValueError(f"Invalid JSON: {e}")
-
-    # Basic validation (in production, use jsonschema library)
-    required_fields = DECISION_SCHEMA["properties"].keys()
-    for field in required_fields:
-        if field not in decision:
-            raise ValueError(f"Missing required field: {field}")
-
-    # Validate enums
-    if decision["scene_type"] not in DECISION_SCHEMA["properties"]["scene_type"]["enum"]:
-        raise ValueError(f"Invalid scene_type: {decision['scene_type']}")
-
-    if decision["traffic_light"] not in DECISION_SCHEMA["properties"]["traffic_light"]["enum"]:
-        raise ValueError(f"Invalid traffic_light: {decision['traffic_light']}")
-
-    if decision["decision"] not in DECISION_SCHEMA["properties"]["decision"]["enum"]:
-        raise ValueError(f"Invalid decision: {decision['decision']}")
-
-    # Validate agents
-    for agent in decision["agents"]:
-        if agent["type"] not in DECISION_SCHEMA["properties"]["agents"]["items"]["properties"]["type"]["enum"]:
-            raise ValueError(f"Invalid agent type: {agent['type']}")
-        if agent["position"] not in DECISION_SCHEMA["properties"]["agents"]["items"]["properties"]["position"]["enum"]:
-            raise ValueError(f"Invalid agent position: {agent['position']}")
-
-    # Validate confidence
-    if not (0.0 <= decision["confidence"] <= 1.0):
-        raise ValueError(f"Confidence must be between 0.0 and 1.0: {decision['confidence']}")
-
-    return decision
+    # Plain dicts first: the common case
+    if type(decision_json) is dict:
+        decision = decision_json
+    elif isinstance(decision_json, Decision):
+        decision = decision_json.to_dict()
+    elif isinstance(decision_json, dict):
+        decision = decision_json
+    else:
+        try:
+            decision = json.loads(decision_json)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e}")
+
+    return _VALIDATOR.validate(decision)
+
+
+def validate_decisions(decisions: List[Union[str, Dict[str, Any], Decision]]) -> List[Dict[str, Any]]:
+    """
+    Validate a batch of decisions in one call.
+
+    Args:
+        decisions: Sequence of JSON strings, dicts or `Decision` objects
+
+    Returns:
+        list: Parsed and validated decisions, in input order
+
+    Raises:
+        ValueError: On the first invalid decision, prefixed with its index
+    """
+    validated = []
+    for i, decision in enumerate(decisions):
+        try:
+            validated.append(validate_decision(decision))
+        except ValueError as e:
+            raise ValueError(f"Decision {i}: {e}") from e
+    return validated
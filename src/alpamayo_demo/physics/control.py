@@ -0,0 +1,206 @@
+"""
+Vectorized PID speed control for many vehicles.
+
+The Julia `pid_control` threads `integral_err` and `prev_err` by hand for
+one controller. `PIDControllerBank` keeps that state for N vehicles in
+contiguous arrays and advances all of them with one
+`physics.math_foundations.pid_control` call per tick, so replaying
+thousands of decision logs costs one small array operation per step.
+
+Discrete decisions become speed targets through `ACTION_SPEEDS`: slowing
+actions cap the target at their speed, `accelerate` raises it to cruise
+speed, and `maintain_speed` holds the vehicle's current speed. Targets
+never push against the decision (slowing down never speeds a slow
+vehicle up).
+
+Functions:
+    - encode_actions: Decision strings -> int8 action codes
+    - replay_speed_profiles: Speed profiles for a fleet of decision logs
+
+Classes:
+    - PIDControllerBank: PID state and stepping for N vehicles
+"""
+
+import numpy as np
+
+from alpamayo_demo.core.schema import DECISION_SCHEMA
+from alpamayo_demo.physics.math_foundations import pid_control
+
+# Decision vocabulary, in schema order; action codes index this tuple
+ACTIONS = tuple(DECISION_SCHEMA["properties"]["decision"]["enum"])
+
+# Target speed per action in m/s; None holds the current speed
+ACTION_SPEEDS = {
+    "accelerate": 14.0,
+    "maintain_speed": None,
+    "slow_down": 6.0,
+    "yield": 3.0,
+    "brake": 0.0,
+    "stop": 0.0,
+}
+
+# Default gains and limits: acceleration command in m/s^2 per m/s of error
+DEFAULT_GAINS = (1.0, 0.1, 0.05)
+MAX_ACCEL = 3.0
+MAX_DECEL = 6.0
+DT = 0.1
+
+# Code for decisions outside `ACTIONS`; treated like maintain_speed
+CODE_UNKNOWN = -1
+
+_ACTION_CODES = {action: i for i, action in enumerate(ACTIONS)}
+# Per-code target speed and direction (+1 raise to, -1 cap at, 0 hold);
+# index -1 (unknown) lands on the trailing hold entry
+_SPEED = np.array([ACTION_SPEEDS.get(a) or 0.0 for a in ACTIONS] + [0.0])
+_DIRECTION = np.array([0 if ACTION_SPEEDS.get(a) is None else (1 if a == "accelerate" else -1)
+                       for a in ACTIONS] + [0], dtype=np.int8)
+
+
+def encode_actions(actions):
+    """
+    Map decision strings to action codes.
+
+    Args:
+        actions (array-like): Action strings (any shape), e.g. the
+            `decision` field of each frame
+
+    Returns:
+        np.ndarray: int8 codes indexing `ACTIONS`; `CODE_UNKNOWN` for
+        anything else
+    """
+    actions = np.asarray(actions, dtype=object)
+    codes = np.fromiter((_ACTION_CODES.get(a, CODE_UNKNOWN) for a in actions.ravel()),
+                        dtype=np.int8, count=actions.size)
+    return codes.reshape(actions.shape)
+
+
+class PIDControllerBank:
+    """
+    PID speed controllers for N vehicles with state in flat arrays.
+
+    Outputs are acceleration commands clipped to `[-max_decel,
+    max_accel]`. While a controller is saturated its integral is frozen
+    (anti-windup), and the derivative term is skipped on the first step
+    after a reset so a fresh controller does not kick.
+
+    Args:
+        n (int): Number of vehicles
+        kp, ki, kd (float): Gains
+        dt (float): Tick length in seconds
+        max_accel, max_decel (float): Command limits in m/s^2
+
+    Attributes:
+        target (np.ndarray): Target speed per vehicle (m/s)
+        integral_err (np.ndarray): Integrated error per vehicle
+        prev_err (np.ndarray): Error at the last tick; NaN after a reset
+    """
+
+    def __init__(self, n, kp=DEFAULT_GAINS[0], ki=DEFAULT_GAINS[1], kd=DEFAULT_GAINS[2], dt=DT,
+                 max_accel=MAX_ACCEL, max_decel=MAX_DECEL):
+        if n < 1:
+            raise ValueError(f"Need at least one vehicle: {n}")
+        if dt <= 0:
+            raise ValueError(f"dt must be positive: {dt}")
+        self.n = n
+        self.kp, self.ki, self.kd = kp, ki, kd
+        self.dt = dt
+        self.max_accel = max_accel
+        self.max_decel = max_decel
+        self.target = np.zeros(n)
+        self.integral_err = np.zeros(n)
+        self.prev_err = np.full(n, np.nan)
+
+    def reset(self, mask=None):
+        """Clear integral and derivative state (all vehicles, or where `mask`)."""
+        if mask is None:
+            mask = slice(None)
+        self.integral_err[mask] = 0.0
+        self.prev_err[mask] = np.nan
+
+    def set_targets(self, targets, mask=None):
+        """Set target speeds (all vehicles, or where `mask`)."""
+        if mask is None:
+            self.target[:] = targets
+        else:
+            self.target[mask] = np.broadcast_to(targets, self.target.shape)[mask]
+
+    def set_actions(self, codes, speeds, mask=None):
+        """
+        Turn one decision per vehicle into its target speed.
+
+        Args:
+            codes (np.ndarray): Action codes from `encode_actions`, shape (n,)
+            speeds (np.ndarray): Current speeds (m/s), shape (n,)
+            mask (np.ndarray, optional): Only update these vehicles, e.g.
+                the ones that received a new decision this tick
+        """
+        speeds = np.broadcast_to(np.asarray(speeds, dtype=np.float64), (self.n,))
+        base = _SPEED[codes]
+        direction = _DIRECTION[codes]
+        targets = np.where(direction > 0, np.maximum(speeds, base),
+                           np.where(direction < 0, np.minimum(speeds, base), speeds))
+        self.set_targets(targets, mask)
+
+    def step(self, speeds):
+        """
+        Advance every controller by one tick.
+
+        Args:
+            speeds (np.ndarray): Measured speeds (m/s), shape (n,)
+
+        Returns:
+            np.ndarray: Acceleration commands (m/s^2), shape (n,)
+        """
+        error = self.target - speeds
+        # No derivative kick on the first tick after a reset
+        prev_err = np.where(np.isnan(self.prev_err), error, self.prev_err)
+        raw, integral, error = pid_control(self.target, speeds, self.kp, self.ki, self.kd,
+                                           self.integral_err, prev_err, self.dt)
+        command = np.clip(raw, -self.max_decel, self.max_accel)
+        # Anti-windup: keep integrating only while unsaturated, or while the
+        # error pulls the command back out of saturation
+        winding = (command != raw) & (np.sign(error) == np.sign(raw))
+        np.copyto(self.integral_err, np.where(winding, self.integral_err, integral))
+        np.copyto(self.prev_err, error)
+        return command
+
+
+def replay_speed_profiles(actions, initial_speed=0.0, steps_per_decision=1, bank=None):
+    """
+    Replay decision logs for a fleet and return the resulting speeds.
+
+    Each vehicle gets a new target from its next decision every
+    `steps_per_decision` ticks; between decisions the controllers track
+    the last target. Speeds never go negative.
+
+    Args:
+        actions (array-like): Decisions, shape (N, T), as strings or
+            codes from `encode_actions`
+        initial_speed (float | array-like): Starting speed per vehicle
+        steps_per_decision (int): Controller ticks per decision
+        bank (PIDControllerBank, optional): Controllers to use (gains,
+            dt); a default bank of N vehicles otherwise
+
+    Returns:
+        np.ndarray: Speeds of shape (N, T * steps_per_decision + 1), with
+        the initial speed at index 0
+    """
+    codes = np.asarray(actions)
+    if codes.dtype.kind != "i":
+        codes = encode_actions(codes)
+    if codes.ndim != 2:
+        raise ValueError(f"Actions must be (vehicles, decisions): {codes.shape}")
+    n, decisions = codes.shape
+    bank = bank if bank is not None else PIDControllerBank(n)
+    if bank.n != n:
+        raise ValueError(f"Bank has {bank.n} vehicles, actions have {n}")
+
+    ticks = decisions * steps_per_decision
+    speeds = np.empty((n, ticks + 1))
+    speeds[:, 0] = initial_speed
+    for t in range(ticks):
+        v = speeds[:, t]
+        if t % steps_per_decision == 0:
+            bank.set_actions(codes[:, t // steps_per_decision], v)
+        speeds[:, t + 1] = np.maximum(v + bank.step(v) * bank.dt, 0.0)
+    return speeds
@@ -0,0 +1,102 @@
+"""
+Vectorized kinematic bicycle model.
+
+NumPy port of `kinematic_bicycle_step` from `src/math_foundations.jl`,
+plus a rollout that integrates many candidate control sequences at once.
+Forward Euler makes every state a running sum of per-step increments, so
+a whole `N candidates x T steps` rollout is a handful of array operations
+(`tan`, `cos`, `sin` and three `cumsum`s) instead of `N * T` Python-level
+steps. `np.cumsum` adds sequentially, so results match stepping
+`kinematic_bicycle_step` one point at a time.
+
+Functions:
+    - kinematic_bicycle_step: One Euler step; broadcasts over arrays
+    - rollout: Integrate N control sequences of T steps in one pass
+    - control_grid: Constant (steering, speed) candidates as control arrays
+"""
+
+import numpy as np
+
+# Vehicle and integration defaults (match scripts/generate_trajectory_visual.py)
+WHEELBASE = 2.7
+DT = 0.1
+
+
+def kinematic_bicycle_step(x, y, theta, v, delta, wheelbase=WHEELBASE, dt=DT):
+    """
+    Advance the kinematic bicycle model by one Euler step.
+
+    Accepts scalars or arrays of any broadcast-compatible shapes, so one
+    call steps a whole fleet.
+
+    Args:
+        x, y: Position (m)
+        theta: Heading (rad)
+        v: Speed (m/s)
+        delta: Steering angle (rad)
+        wheelbase (float): Axle distance (m)
+        dt (float): Time step (s)
+
+    Returns:
+        tuple: (next_x, next_y, next_theta)
+    """
+    dx = v * np.cos(theta)
+    dy = v * np.sin(theta)
+    dtheta = (v / wheelbase) * np.tan(delta)
+    return x + dx * dt, y + dy * dt, theta + dtheta * dt
+
+
+def _integrate(start, increments):
+    """Running sum of `increments` after `start`, along the last axis."""
+    out = np.empty(increments.shape[:-1] + (increments.shape[-1] + 1,))
+    out[..., 0] = start
+    out[..., 1:] = increments
+    return np.cumsum(out, axis=-1, out=out)
+
+
+def rollout(steering, speed, x0=0.0, y0=0.0, theta0=0.0, wheelbase=WHEELBASE, dt=DT):
+    """
+    Roll out the bicycle model for many control sequences at once.
+
+    Args:
+        steering (array-like): Steering angles (rad), shape `(..., T)`
+        speed (array-like): Speeds (m/s), broadcastable with `steering`
+        x0, y0, theta0: Initial state, scalars or arrays broadcastable to
+            the leading `...` shape (one start per sequence)
+        wheelbase (float): Axle distance (m)
+        dt (float): Time step (s)
+
+    Returns:
+        tuple: (x, y, theta), each of shape `(..., T + 1)` with the initial
+        state at index 0
+    """
+    steering, speed = np.broadcast_arrays(np.asarray(steering, dtype=np.float64),
+                                          np.asarray(speed, dtype=np.float64))
+    if steering.ndim == 0:
+        raise ValueError("Controls need a time axis")
+    theta = _integrate(theta0, (speed / wheelbase) * np.tan(steering) * dt)
+    heading = theta[..., :-1]
+    x = _integrate(x0, speed * np.cos(heading) * dt)
+    y = _integrate(y0, speed * np.sin(heading) * dt)
+    return x, y, theta
+
+
+def control_grid(steering_values, speed_values, steps):
+    """
+    Every combination of constant steering and speed as control sequences.
+
+    Args:
+        steering_values (array-like): Candidate steering angles (rad)
+        speed_values (array-like): Candidate speeds (m/s)
+        steps (int): Sequence length T
+
+    Returns:
+        tuple: (steering, speed), read-only arrays of shape `(N, T)` with
+        `N = len(steering_values) * len(speed_values)`, steering varying
+        slowest
+    """
+    steer, v = np.meshgrid(np.asarray(steering_values, dtype=np.float64),
+                           np.asarray(speed_values, dtype=np.float64), indexing="ij")
+    shape = (steer.size, steps)
+    return (np.broadcast_to(steer.reshape(-1, 1), shape),
+            np.broadcast_to(v.reshape(-1, 1), shape))
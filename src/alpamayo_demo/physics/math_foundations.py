@@ -0,0 +1,121 @@
+"""
+NumPy port of `src/math_foundations.jl`.
+
+The Julia functions are scalar; these take arrays of any broadcast-
+compatible shapes (agents, time steps, or both) and evaluate the same
+formulas in one pass, so physical-plausibility checks can run on every
+decision of a clip. Results are checked against the reference cases in
+`tests/fixtures/math_foundations/`; those are meant to be written by
+`julia scripts/generate_math_fixtures.jl`, but the committed set comes
+from a scalar Python transcription of that script, so parity with the
+Julia module itself awaits a regeneration with Julia.
+
+Functions:
+    - kinematic_bicycle_step: Re-exported from `physics.kinematics`
+    - pure_pursuit_steering: Steering angle towards a lookahead point
+    - pid_control: One PID update, threading integral and previous error
+    - pid_track: PID outputs along a whole time axis of measurements
+    - time_to_collision: 1D car-following time to collision
+"""
+
+import numpy as np
+
+# Re-exported so this module covers everything MathFoundations exports
+from alpamayo_demo.physics.kinematics import kinematic_bicycle_step  # noqa: F401
+
+
+def pure_pursuit_steering(rx, ry, current_x, current_y, current_theta, wheelbase):
+    """
+    Steering angle that drives the vehicle towards a lookahead point.
+
+    Args:
+        rx, ry: Target position (m)
+        current_x, current_y: Vehicle position (m)
+        current_theta: Vehicle heading (rad)
+        wheelbase: Axle distance (m)
+
+    Returns:
+        np.ndarray: Steering angle (rad); 0 where the target coincides
+        with the vehicle
+    """
+    dx = np.subtract(rx, current_x, dtype=np.float64)
+    dy = np.subtract(ry, current_y, dtype=np.float64)
+    alpha = np.arctan2(dy, dx) - current_theta
+    lookahead = np.sqrt(dx * dx + dy * dy)
+    ratio = np.divide(2 * wheelbase * np.sin(alpha), lookahead,
+                      out=np.zeros(np.broadcast(alpha, lookahead).shape), where=lookahead != 0.0)
+    return np.arctan(ratio)
+
+
+def pid_control(target, current, kp, ki, kd, integral_err, prev_err, dt):
+    """
+    One PID update for any number of controllers.
+
+    Args:
+        target, current: Setpoint and measurement
+        kp, ki, kd: Gains
+        integral_err: Accumulated error before this step
+        prev_err: Error of the previous step
+        dt (float): Time step (s)
+
+    Returns:
+        tuple: (output, new_integral_err, error), to be passed back as
+        `integral_err` and `prev_err` on the next step
+    """
+    error = np.subtract(target, current, dtype=np.float64)
+    new_integral_err = integral_err + error * dt
+    output = kp * error + ki * new_integral_err + kd * ((error - prev_err) / dt)
+    return output, new_integral_err, error
+
+
+def pid_track(targets, measurements, kp, ki, kd, dt, integral_err=0.0, prev_err=0.0):
+    """
+    PID outputs for a recorded sequence of measurements.
+
+    Equivalent to calling `pid_control` once per step along the last axis
+    and threading its state, but computed with a cumulative sum. Only
+    valid when the measurements do not depend on the outputs (replaying a
+    log); closed loops must step `pid_control`.
+
+    Args:
+        targets, measurements (array-like): Setpoints and measurements,
+            broadcastable, time along the last axis
+        kp, ki, kd: Gains
+        dt (float): Time step (s)
+        integral_err, prev_err: State before the first step, broadcastable
+            to the leading axes
+
+    Returns:
+        tuple: (outputs, final_integral_err, final_error)
+    """
+    error = np.subtract(targets, measurements, dtype=np.float64)
+    if error.ndim == 0:
+        raise ValueError("Measurements need a time axis")
+    steps = np.empty(error.shape[:-1] + (error.shape[-1] + 1,))
+    steps[..., 0] = integral_err
+    steps[..., 1:] = error * dt
+    integral = np.cumsum(steps, axis=-1, out=steps)[..., 1:]
+    previous = np.empty_like(error)
+    previous[..., 0] = prev_err
+    previous[..., 1:] = error[..., :-1]
+    outputs = kp * error + ki * integral + kd * ((error - previous) / dt)
+    return outputs, integral[..., -1], error[..., -1]
+
+
+def time_to_collision(v_ego, v_target, distance):
+    """
+    Time until the ego vehicle closes `distance` on the vehicle ahead.
+
+    Args:
+        v_ego: Ego speed (m/s)
+        v_target: Lead vehicle speed (m/s)
+        distance: Gap (m)
+
+    Returns:
+        np.ndarray: Seconds to collision; inf where the ego vehicle is not
+        closing in
+    """
+    relative_speed = np.subtract(v_ego, v_target, dtype=np.float64)
+    closing = relative_speed > 0
+    shape = np.broadcast(relative_speed, distance).shape
+    return np.divide(distance, relative_speed, out=np.full(shape, np.inf), where=closing)
@@ -0,0 +1,141 @@
+"""
+Time-to-collision safety gate over policy decisions.
+
+The policy names agents but does not reason about closing speeds, so it
+can answer `accelerate` with a stopped car a few meters ahead.
+`SafetyGate` runs after the policy: every agent in the ego path ("ahead"
+or "crossing") that reports a `distance` and a `speed` gets a TTC from
+`physics.math_foundations.time_to_collision`, and a decision to
+accelerate or maintain speed is overridden when the smallest TTC in its
+frame falls below the threshold.
+
+The agents of all decisions in a call (one frame or a whole clip) are
+flattened into CSR arrays like `core.columnar` does and checked in one
+vectorized pass; per decision this costs microseconds, small enough to
+sit inline after every policy call.
+
+Classes:
+    - SafetyGate: Overrides unsafe decisions in place
+"""
+
+import time
+from itertools import chain
+
+import numpy as np
+
+from alpamayo_demo.physics.math_foundations import time_to_collision
+
+# Overrides trigger below this many seconds to collision
+DEFAULT_MIN_TTC = 2.0
+
+# Decisions that keep or add speed, and so may be overridden
+GATED_ACTIONS = ("accelerate", "maintain_speed")
+
+# Agent positions in the ego path
+IN_PATH_POSITIONS = ("ahead", "crossing")
+
+
+class SafetyGate:
+    """
+    Override speed-keeping decisions when a collision is imminent.
+
+    Args:
+        min_ttc (float): TTC threshold in seconds
+        override (str): Action that replaces a gated decision
+        gated_actions (tuple): Actions that may be overridden
+
+    Attributes:
+        checked (int): Decisions checked
+        overridden (int): Decisions overridden
+        seconds (float): Wall time spent checking
+    """
+
+    def __init__(self, min_ttc=DEFAULT_MIN_TTC, override="brake", gated_actions=GATED_ACTIONS):
+        if min_ttc <= 0:
+            raise ValueError(f"min_ttc must be positive: {min_ttc}")
+        self.min_ttc = min_ttc
+        self.override = override
+        self.gated_actions = frozenset(gated_actions)
+        self.checked = 0
+        self.overridden = 0
+        self.seconds = 0.0
+
+    @property
+    def us_per_decision(self):
+        """Average checking time per decision in microseconds."""
+        return 1e6 * self.seconds / self.checked if self.checked else 0.0
+
+    def time_to_collision(self, decisions, ego_speed):
+        """
+        Smallest TTC over the in-path agents of each decision.
+
+        Args:
+            decisions (list): Decision dicts
+            ego_speed (float | array-like): Ego speed in m/s, one value or
+                one per decision
+
+        Returns:
+            np.ndarray: Seconds per decision; inf where no in-path agent
+            with known kinematics is being closed in on
+        """
+        n = len(decisions)
+        agents = [decision.get("agents") or () for decision in decisions]
+        counts = np.fromiter(map(len, agents), dtype=np.int64, count=n)
+        flat = list(chain.from_iterable(agents))
+        m = len(flat)
+        min_ttc = np.full(n, np.inf)
+        if not m:
+            return min_ttc
+        distance = np.fromiter((agent.get("distance", np.nan) for agent in flat), dtype=np.float64, count=m)
+        speed = np.fromiter((agent.get("speed", np.nan) for agent in flat), dtype=np.float64, count=m)
+        in_path = np.fromiter((agent.get("position") in IN_PATH_POSITIONS for agent in flat),
+                              dtype=bool, count=m)
+        rows = np.repeat(np.arange(n), counts)
+        ego = np.broadcast_to(np.asarray(ego_speed, dtype=np.float64), (n,))[rows]
+        ttc = time_to_collision(ego, speed, distance)
+        # Agents off the path or without kinematics never trigger
+        ttc[~(in_path & np.isfinite(distance) & np.isfinite(speed))] = np.inf
+        np.minimum.at(min_ttc, rows, ttc)
+        return min_ttc
+
+    def apply(self, decisions, ego_speed):
+        """
+        Check decisions and override unsafe ones in place.
+
+        An overridden decision gets the `override` action, a reason naming
+        the TTC, and a `safety_override` entry recording the policy's
+        original action and reason, and the TTC.
+
+        Args:
+            decisions (list): Decision dicts
+            ego_speed (float | array-like): Ego speed in m/s, one value or
+                one per decision
+
+        Returns:
+            np.ndarray: Boolean mask of overridden decisions
+        """
+        start = time.perf_counter()
+        min_ttc = self.time_to_collision(decisions, ego_speed)
+        gated = np.fromiter((decision.get("decision") in self.gated_actions for decision in decisions),
+                            dtype=bool, count=len(decisions))
+        unsafe = gated & (min_ttc < self.min_ttc)
+        for i in np.flatnonzero(unsafe):
+            decision, ttc = decisions[i], float(min_ttc[i])
+            decision["safety_override"] = {"from": decision["decision"], "reason": decision.get("reason"),
+                                           "ttc": round(ttc, 2)}
+            decision["decision"] = self.override
+            decision["reason"] = f"Safety override: {ttc:.1f}s to collision with an agent in path"
+        self.checked += len(decisions)
+        self.overridden += int(unsafe.sum())
+        self.seconds += time.perf_counter() - start
+        return unsafe
+
+    def check(self, decision, ego_speed):
+        """
+        Check one decision, overriding it in place if unsafe.
+
+        Returns:
+            dict: The same decision
+        """
+        self.apply([decision], ego_speed)
+        return decision
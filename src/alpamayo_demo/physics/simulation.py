@@ -0,0 +1,245 @@
+"""
+Closed-loop simulation of policy decisions.
+
+Replays decision logs through the vehicle models: every decision sets a
+speed target for a `PIDControllerBank`, pure pursuit steers towards a
+lookahead point on a reference path, and the kinematic bicycle model
+integrates the result. All clips are simulated together with state
+vectors of length N (one entry per clip), so a tick costs a few array
+operations whatever the number of clips, and thousands of clips run in
+seconds. Comparing the metrics of two runs over the same clips flags
+policy changes that alter how the car would actually drive.
+
+Functions:
+    - straight_path: Reference path along the x axis
+    - load_decision_log: Actions and decision interval of one JSON Lines log
+    - simulate_clips: Closed-loop simulation of many decision logs
+
+Classes:
+    - SimulationResult: Per-clip trajectories and driving metrics
+"""
+
+import json
+import math
+
+import numpy as np
+
+from alpamayo_demo.physics.control import ACTION_SPEEDS, PIDControllerBank, encode_actions
+from alpamayo_demo.physics.kinematics import DT, WHEELBASE, kinematic_bicycle_step
+from alpamayo_demo.physics.math_foundations import pure_pursuit_steering
+
+# Steering limit in radians
+MAX_STEER = 0.5
+
+# Pure pursuit lookahead: MIN_LOOKAHEAD + LOOKAHEAD_GAIN * speed (m)
+MIN_LOOKAHEAD = 4.0
+LOOKAHEAD_GAIN = 0.5
+
+# Spacing of the resampled reference path (m)
+PATH_SPACING = 0.5
+
+# Metrics reported per clip by `SimulationResult.metrics`
+METRICS = ("distance", "mean_speed", "max_decel", "stopped_seconds", "max_cross_track")
+
+
+def straight_path(length=1000.0):
+    """Reference path from the origin along the x axis, as (P, 2) waypoints."""
+    return np.array([[0.0, 0.0], [length, 0.0]])
+
+
+def load_decision_log(path):
+    """
+    Read one JSON Lines decision log (as written by `batch.py`).
+
+    Args:
+        path (str): Log file
+
+    Returns:
+        tuple: (actions, interval) where `actions` lists the `decision`
+        field of every line and `interval` is the median spacing of the
+        `timestamp` fields in seconds (None with fewer than two)
+    """
+    actions, timestamps = [], []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                decision = json.loads(line)
+                actions.append(decision.get("decision"))
+                if "timestamp" in decision:
+                    timestamps.append(decision["timestamp"])
+    interval = float(np.median(np.diff(timestamps))) if len(timestamps) > 1 else None
+    return actions, interval
+
+
+def _resample(path, spacing, extend):
+    """Waypoints at uniform `spacing`, with a straight run of `extend` m added at the end."""
+    path = np.asarray(path, dtype=np.float64)
+    if path.ndim != 2 or path.shape[1] != 2 or len(path) < 2:
+        raise ValueError(f"Path must be (P >= 2, 2) waypoints: {path.shape}")
+    direction = path[-1] - path[-2]
+    norm = math.hypot(*direction)
+    if norm == 0:
+        raise ValueError("Path ends with a repeated waypoint")
+    path = np.vstack([path, path[-1] + direction / norm * extend])
+    arc = np.concatenate([[0.0], np.cumsum(np.hypot(*np.diff(path, axis=0).T))])
+    samples = np.arange(0.0, arc[-1], spacing)
+    return np.column_stack([np.interp(samples, arc, path[:, 0]), np.interp(samples, arc, path[:, 1])])
+
+
+def _tangents(waypoints):
+    """Unit direction of the path at every waypoint."""
+    step = np.diff(waypoints, axis=0)
+    step = np.vstack([step, step[-1:]])
+    return step / np.hypot(step[:, 0], step[:, 1])[:, None]
+
+
+def _track(waypoints, tangents, progress, window, px, py):
+    """
+    Advance each vehicle's path index and measure its cross-track error.
+
+    The nearest waypoint is searched in a short window from the last
+    index (vehicles only move forward along the path); the error is the
+    perpendicular distance to the path at that waypoint.
+
+    Returns:
+        tuple: (progress, cross_track)
+    """
+    candidates = np.minimum(progress[:, None] + window, len(waypoints) - 1)
+    d2 = (waypoints[candidates, 0] - px[:, None]) ** 2 + (waypoints[candidates, 1] - py[:, None]) ** 2
+    progress = candidates[np.arange(len(progress)), d2.argmin(axis=1)]
+    ox, oy = px - waypoints[progress, 0], py - waypoints[progress, 1]
+    return progress, np.abs(ox * tangents[progress, 1] - oy * tangents[progress, 0])
+
+
+class SimulationResult:
+    """
+    Trajectories of a batch of simulated clips.
+
+    Arrays have one row per clip and one column per tick plus the initial
+    state; entries after a clip's last tick repeat its final state.
+
+    Attributes:
+        x, y, theta, speed (np.ndarray): State, shape (N, ticks + 1)
+        steering, accel (np.ndarray): Commands, shape (N, ticks)
+        cross_track (np.ndarray): Distance to the path, shape (N, ticks + 1)
+        ticks (np.ndarray): Simulated ticks per clip
+        dt (float): Tick length in seconds
+        steps_per_decision (int): Ticks each decision is held for
+    """
+
+    def __init__(self, x, y, theta, speed, steering, accel, cross_track, ticks, dt, steps_per_decision):
+        self.x, self.y, self.theta, self.speed = x, y, theta, speed
+        self.steering, self.accel = steering, accel
+        self.cross_track = cross_track
+        self.ticks = ticks
+        self.dt = dt
+        self.steps_per_decision = steps_per_decision
+
+    def __len__(self):
+        return len(self.ticks)
+
+    def metrics(self):
+        """
+        Driving metrics per clip.
+
+        Returns:
+            dict: Metric name (see `METRICS`) -> array of shape (N,)
+        """
+        active = np.arange(self.accel.shape[1]) < self.ticks[:, None]
+        moving = self.speed[:, :-1] * active
+        duration = np.maximum(self.ticks, 1) * self.dt
+        return {
+            "distance": moving.sum(axis=1) * self.dt,
+            "mean_speed": moving.sum(axis=1) * self.dt / duration,
+            "max_decel": np.maximum(-np.where(active, self.accel, 0.0).min(axis=1, initial=0.0), 0.0),
+            "stopped_seconds": ((self.speed[:, :-1] < 0.1) & active).sum(axis=1) * self.dt,
+            "max_cross_track": self.cross_track.max(axis=1),
+        }
+
+
+def simulate_clips(logs, decision_interval=1.0, path=None, initial_speed=0.0, dt=DT,
+                   wheelbase=WHEELBASE, max_steer=MAX_STEER, bank=None):
+    """
+    Simulate many decision logs in closed loop.
+
+    Each clip starts at the beginning of the reference path, heading along
+    it. A decision is applied every `decision_interval` seconds; between
+    decisions the controllers track the last targets.
+
+    Args:
+        logs (list): One sequence of decisions per clip (action strings or
+            `encode_actions` codes); clips may differ in length
+        decision_interval (float): Seconds between decisions, e.g. 1 / fps
+        path (array-like, optional): Reference waypoints (P, 2) shared by
+            all clips; defaults to `straight_path()`
+        initial_speed (float | array-like): Starting speed per clip (m/s)
+        dt (float): Tick length (s)
+        wheelbase (float): Axle distance (m)
+        max_steer (float): Steering limit (rad)
+        bank (PIDControllerBank, optional): Speed controllers (gains,
+            limits); must have one vehicle per clip and the same `dt`
+
+    Returns:
+        SimulationResult: Trajectories and metrics of every clip
+    """
+    n = len(logs)
+    if n == 0:
+        raise ValueError("No decision logs to simulate")
+    steps = max(1, round(decision_interval / dt))
+    lengths = np.fromiter(map(len, logs), dtype=np.int64, count=n)
+    width = max(int(lengths.max()), 1)
+    # Pad short clips with "unknown" (hold); their state is frozen anyway
+    codes = np.full((n, width), -1, dtype=np.int8)
+    for i, log in enumerate(logs):
+        if len(log):
+            log = np.asarray(log)
+            codes[i, :len(log)] = log if log.dtype.kind == "i" else encode_actions(log)
+    bank = bank if bank is not None else PIDControllerBank(n, dt=dt)
+    if bank.n != n or bank.dt != dt:
+        raise ValueError(f"Bank needs {n} vehicles and dt={dt}: has {bank.n} and dt={bank.dt}")
+
+    ticks = width * steps
+    clip_ticks = lengths * steps
+    top_speed = max(v for v in ACTION_SPEEDS.values() if v is not None) * 1.5
+    waypoints = _resample(straight_path() if path is None else path, PATH_SPACING, ticks * dt * top_speed)
+    tangents = _tangents(waypoints)
+    last = len(waypoints) - 1
+    window = np.arange(int(math.ceil(top_speed * dt / PATH_SPACING)) + 4)
+
+    x = np.empty((n, ticks + 1))
+    y = np.empty((n, ticks + 1))
+    theta = np.empty((n, ticks + 1))
+    speed = np.empty((n, ticks + 1))
+    steering = np.zeros((n, ticks))
+    accel = np.zeros((n, ticks))
+    cross_track = np.zeros((n, ticks + 1))
+    heading = waypoints[1] - waypoints[0]
+    x[:, 0], y[:, 0] = waypoints[0]
+    theta[:, 0] = math.atan2(heading[1], heading[0])
+    speed[:, 0] = initial_speed
+    progress = np.zeros(n, dtype=np.int64)
+
+    for t in range(ticks):
+        px, py, ptheta, v = x[:, t], y[:, t], theta[:, t], speed[:, t]
+        active = t < clip_ticks
+        if t % steps == 0:
+            bank.set_actions(codes[:, t // steps], v, mask=active)
+        a = bank.step(v)
+
+        progress, cross_track[:, t] = _track(waypoints, tangents, progress, window, px, py)
+        ahead = np.minimum(progress + np.ceil((MIN_LOOKAHEAD + LOOKAHEAD_GAIN * v) / PATH_SPACING).astype(np.int64),
+                           last)
+        delta = np.clip(pure_pursuit_steering(waypoints[ahead, 0], waypoints[ahead, 1], px, py, ptheta, wheelbase),
+                        -max_steer, max_steer)
+        nx, ny, ntheta = kinematic_bicycle_step(px, py, ptheta, v, delta, wheelbase, dt)
+        nv = np.maximum(v + a * dt, 0.0)
+
+        x[:, t + 1] = np.where(active, nx, px)
+        y[:, t + 1] = np.where(active, ny, py)
+        theta[:, t + 1] = np.where(active, ntheta, ptheta)
+        speed[:, t + 1] = np.where(active, nv, v)
+        steering[:, t] = np.where(active, delta, 0.0)
+        accel[:, t] = np.where(active, a, 0.0)
+
+    _, cross_track[:, -1] = _track(waypoints, tangents, progress, window, x[:, -1], y[:, -1])
+    return SimulationResult(x, y, theta, speed, steering, accel, cross_track, clip_ticks, dt, steps)
@@ -0,0 +1,148 @@
+"""
+Adaptive frame sampling driven by decision volatility.
+
+A fixed sampling rate spends as much inference on a car idling at a red
+light as on an intersection with pedestrians crossing. `AdaptiveSampler`
+picks the next frame from the last decision instead: it drops to a low
+rate once decisions have been stable and confident for a while, and jumps
+to a high rate as soon as the decision changes, confidence drops, or
+hazards or vulnerable road users appear.
+
+With a per-clip budget the two rates become relative: every step is the
+fair share of the remaining frames over the remaining budget, shortened
+while the scene is volatile and lengthened while it is calm, so the clip
+never takes more than `budget` decisions.
+
+Classes:
+    - AdaptiveSampler: Chooses the next frame to decide from the last decision
+"""
+
+import math
+
+# Agent types that always warrant a closer look
+VULNERABLE_AGENTS = ("pedestrian", "cyclist")
+
+# Sampler states
+CALM, NEUTRAL, VOLATILE = "calm", "neutral", "volatile"
+
+
+class AdaptiveSampler:
+    """
+    Choose sampling steps from decision volatility.
+
+    Args:
+        low_fps (float): Rate while the scene is calm
+        high_fps (float): Rate while the scene is volatile
+        min_confidence (float): Confidence below which a decision counts
+            as volatile
+        calm_after (int): Consecutive quiet decisions before dropping to
+            the low rate
+        budget (int, optional): Maximum decisions per clip; needs a known
+            frame count
+
+    Attributes:
+        state (str): "calm", "neutral" or "volatile"
+        decisions (int): Decisions observed
+        volatile_decisions (int): Decisions that triggered the high rate
+    """
+
+    def __init__(self, low_fps=0.5, high_fps=5.0, min_confidence=0.8, calm_after=3, budget=None):
+        if not 0 < low_fps <= high_fps:
+            raise ValueError(f"Need 0 < low_fps <= high_fps: {low_fps}, {high_fps}")
+        if budget is not None and budget < 1:
+            raise ValueError(f"budget must be at least 1: {budget}")
+        self.low_fps = low_fps
+        self.high_fps = high_fps
+        self.min_confidence = min_confidence
+        self.calm_after = calm_after
+        self.budget = budget
+        self.state = NEUTRAL
+        self.decisions = 0
+        self.volatile_decisions = 0
+        self._previous = None
+        self._quiet = 0
+
+    def is_volatile(self, decision):
+        """True if `decision` calls for the high sampling rate."""
+        previous = self._previous
+        return (
+            (previous is not None and decision.get("decision") != previous.get("decision"))
+            or decision.get("confidence", 0.0) < self.min_confidence
+            or bool(decision.get("hazards"))
+            or any(agent.get("type") in VULNERABLE_AGENTS for agent in decision.get("agents", ()))
+        )
+
+    def observe(self, decision):
+        """
+        Update the sampler state with the latest decision.
+
+        Args:
+            decision (dict): Decision for the most recently sampled frame
+        """
+        if self.is_volatile(decision):
+            self.state = VOLATILE
+            self.volatile_decisions += 1
+            self._quiet = 0
+        else:
+            self._quiet += 1
+            if self._quiet >= self.calm_after:
+                self.state = CALM
+            elif self.state == VOLATILE:
+                self.state = NEUTRAL
+        self._previous = decision
+        self.decisions += 1
+
+    def next_step(self, fps, remaining_frames=None):
+        """
+        Number of source frames to advance to the next sample.
+
+        Args:
+            fps (float): Source frame rate
+            remaining_frames (int, optional): Frames after the current one;
+                required in budget mode
+
+        Returns:
+            int: Step of at least 1, or 0 when the budget is spent
+        """
+        if self.budget is None:
+            rate = {CALM: self.low_fps, VOLATILE: self.high_fps}.get(
+                self.state, math.sqrt(self.low_fps * self.high_fps))
+            return max(1, round(fps / rate))
+
+        if remaining_frames is None:
+            raise ValueError("Budget mode needs the remaining frame count")
+        left = self.budget - self.decisions
+        if left <= 0:
+            return 0
+        fair = remaining_frames / left
+        spread = math.sqrt(self.high_fps / self.low_fps)
+        factor = {CALM: spread, VOLATILE: 1 / spread}.get(self.state, 1.0)
+        return max(1, round(fair * factor))
+
+    def iter_decisions(self, stream, decide):
+        """
+        Walk a clip, letting each decision pick the next frame.
+
+        Args:
+            stream (VideoFrameStream): Source clip, read with `read_at`
+            decide (callable): frame -> decision dict
+
+        Yields:
+            tuple: (frame_index, timestamp_seconds, frame, decision)
+        """
+        total = stream.total_frames
+        if self.budget is not None and total <= 0:
+            raise ValueError("Budget mode needs a video with a known frame count")
+        fps = stream.fps
+        index = 0
+        while total <= 0 or index < total:
+            ok, frame = stream.read_at(index)
+            if not ok:
+                break
+            decision = decide(frame)
+            self.observe(decision)
+            yield index, index / fps, frame, decision
+            step = self.next_step(fps, total - index - 1 if total > 0 else None)
+            if step == 0:
+                break
+            index += step
@@ -0,0 +1,223 @@
+"""
+Multi-clip batch runner.
+
+Spreads many clips across a process pool with one `AlpamayoPolicy` per
+worker, writes one JSON Lines decision log per clip, and reports
+throughput and per-stage timing.
+
+Functions:
+    - discover_clips: Collect clip paths from a directory or manifest file
+    - process_clip: Run the decision pipeline on one clip (worker side)
+    - run_batch: Process many clips on a process pool
+
+Classes:
+    - BatchReport: Aggregate results of a batch run
+"""
+
+import json
+import multiprocessing
+import os
+import time
+
+from alpamayo_demo.core.policy import AlpamayoPolicy, DEFAULT_GOAL_PROMPT
+from alpamayo_demo.utils.data_loader import TFRECORD_EXTENSIONS, open_frame_stream
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv") + TFRECORD_EXTENSIONS
+
+# Per-stage wall time recorded for every clip
+STAGES = ("decode", "decide", "write")
+
+# The policy owned by this worker process (set by _init_worker)
+_worker_policy = None
+
+
+def discover_clips(source):
+    """
+    Collect clip paths from a directory or a manifest file.
+
+    A directory is scanned (non-recursively) for video files. A manifest is
+    a text file with one clip path per line; blank lines and lines starting
+    with `#` are ignored, and relative paths are resolved against the
+    manifest's directory.
+
+    Args:
+        source (str): Directory or manifest path
+
+    Returns:
+        list: Sorted clip paths (directory) or manifest order
+    """
+    if os.path.isdir(source):
+        return sorted(
+            os.path.join(source, name) for name in os.listdir(source)
+            if name.lower().endswith(VIDEO_EXTENSIONS)
+        )
+    if not os.path.isfile(source):
+        raise ValueError(f"Clip source not found: {source}")
+
+    base = os.path.dirname(os.path.abspath(source))
+    clips = []
+    with open(source) as manifest:
+        for line in manifest:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                clips.append(line if os.path.isabs(line) else os.path.join(base, line))
+    return clips
+
+
+def _log_names(clips):
+    """Unique `<stem>.jsonl` log names, suffixed `_1`, `_2`, ... when names collide."""
+    names, used = [], set()
+    for clip in clips:
+        stem = os.path.splitext(os.path.basename(clip))[0]
+        name, count = f"{stem}.jsonl", 0
+        # A suffixed name may itself be another clip's stem (a.avi -> a_1
+        # vs a_1.mp4), so keep counting until the name is free
+        while name in used:
+            count += 1
+            name = f"{stem}_{count}.jsonl"
+        used.add(name)
+        names.append(name)
+    return names
+
+
+def _init_worker(mock, max_batch_size):
+    global _worker_policy
+    _worker_policy = AlpamayoPolicy(mock=mock, max_batch_size=max_batch_size)
+
+
+def process_clip(video_path, log_path, sample_fps=1, sampling="grab", prompt=DEFAULT_GOAL_PROMPT):
+    """
+    Decide every sampled frame of one clip and write its decision log.
+
+    Runs in a worker process using the policy created by the pool
+    initializer. Failures are reported in the result instead of raised,
+    so one bad clip does not stop the batch.
+
+    Args:
+        video_path (str): Clip to process
+        log_path (str): Destination JSON Lines file, one decision per line
+        sample_fps (int): Frames per second to sample
+        sampling (str): Frame skipping strategy (see `SAMPLING_MODES`)
+        prompt (str): Goal prompt for the policy
+
+    Returns:
+        dict: video_path, log_path, frames, error and per-stage seconds
+    """
+    policy = _worker_policy
+    timings = dict.fromkeys(STAGES, 0.0)
+    result = {"video_path": video_path, "log_path": log_path, "frames": 0, "error": None,
+              "timings": timings}
+    try:
+        stream = open_frame_stream(video_path, sample_fps=sample_fps, mode=sampling)
+        with open(log_path, "w") as log:
+            frames = iter(stream)
+            while True:
+                start = time.perf_counter()
+                batch = [item for _, item in zip(range(policy.max_batch_size), frames)]
+                timings["decode"] += time.perf_counter() - start
+                if not batch:
+                    break
+
+                start = time.perf_counter()
+                decisions = policy.decide_batch([frame for _, _, frame in batch], prompt, output="dict")
+                timings["decide"] += time.perf_counter() - start
+
+                start = time.perf_counter()
+                for (frame_index, timestamp, _), decision in zip(batch, decisions):
+                    decision["frame_id"] = result["frames"]
+                    decision["source_frame"] = frame_index
+                    decision["timestamp"] = round(timestamp, 3)
+                    log.write(json.dumps(decision, separators=(",", ":")) + "\n")
+                    result["frames"] += 1
+                timings["write"] += time.perf_counter() - start
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def _process_clip_args(args):
+    return process_clip(*args)
+
+
+class BatchReport:
+    """
+    Aggregate results of a batch run.
+
+    Attributes:
+        results (list): Per-clip result dicts from `process_clip`
+        elapsed (float): Wall time of the whole run in seconds
+        workers (int): Number of worker processes used
+    """
+
+    def __init__(self, results, elapsed, workers):
+        self.results = results
+        self.elapsed = elapsed
+        self.workers = workers
+
+    @property
+    def clips_per_second(self):
+        return len(self.results) / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def failed(self):
+        """Results of clips that raised an error."""
+        return [r for r in self.results if r["error"]]
+
+    @property
+    def frames(self):
+        return sum(r["frames"] for r in self.results)
+
+    def stage_totals(self):
+        """Summed seconds per stage across all workers."""
+        return {stage: sum(r["timings"][stage] for r in self.results) for stage in STAGES}
+
+    def summary(self):
+        """Multi-line, human-readable report."""
+        totals = self.stage_totals()
+        busy = sum(totals.values()) or 1.0
+        lines = [
+            f"Processed {len(self.results)} clips ({self.frames} frames, {len(self.failed)} failed) "
+            f"in {self.elapsed:.2f}s on {self.workers} workers",
+            f"Throughput: {self.clips_per_second:.2f} clips/s, {self.frames / max(self.elapsed, 1e-9):.1f} frames/s",
+        ]
+        for stage in STAGES:
+            lines.append(f"  {stage:<7} {totals[stage]:8.2f}s  ({100 * totals[stage] / busy:4.1f}% of worker time)")
+        for r in self.failed:
+            lines.append(f"  FAILED {r['video_path']}: {r['error']}")
+        return "\n".join(lines)
+
+
+def run_batch(clips, output_dir, workers=None, sample_fps=1, sampling="grab", mock=True,
+              max_batch_size=1, prompt=DEFAULT_GOAL_PROMPT):
+    """
+    Process clips in parallel, one decision log per clip.
+
+    Args:
+        clips (list): Clip paths, e.g. from `discover_clips`
+        output_dir (str): Directory for the `<clip>.jsonl` decision logs
+        workers (int, optional): Worker processes (default: CPU count)
+        sample_fps (int): Frames per second to sample
+        sampling (str): Frame skipping strategy (see `SAMPLING_MODES`)
+        mock (bool): Use the mock policy
+        max_batch_size (int): Frames per policy call within a clip
+        prompt (str): Goal prompt for the policy
+
+    Returns:
+        BatchReport: Per-clip results, throughput and stage timings
+    """
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(output_dir, exist_ok=True)
+    tasks = [
+        (clip, os.path.join(output_dir, name), sample_fps, sampling, prompt)
+        for clip, name in zip(clips, _log_names(clips))
+    ]
+
+    start = time.perf_counter()
+    if workers == 1:
+        _init_worker(mock, max_batch_size)
+        results = [_process_clip_args(task) for task in tasks]
+    else:
+        with multiprocessing.Pool(workers, initializer=_init_worker,
+                                  initargs=(mock, max_batch_size)) as pool:
+            results = list(pool.imap(_process_clip_args, tasks))
+    return BatchReport(results, time.perf_counter() - start, workers)
@@ -0,0 +1,63 @@
+"""
+Clip analysis for the Streamlit app's background worker.
+
+Lives outside `app.py` so it can run (and be tested) without Streamlit:
+the worker thread has no script context anyway.
+
+Functions:
+    - analyze_clip: Decode and decide a clip into playback entries
+"""
+
+from alpamayo_demo.utils.clip_cache import THUMBNAIL_WIDTH, encode_thumbnail
+from alpamayo_demo.utils.pipeline import prefetch
+
+
+def analyze_clip(stream, policy, goal_prompt, sampler=None, prefetch_depth=4, thumbnail_width=THUMBNAIL_WIDTH):
+    """
+    Decode and decide a clip; meant to be drained by a `BackgroundWorker`.
+
+    Yields playback entries holding a JPEG thumbnail rather than the frame:
+    the decoder's ring buffers are reused, a thumbnail is a small fraction
+    of the raw frame in memory, and `st.image` sends it to the browser
+    as-is. Failed decisions become `{"error": message}` entries.
+
+    Closing the generator (as `BackgroundWorker.stop` does) stops the
+    prefetch thread and releases the stream.
+
+    Args:
+        stream: Frame stream from `open_frame_stream`
+        policy (AlpamayoPolicy): Policy deciding each frame
+        goal_prompt (str): Language prompt
+        sampler (AdaptiveSampler, optional): Let each decision pick the
+            next frame instead of prefetching every sampled frame
+        prefetch_depth (int): Frames decoded ahead of the policy
+        thumbnail_width (int): Maximum thumbnail width in pixels
+
+    Yields:
+        dict: {"frame_count", "thumbnail", "decision"} per analysed frame
+    """
+    def decide(frame):
+        try:
+            return policy.decide(frame, goal_prompt, output="dict")
+        except Exception as e:
+            return {"error": str(e)}
+
+    frames = None
+    try:
+        if sampler is not None:
+            # Each decision picks the next frame, so frames are read on demand
+            decided = ((i, frame, decision) for i, _, frame, decision in sampler.iter_decisions(stream, decide))
+        else:
+            frames = prefetch(stream, maxsize=prefetch_depth)
+            decided = ((i, frame, decide(frame)) for i, _, frame in frames)
+
+        for analyzed_count, (frame_count, frame, decision) in enumerate(decided, start=1):
+            if "error" not in decision:
+                decision['frame_id'] = analyzed_count
+            yield {"frame_count": frame_count, "thumbnail": encode_thumbnail(frame, thumbnail_width),
+                   "decision": decision}
+    finally:
+        # Stop the decode thread before releasing the capture it reads
+        if frames is not None:
+            frames.close()
+        stream.close()
@@ -0,0 +1,130 @@
+"""
+Per-clip analysis caching helpers for the Streamlit app.
+
+A finished analysis is stored under the clip's content hash plus the
+settings that shaped it (sampling, policy version), so revisiting a clip
+replays instantly instead of re-decoding and re-deciding it. Frames are
+kept as downscaled JPEG thumbnails: a few tens of KB each instead of a
+full-resolution RGB array, and what the browser receives anyway.
+
+Functions:
+    - file_digest: Content hash of a file, read in chunks
+    - clip_key: Cache key for one analysis of one clip
+    - encode_thumbnail: Downscale a BGR frame and JPEG-encode it
+    - decode_thumbnail: Decode a thumbnail back into a BGR frame
+
+Classes:
+    - ClipResultStore: Small LRU store of finished analyses
+"""
+
+import collections
+import hashlib
+import threading
+
+import cv2
+import numpy as np
+
+# Thumbnail geometry and quality used for playback
+THUMBNAIL_WIDTH = 640
+THUMBNAIL_QUALITY = 80
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """
+    Hash a file's contents without loading it into memory.
+
+    Args:
+        path (str): File to hash
+        chunk_size (int): Bytes read per chunk
+
+    Returns:
+        str: Hex BLAKE2b digest (32 characters)
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def clip_key(digest, policy_version, **settings):
+    """
+    Build the cache key for one analysis of one clip.
+
+    Args:
+        digest (str): Clip content hash from `file_digest`
+        policy_version (str): `AlpamayoPolicy.version`
+        **settings: Anything else that changes the result, e.g. sampling
+            fps or adaptive sampler parameters
+
+    Returns:
+        tuple: Hashable key
+    """
+    return (digest, policy_version) + tuple(sorted(settings.items()))
+
+
+def encode_thumbnail(frame, max_width=THUMBNAIL_WIDTH, quality=THUMBNAIL_QUALITY):
+    """
+    Downscale a BGR frame to at most `max_width` and JPEG-encode it.
+
+    Args:
+        frame (np.ndarray): BGR frame
+        max_width (int): Maximum thumbnail width in pixels
+        quality (int): JPEG quality (0-100)
+
+    Returns:
+        bytes: JPEG data, displayable directly by `st.image`
+    """
+    scale = max_width / frame.shape[1]
+    if scale < 1.0:
+        frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError("Could not JPEG-encode frame")
+    return buf.tobytes()
+
+
+def decode_thumbnail(data):
+    """Decode JPEG bytes from `encode_thumbnail` into a BGR frame."""
+    return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+
+class ClipResultStore:
+    """
+    Thread-safe LRU store of finished clip analyses.
+
+    Args:
+        max_clips (int): Analyses kept before the least recently used one
+            is dropped
+    """
+
+    def __init__(self, max_clips=8):
+        if max_clips < 1:
+            raise ValueError(f"max_clips must be at least 1: {max_clips}")
+        self.max_clips = max_clips
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the analysis stored under `key` (marking it used), or None."""
+        with self._lock:
+            analysis = self._entries.get(key)
+            if analysis is not None:
+                self._entries.move_to_end(key)
+            return analysis
+
+    def put(self, key, analysis):
+        """Store a finished analysis, evicting the oldest if full."""
+        with self._lock:
+            self._entries[key] = analysis
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_clips:
+                self._entries.popitem(last=False)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
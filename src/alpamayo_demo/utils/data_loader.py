@@ -1,50 +1,321 @@
 """
 Data loader for Waymo Open Dataset video clips.
 
-For this demo, assumes a video file (MP4) extracted from Waymo data.
-In a full implementation, this would load from TFRecords.
+Loads video files (MP4) extracted from Waymo data; Waymo TFRecord
+segments are read natively by `alpamayo_demo.utils.waymo_tfrecord`, and
+`open_frame_stream` picks the right reader for a path.
 
 Functions:
     - load_video_frames: Load and sample frames from video
+    - iter_video_frames: Lazily stream sampled frames from video
+    - open_frame_stream: Open a video file or Waymo TFRecord segment
+
+Classes:
+    - FrameRing: Fixed pool of reusable frame buffers
+    - SamplingStats: Decode counters and timings for a stream
+    - VideoFrameStream: Single-pass iterator over sampled frames
 """
 
+import time
+
 import cv2
 import numpy as np
 
-def load_video_frames(video_path, sample_fps=1):
+# Used when the container does not report a frame rate
+DEFAULT_FPS = 30.0
+
+# Extensions treated as Waymo TFRecord segments by `open_frame_stream`
+TFRECORD_EXTENSIONS = (".tfrecord",)
+
+# How non-sampled frames are skipped:
+#   read - decode and convert every frame, discard the unsampled ones
+#   grab - advance with cap.grab(); only sampled frames are retrieved
+#   seek - jump straight to each sampled frame via CAP_PROP_POS_FRAMES
+SAMPLING_MODES = ("read", "grab", "seek")
+
+
+class FrameRing:
+    """
+    Fixed pool of preallocated frame buffers handed out round-robin.
+
+    Decoding into a ring keeps memory constant regardless of clip length:
+    a buffer is only overwritten after `size` further buffers have been
+    handed out, so consumers may hold on to at most `size - 1` frames.
+    """
+
+    def __init__(self, size):
+        if size < 1:
+            raise ValueError(f"Ring size must be at least 1: {size}")
+        self.size = size
+        self._buffers = [None] * size
+        self._next = 0
+
+    def next_buffer(self, shape, dtype=np.uint8):
+        """
+        Return the next buffer in the ring, (re)allocating it if needed.
+
+        Args:
+            shape (tuple): Required buffer shape
+            dtype: Required buffer dtype
+
+        Returns:
+            numpy array: Buffer of the requested shape, contents undefined
+        """
+        buf = self._buffers[self._next]
+        if buf is None or buf.shape != tuple(shape) or buf.dtype != dtype:
+            buf = np.empty(shape, dtype=dtype)
+            self._buffers[self._next] = buf
+        self._next = (self._next + 1) % self.size
+        return buf
+
+
+class SamplingStats:
+    """
+    Counters collected while a `VideoFrameStream` is consumed.
+
+    Attributes:
+        sampled (int): Frames retrieved and yielded
+        skipped (int): Frames stepped over without being yielded
+        capture_seconds (float): Wall time spent inside OpenCV capture calls
+    """
+
+    def __init__(self):
+        self.sampled = 0
+        self.skipped = 0
+        self.capture_seconds = 0.0
+
+    @property
+    def ms_per_sample(self):
+        """Average capture time per yielded frame in milliseconds."""
+        return 1000.0 * self.capture_seconds / self.sampled if self.sampled else 0.0
+
+    def __repr__(self):
+        return (f"SamplingStats(sampled={self.sampled}, skipped={self.skipped}, "
+                f"capture_seconds={self.capture_seconds:.3f})")
+
+
+class VideoFrameStream:
+    """
+    Single-pass iterator over frames sampled from a video file.
+
+    Yields `(frame_index, timestamp, frame)` tuples where `frame_index` is
+    the index in the source video and `timestamp` is in seconds. Only the
+    frame currently being decoded is held by the stream itself.
+
+    Args:
+        video_path (str): Path to video file
+        sample_fps (int): Frames per second to sample
+        buffer_size (int, optional): If set, frames are decoded into a
+            `FrameRing` of this many buffers instead of freshly allocated
+            arrays. Each yielded frame is then only valid until
+            `buffer_size` further frames have been yielded.
+        mode (str): How non-sampled frames are skipped, one of
+            `SAMPLING_MODES`. "grab" never retrieves (colour-converts and
+            copies) skipped frames; "seek" jumps between sampled frames and
+            pays off for sparse sampling of long clips.
+    """
+
+    def __init__(self, video_path, sample_fps=1, buffer_size=None, mode="grab"):
+        if mode not in SAMPLING_MODES:
+            raise ValueError(f"Invalid sampling mode: {mode}")
+        self.video_path = video_path
+        self.mode = mode
+        self.stats = SamplingStats()
+        self.cap = cv2.VideoCapture(video_path)
+        if not self.cap.isOpened():
+            raise ValueError(f"Could not open video file: {video_path}")
+
+        self.original_fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+
+        # Calculate frame sampling interval
+        self.sample_interval = max(1, int(self.fps / sample_fps))
+        self._ring = FrameRing(buffer_size) if buffer_size else None
+        self._frame_shape = (
+            int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            3,
+        )
+        # Next frame the capture will decode (tracked by `read_at`)
+        self._position = 0
+        # Private buffer that read-mode skipping decodes into, so skipped
+        # frames never take slots of the ring
+        self._scratch = None
+
+    @property
+    def fps(self):
+        """Source frame rate, falling back to DEFAULT_FPS when unknown."""
+        return self.original_fps if self.original_fps > 0 else DEFAULT_FPS
+
+    def _read(self):
+        if self._ring is None:
+            return self.cap.read()
+        # OpenCV decodes in place when the buffer matches the stream geometry
+        buf = self._ring.next_buffer(self._frame_shape)
+        return self.cap.read(buf)
+
+    def _skip(self):
+        if self.mode == "read":
+            ret, self._scratch = self.cap.read(self._scratch)
+            return ret
+        return self.cap.grab()
+
+    def _iter_sequential(self):
+        stats = self.stats
+        frame_count = 0
+        fps = self.fps
+        while True:
+            start = time.perf_counter()
+            sampled = frame_count % self.sample_interval == 0
+            if sampled:
+                ret, frame = self._read()
+            else:
+                ret = self._skip()
+            stats.capture_seconds += time.perf_counter() - start
+            if not ret:
+                break
+
+            if sampled:
+                stats.sampled += 1
+                yield frame_count, frame_count / fps, frame
+            else:
+                stats.skipped += 1
+
+            frame_count += 1
+
+    def _iter_seek(self):
+        stats = self.stats
+        fps = self.fps
+        position = 0
+        for frame_count in range(0, self.total_frames, self.sample_interval):
+            start = time.perf_counter()
+            if frame_count != position:
+                self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_count)
+            position = frame_count + 1
+            ret, frame = self._read()
+            stats.capture_seconds += time.perf_counter() - start
+            if not ret:
+                break
+
+            stats.sampled += 1
+            stats.skipped += min(self.sample_interval, self.total_frames - frame_count) - 1
+            yield frame_count, frame_count / fps, frame
+
+    def read_at(self, frame_index):
+        """
+        Read one frame by index, for samplers that choose the next frame
+        on the fly (see `alpamayo_demo.utils.adaptive_sampling`).
+
+        Forward gaps are skipped the same way iteration skips them (grab,
+        read or seek, per `mode`); going backwards always seeks. Only the
+        requested frame takes a ring slot, so with `buffer_size` the last
+        `buffer_size - 1` frames returned stay valid across gaps. Do not
+        mix with iterating the stream.
+
+        Args:
+            frame_index (int): Index of the frame in the source video
+
+        Returns:
+            tuple: (ok, frame) like `cv2.VideoCapture.read`
+        """
+        stats = self.stats
+        start = time.perf_counter()
+        gap = frame_index - self._position
+        if gap < 0 or (gap > 0 and self.mode == "seek"):
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+        else:
+            for _ in range(gap):
+                if not self._skip():
+                    stats.capture_seconds += time.perf_counter() - start
+                    return False, None
+        stats.skipped += max(gap, 0)
+        ret, frame = self._read()
+        stats.capture_seconds += time.perf_counter() - start
+        self._position = frame_index + 1
+        if ret:
+            stats.sampled += 1
+        return ret, frame
+
+    def __iter__(self):
+        # Seeking needs a known frame count; otherwise fall back to grabbing
+        seek = self.mode == "seek" and self.total_frames > 0
+        try:
+            yield from (self._iter_seek() if seek else self._iter_sequential())
+        finally:
+            self.close()
+
+    def close(self):
+        """Release the underlying capture."""
+        self.cap.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def iter_video_frames(video_path, sample_fps=1, buffer_size=None, mode="grab"):
+    """
+    Lazily yield sampled frames from a video in constant memory.
+
+    Args:
+        video_path (str): Path to video file
+        sample_fps (int): Frames per second to sample
+        buffer_size (int, optional): Decode into a ring of this many
+            reusable buffers (see `VideoFrameStream`)
+        mode (str): Frame skipping strategy, one of `SAMPLING_MODES`
+
+    Yields:
+        tuple: (frame_index, timestamp_seconds, frame)
+    """
+    with VideoFrameStream(video_path, sample_fps, buffer_size, mode) as stream:
+        yield from stream
+
+
+def load_video_frames(video_path, sample_fps=1, mode="grab"):
     """
     Load video frames and sample at specified FPS.
 
+    Materializes every sampled frame; prefer `iter_video_frames` for
+    long clips.
+
     Args:
         video_path (str): Path to video file
         sample_fps (int): Frames per second to sample
+        mode (str): Frame skipping strategy, one of `SAMPLING_MODES`
 
     Returns:
         list: List of sampled frames (numpy arrays)
         float: Original video FPS
     """
-    cap = cv2.VideoCapture(video_path)
-    if not cap.isOpened():
-        raise ValueError(f"Could not open video file: {video_path}")
-
-    original_fps = cap.get(cv2.CAP_PROP_FPS)
-    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    with VideoFrameStream(video_path, sample_fps, mode=mode) as stream:
+        frames = [frame for _, _, frame in stream]
+        return frames, stream.original_fps
 
-    # Calculate frame sampling interval
-    sample_interval = max(1, int(original_fps / sample_fps))
 
-    frames = []
-    frame_count = 0
-
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
+def open_frame_stream(path, sample_fps=1, buffer_size=None, mode="grab", camera="FRONT"):
+    """
+    Open a clip as a stream of sampled frames, whatever its format.
 
-        if frame_count % sample_interval == 0:
-            frames.append(frame)
+    Waymo TFRecord segments (e.g. `segment-...with_camera_labels.tfrecord`)
+    are read natively, streaming the JPEGs of one camera; anything else is
+    opened as a video file.
 
-        frame_count += 1
+    Args:
+        path (str): Video file or TFRecord segment
+        sample_fps (int): Frames per second to sample
+        buffer_size (int, optional): Frame ring size (video files only;
+            TFRecord frames are freshly decoded JPEGs)
+        mode (str): Frame skipping strategy for video files
+        camera (str): Camera to stream from TFRecord segments
 
-    cap.release()
-    return frames, original_fps
+    Returns:
+        VideoFrameStream | WaymoFrameStream: Stream yielding
+        (frame_index, timestamp_seconds, frame)
+    """
+    if path.lower().endswith(TFRECORD_EXTENSIONS):
+        # Imported here: the TFRecord reader itself builds on this module
+        from alpamayo_demo.utils.waymo_tfrecord import WaymoFrameStream
+        return WaymoFrameStream(path, camera=camera, sample_fps=sample_fps)
+    return VideoFrameStream(path, sample_fps, buffer_size, mode)
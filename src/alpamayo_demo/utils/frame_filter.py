@@ -0,0 +1,154 @@
+"""
+Near-duplicate frame skipping.
+
+Dashcam footage at red lights or in traffic jams contains long runs of
+nearly identical frames. This stage sits between the data loader and the
+policy: each frame gets a tiny perceptual signature (a 16x16 area-averaged
+color thumbnail), and a frame whose signature is within a threshold of the
+last decided frame reuses that frame's decision instead of calling the
+model.
+
+The distance is the largest per-cell difference, not the mean: a
+pedestrian stepping into one corner of an otherwise unchanged scene
+barely moves a frame-wide average, but it clearly changes its own cell.
+
+Frames are compared against the last *decided* frame (the anchor) rather
+than the immediately preceding one, so a slow drift cannot chain small
+differences into an arbitrarily stale decision.
+
+Functions:
+    - frame_signature: Downsampled signature of a frame
+    - signature_distance: Largest absolute difference of two signatures
+
+Classes:
+    - DuplicateFrameSkipper: Reuse decisions across near-identical frames
+"""
+
+import time
+
+import cv2
+import numpy as np
+
+DEFAULT_SIGNATURE_SIZE = 16
+
+# Largest per-cell, per-channel difference (0-255) at or below which frames
+# count as duplicates. Each cell averages thousands of pixels, which
+# suppresses sensor noise and compression artefacts to a level or two.
+DEFAULT_DUPLICATE_THRESHOLD = 6.0
+
+
+def frame_signature(frame, size=DEFAULT_SIGNATURE_SIZE):
+    """
+    Compute a cheap perceptual signature of a frame.
+
+    The frame is area-averaged down to `size` x `size`, keeping its
+    channels (a red pedestrian on gray asphalt can vanish in grayscale).
+
+    Args:
+        frame (np.ndarray): BGR or grayscale frame
+        size (int): Signature edge length in pixels
+
+    Returns:
+        np.ndarray: float32 array of shape (size, size[, channels])
+    """
+    return cv2.resize(frame, (size, size), interpolation=cv2.INTER_AREA).astype(np.float32)
+
+
+def signature_distance(a, b):
+    """Largest absolute difference between two signatures (levels, 0-255)."""
+    return float(np.max(np.abs(a - b)))
+
+
+class DuplicateFrameSkipper:
+    """
+    Reuse the previous decision for near-identical frames.
+
+    Args:
+        threshold (float): Maximum signature distance to count as a duplicate
+        size (int): Signature edge length in pixels
+        max_skip (int, optional): Force a fresh decision after this many
+            consecutive reuses; None never forces one
+
+    Attributes:
+        frames (int): Frames seen
+        skipped (int): Frames that reused a decision
+        signature_seconds (float): Time spent computing signatures
+    """
+
+    def __init__(self, threshold=DEFAULT_DUPLICATE_THRESHOLD, size=DEFAULT_SIGNATURE_SIZE, max_skip=None):
+        if threshold < 0:
+            raise ValueError(f"threshold must be non-negative: {threshold}")
+        self.threshold = threshold
+        self.size = size
+        self.max_skip = max_skip
+        self.frames = 0
+        self.skipped = 0
+        self.signature_seconds = 0.0
+        self._anchor = None
+        self._run = 0
+        self._decision = None
+
+    @property
+    def decided(self):
+        """Frames that went to the policy."""
+        return self.frames - self.skipped
+
+    @property
+    def skip_ratio(self):
+        return self.skipped / self.frames if self.frames else 0.0
+
+    def is_duplicate(self, frame):
+        """
+        Classify a frame, making it the new anchor if it is not a duplicate.
+
+        Args:
+            frame (np.ndarray): Next frame in stream order
+
+        Returns:
+            bool: True if the anchor's decision should be reused
+        """
+        start = time.perf_counter()
+        signature = frame_signature(frame, self.size)
+        self.signature_seconds += time.perf_counter() - start
+        self.frames += 1
+
+        duplicate = (
+            self._anchor is not None
+            and self._anchor.shape == signature.shape
+            and (self.max_skip is None or self._run < self.max_skip)
+            and signature_distance(signature, self._anchor) <= self.threshold
+        )
+        if duplicate:
+            self._run += 1
+            self.skipped += 1
+        else:
+            self._anchor = signature
+            self._run = 0
+        return duplicate
+
+    def decide_batch(self, policy, frames, prompt):
+        """
+        Decide frames, sending only non-duplicates to the policy.
+
+        Args:
+            policy (AlpamayoPolicy): Policy used for fresh decisions
+            frames (list): Consecutive frames in stream order
+            prompt (str): Goal prompt
+
+        Returns:
+            list: One decision dict per frame; reused decisions are copies
+        """
+        duplicate = [self.is_duplicate(frame) for frame in frames]
+        fresh = iter(policy.decide_batch([f for f, d in zip(frames, duplicate) if not d], prompt, output="dict"))
+        decisions = []
+        for is_duplicate in duplicate:
+            if not is_duplicate:
+                self._decision = next(fresh)
+                decisions.append(self._decision)
+            else:
+                decisions.append(dict(self._decision))
+        return decisions
+
+    def decide(self, policy, frame, prompt):
+        """Single-frame form of `decide_batch`."""
+        return self.decide_batch(policy, [frame], prompt)[0]
@@ -0,0 +1,291 @@
+"""
+Pipeline stages for overlapping decode, inference and rendering.
+
+Functions:
+    - prefetch: Run an iterable on a background thread behind a bounded queue
+    - batched: Group items into batches bounded by size and wait time
+
+Classes:
+    - PrefetchIterator: Producer/consumer wrapper returned by `prefetch`
+    - BackgroundWorker: Drain an iterable on a thread into a (bounded) list
+"""
+
+import queue
+import threading
+import time
+
+_END = object()
+
+
+class PrefetchIterator:
+    """
+    Iterate over `source` while a background thread pulls items ahead.
+
+    The producer thread blocks once `maxsize` items are waiting, so a slow
+    consumer applies backpressure instead of letting the queue grow. With
+    decode on the producer side and inference on the consumer side, the
+    loop runs at the speed of the slower stage rather than their sum.
+
+    Exceptions raised by the source are re-raised in the consumer. Closing
+    the iterator (or leaving a `with` block) stops the producer early.
+
+    When the source reuses buffers (e.g. a `FrameRing`), the ring must hold
+    at least `maxsize + 2` frames: one being decoded, `maxsize` queued and
+    one held by the consumer.
+
+    Attributes:
+        producer_wait_seconds (float): Time the producer spent blocked on a
+            full queue, i.e. waiting for the consumer
+        consumer_wait_seconds (float): Time the consumer spent blocked on an
+            empty queue, i.e. waiting for the producer
+    """
+
+    def __init__(self, source, maxsize=4):
+        if maxsize < 1:
+            raise ValueError(f"Prefetch queue size must be at least 1: {maxsize}")
+        self._source = source
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._stop = threading.Event()
+        self._done = False
+        self.producer_wait_seconds = 0.0
+        self.consumer_wait_seconds = 0.0
+        self._thread = threading.Thread(target=self._produce, name="prefetch", daemon=True)
+        self._thread.start()
+
+    def _put(self, item):
+        start = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                try:
+                    self._queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        finally:
+            self.producer_wait_seconds += time.perf_counter() - start
+
+    def _produce(self):
+        iterator = iter(self._source)
+        try:
+            for item in iterator:
+                if not self._put((item, None)):
+                    return
+            self._put((_END, None))
+        except BaseException as e:  # forwarded to the consumer
+            self._put((_END, e))
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.get()
+
+    def get(self, timeout=None):
+        """
+        Return the next item, waiting at most `timeout` seconds.
+
+        Raises:
+            StopIteration: When the source is exhausted
+            TimeoutError: If no item arrived within `timeout`
+        """
+        if self._done:
+            raise StopIteration
+        start = time.perf_counter()
+        try:
+            item, error = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No item within {timeout}s")
+        finally:
+            self.consumer_wait_seconds += time.perf_counter() - start
+        if item is _END:
+            self._done = True
+            self._thread.join()
+            if error is not None:
+                raise error
+            raise StopIteration
+        return item
+
+    def close(self):
+        """Stop the producer thread and discard queued items."""
+        self._done = True
+        self._stop.set()
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def prefetch(source, maxsize=4):
+    """
+    Pull items from `source` on a background thread ahead of the consumer.
+
+    Args:
+        source: Any iterable, e.g. a `VideoFrameStream`
+        maxsize (int): Maximum number of items buffered ahead
+
+    Returns:
+        PrefetchIterator: Iterator yielding the items of `source` in order
+    """
+    return PrefetchIterator(source, maxsize)
+
+
+def batched(source, max_size, max_wait=None):
+    """
+    Group items from `source` into lists for batched inference.
+
+    A batch is emitted once it holds `max_size` items or, when `max_wait`
+    is set, once `max_wait` seconds have passed since its first item
+    arrived. The wait is enforced while blocked only for a
+    `PrefetchIterator` source; other iterables are checked between items.
+
+    Args:
+        source: Iterable of items, ideally a `PrefetchIterator`
+        max_size (int): Maximum items per batch
+        max_wait (float, optional): Maximum seconds to hold a partial batch
+
+    Yields:
+        list: Non-empty batches in source order
+    """
+    if max_size < 1:
+        raise ValueError(f"Batch size must be at least 1: {max_size}")
+    timed = isinstance(source, PrefetchIterator)
+    iterator = iter(source)
+    while True:
+        try:
+            batch = [next(iterator)]
+        except StopIteration:
+            return
+        deadline = None if max_wait is None else time.perf_counter() + max_wait
+        exhausted = False
+        while len(batch) < max_size:
+            remaining = None if deadline is None else deadline - time.perf_counter()
+            if remaining is not None and remaining <= 0:
+                break
+            try:
+                batch.append(iterator.get(timeout=remaining) if timed else next(iterator))
+            except TimeoutError:
+                break
+            except StopIteration:
+                exhausted = True
+                break
+        yield batch
+        if exhausted:
+            return
+
+
+class BackgroundWorker:
+    """
+    Drain an iterable on a daemon thread into a result list.
+
+    Unlike `PrefetchIterator` there is no backpressure: the worker runs at
+    full speed and the caller polls `snapshot()` whenever it likes, e.g. a
+    Streamlit fragment replaying analysed frames at a chosen speed while
+    the rest of the clip is still being analysed.
+
+    With `max_results`, only the newest items are kept, so memory stays
+    bounded on long sources; `dropped` counts the items discarded.
+
+    Args:
+        source: Iterable producing results (consumed on the worker thread)
+        name (str): Thread name
+        max_results (int, optional): Keep at most this many of the newest
+            items (default: keep everything)
+
+    Attributes:
+        results (list): Items kept so far, in source order
+        dropped (int): Items discarded from the front of `results`
+        error (BaseException): Exception that ended the source, if any
+        completed (bool): True once the source was exhausted (not stopped
+            and not failed)
+        elapsed (float): Seconds spent producing so far
+    """
+
+    def __init__(self, source, name="analysis", max_results=None):
+        if max_results is not None and max_results < 1:
+            raise ValueError(f"max_results must be at least 1: {max_results}")
+        self.max_results = max_results
+        self.results = []
+        self.dropped = 0
+        self.error = None
+        self.completed = False
+        self.elapsed = 0.0
+        self._source = source
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self):
+        """Start the worker thread; returns self for chaining."""
+        self._thread.start()
+        return self
+
+    def _run(self):
+        start = time.perf_counter()
+        iterator = iter(self._source)
+        try:
+            for item in iterator:
+                self.results.append(item)
+                if self.max_results is not None and len(self.results) > self.max_results:
+                    self._trim()
+                self.elapsed = time.perf_counter() - start
+                if self._stop.is_set():
+                    break
+            else:
+                self.completed = True
+        except BaseException as e:  # surfaced to the caller via `error`
+            self.error = e
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+            self.elapsed = time.perf_counter() - start
+
+    def _trim(self):
+        with self._lock:
+            excess = len(self.results) - self.max_results
+            del self.results[:excess]
+            self.dropped += excess
+
+    def snapshot(self):
+        """
+        Return the items kept so far together with their position.
+
+        Returns:
+            tuple: (first, items) where `items` is a copy and `items[i]`
+            is item `first + i` of the source
+        """
+        with self._lock:
+            return self.dropped, self.results[:]
+
+    @property
+    def done(self):
+        """True once the source is exhausted, failed or was stopped."""
+        return self._thread.ident is not None and not self._thread.is_alive()
+
+    def __len__(self):
+        """Items produced so far, including dropped ones."""
+        with self._lock:
+            return self.dropped + len(self.results)
+
+    def join(self, timeout=None):
+        """Wait for the worker to finish."""
+        self._thread.join(timeout)
+
+    def stop(self, timeout=None):
+        """Ask the worker to stop after its current item and wait for it."""
+        self._stop.set()
+        if self._thread.ident is not None:
+            self._thread.join(timeout)
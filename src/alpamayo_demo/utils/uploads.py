@@ -0,0 +1,109 @@
+"""
+Spooling uploaded clips to disk.
+
+OpenCV needs a file path, so uploads have to land on disk before they
+can be decoded. Copying `upload.read()` in one go holds a second full
+copy of the clip in memory, which for a multi-GB Waymo segment is enough
+to spike a Streamlit server. Here the copy goes through one bounded,
+reused buffer, and the temp file is removed however its owner goes away.
+
+Functions:
+    - copy_in_chunks: Copy between file objects through a fixed buffer
+
+Classes:
+    - SpooledUpload: Upload copied to a temp file with guaranteed cleanup
+"""
+
+import os
+import tempfile
+import weakref
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def copy_in_chunks(source, destination, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Copy `source` to `destination` through one reused buffer.
+
+    Uses `readinto` when the source supports it, so no per-chunk bytes
+    objects are allocated; peak extra memory is `chunk_size`.
+
+    Args:
+        source: Readable binary file object
+        destination: Writable binary file object
+        chunk_size (int): Buffer size in bytes
+
+    Returns:
+        int: Bytes copied
+    """
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    readinto = getattr(source, "readinto", None)
+    copied = 0
+    while True:
+        if readinto is not None:
+            n = readinto(buffer)
+            chunk = view[:n]
+        else:
+            chunk = source.read(chunk_size)
+            n = len(chunk)
+        if not n:
+            return copied
+        destination.write(chunk)
+        copied += n
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class SpooledUpload:
+    """
+    An uploaded file copied to a named temp file.
+
+    The file is deleted by `close()`, on leaving a `with` block, when the
+    object is garbage collected (e.g. its Streamlit session ends), or at
+    interpreter exit, whichever comes first. A failed copy deletes the
+    partial file before re-raising.
+
+    Args:
+        fileobj: Readable binary file object, e.g. a Streamlit `UploadedFile`
+        suffix (str): Temp file suffix; keeps the container extension
+            visible to OpenCV
+        chunk_size (int): Copy buffer size in bytes
+        dir (str, optional): Directory for the temp file
+
+    Attributes:
+        path (str): Temp file path
+        size (int): Bytes copied
+    """
+
+    def __init__(self, fileobj, suffix=".mp4", chunk_size=DEFAULT_CHUNK_SIZE, dir=None):
+        fd, self.path = tempfile.mkstemp(suffix=suffix, dir=dir)
+        self._finalizer = weakref.finalize(self, _remove, self.path)
+        try:
+            with os.fdopen(fd, "wb") as out:
+                seekable = getattr(fileobj, "seekable", None)
+                if seekable is not None and seekable():
+                    fileobj.seek(0)
+                self.size = copy_in_chunks(fileobj, out, chunk_size)
+        except BaseException:
+            self.close()
+            raise
+
+    @property
+    def closed(self):
+        return not self._finalizer.alive
+
+    def close(self):
+        """Delete the temp file (idempotent)."""
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -5,6 +5,8 @@ Provides OpenCV-based UI with video playback and decision overlays.
 Shows video on left, decisions and explanations on right.
 """
 
+import functools
+
 import cv2
 import numpy as np
 import json
@@ -27,19 +29,21 @@ def create_visualization_window(frames, decisions, original_fps=30):
     cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
     cv2.resizeWindow(window_name, 1200, 600)
 
-    frame_idx = 0
+    frame_idx = 0  # Next frame to show
     paused = False
     delay = int(1000 / original_fps)  # Delay between frames in ms
 
-    while True:
-        if not paused and frame_idx < len(frames):
-            frame = frames[frame_idx].copy()
-            decision = decisions[frame_idx]
+    # Frames are rendered into one reused canvas; imshow copies it
+    renderer = DisplayRenderer()
 
-            # Create display frame with video and info panel
-            display_frame = create_display_frame(frame, decision)
+    def show(idx):
+        # Create display frame with video and info panel
+        display_frame = renderer.render(frames[idx], decisions[idx])
+        cv2.imshow(window_name, display_frame)
 
-            cv2.imshow(window_name, display_frame)
+    while True:
+        if not paused and frame_idx < len(frames):
+            show(frame_idx)
 
             frame_idx += 1
             if frame_idx >= len(frames):
@@ -56,11 +60,13 @@ def create_visualization_window(frames, decisions, original_fps=30):
         elif key == ord(' '):  # Pause/Play
             paused = not paused
         elif key == ord('n'):  # Next frame
-            if paused and frame_idx < len(frames) - 1:
+            if paused and frame_idx < len(frames):
+                show(frame_idx)
                 frame_idx += 1
         elif key == ord('p'):  # Previous frame
-            if paused and frame_idx > 0:
+            if paused and frame_idx > 1:
                 frame_idx -= 1
+                show(frame_idx - 1)
         elif key == 27:  # ESC
             break
 
@@ -85,82 +91,278 @@ def create_display_frame(frame, decision):
     new_height = int(height * scale)
     resized_frame = cv2.resize(frame, (new_width, new_height))
 
-    # Create info panel on the right
-    info_width = 400
-    info_height = new_height
-    info_panel = np.ones((info_height, info_width, 3), dtype=np.uint8) * 240  # Light gray
+    # Info panel on the right, rendered once per distinct decision
+    info_panel = render_info_panel(decision, new_height)
 
-    # Add decision information to info panel
-    y_offset = 30
-    font = cv2.FONT_HERSHEY_SIMPLEX
-    font_scale = 0.6
-    color = (0, 0, 0)  # Black
-    thickness = 1
+    # Combine video and info panel
+    combined = np.hstack([resized_frame, info_panel])
+
+    return combined
+
+# Info panel layout
+INFO_PANEL_WIDTH = 400
+_PANEL_BACKGROUND = 240  # Light gray
+_FONT = cv2.FONT_HERSHEY_SIMPLEX
+_FONT_SCALE = 0.6
+_TEXT_COLOR = (0, 0, 0)  # Black
+_DECISION_COLOR = (0, 100, 0)  # Green
+_THICKNESS = 1
+_MAX_AGENT_ROWS = 3
+_FIELD_LABELS = ("Frame", "Scene", "Traffic Light", "Agents", "Hazards", "Decision", "Confidence")
+
+def _panel_rows(agent_rows):
+    """
+    Baseline y of every panel row for a given number of agent rows.
+
+    Returns:
+        dict: Field label -> y, plus "agents" (list of agent row ys) and
+        "reason" (y of the first wrapped reason line)
+    """
+    y = {}
+    y["title"] = 30
+    y["Frame"] = 70
+    y["Scene"] = 95
+    y["Traffic Light"] = 120
+    y["Agents"] = 145
+    y["agents"] = [170 + 20 * i for i in range(agent_rows)]
+    y["Hazards"] = 170 + 20 * agent_rows
+    y["Decision"] = y["Hazards"] + 25
+    y["Confidence"] = y["Decision"] + 25
+    y["Reason"] = y["Confidence"] + 25
+    y["reason"] = y["Reason"] + 25
+    return y
+
+def _value_x(label, text):
+    """x at which `text` starts when drawn as the value of "<label>: "."""
+    # Measured as the width of the whole line minus the value's own width,
+    # which is exactly where the value starts when drawn in one call
+    full = cv2.getTextSize(f"{label}: {text}", _FONT, _FONT_SCALE, _THICKNESS)[0][0]
+    return 10 + full - cv2.getTextSize(text, _FONT, _FONT_SCALE, _THICKNESS)[0][0]
+
+@functools.lru_cache(maxsize=32)
+def _panel_background(height, agent_rows):
+    """
+    Pre-render the static part of the info panel: background, title and
+    field labels. Cached per panel height and number of agent rows, which
+    together fix the layout. The returned array is read-only.
+    """
+    panel = np.full((height, INFO_PANEL_WIDTH, 3), _PANEL_BACKGROUND, dtype=np.uint8)
+    rows = _panel_rows(agent_rows)
 
     # Title
-    cv2.putText(info_panel, "Alpamayo R1 Decision", (10, y_offset),
-                font, 0.8, color, 2)
-    y_offset += 40
-
-    # Frame ID
-    cv2.putText(info_panel, f"Frame: {decision.get('frame_id', 'N/A')}", (10, y_offset),
-                font, font_scale, color, thickness)
-    y_offset += 25
-
-    # Scene Type
-    cv2.putText(info_panel, f"Scene: {decision.get('scene_type', 'N/A')}", (10, y_offset),
-                font, font_scale, color, thickness)
-    y_offset += 25
-
-    # Traffic Light
-    cv2.putText(info_panel, f"Traffic Light: {decision.get('traffic_light', 'N/A')}", (10, y_offset),
-                font, font_scale, color, thickness)
-    y_offset += 25
-
-    # Agents
+    cv2.putText(panel, "Alpamayo R1 Decision", (10, rows["title"]),
+                _FONT, 0.8, _TEXT_COLOR, 2)
+
+    for label in _FIELD_LABELS:
+        color = _DECISION_COLOR if label == "Decision" else _TEXT_COLOR
+        cv2.putText(panel, f"{label}: ", (10, rows[label]),
+                    _FONT, _FONT_SCALE, color, _THICKNESS)
+    cv2.putText(panel, "Reason:", (10, rows["Reason"]),
+                _FONT, _FONT_SCALE, _TEXT_COLOR, _THICKNESS)
+
+    panel.flags.writeable = False
+    return panel
+
+def _panel_key(decision):
+    """
+    Hashable summary of everything the info panel displays except the
+    frame number, which changes every frame and is drawn separately.
+    """
     agents = decision.get('agents', [])
-    cv2.putText(info_panel, f"Agents: {len(agents)}", (10, y_offset),
-                font, font_scale, color, thickness)
-    y_offset += 25
-    for agent in agents[:3]:  # Show up to 3 agents
-        cv2.putText(info_panel, f"  {agent['type']} ({agent['position']})", (10, y_offset),
-                    font, font_scale * 0.8, color, thickness)
-        y_offset += 20
-
-    # Hazards
-    hazards = decision.get('hazards', [])
-    cv2.putText(info_panel, f"Hazards: {', '.join(hazards) if hazards else 'None'}", (10, y_offset),
-                font, font_scale, color, thickness)
-    y_offset += 25
-
-    # Decision
-    decision_text = decision.get('decision', 'N/A').upper()
-    cv2.putText(info_panel, f"Decision: {decision_text}", (10, y_offset),
-                font, font_scale, (0, 100, 0), thickness)  # Green
-    y_offset += 25
-
-    # Confidence
-    confidence = decision.get('confidence', 0.0)
-    cv2.putText(info_panel, f"Confidence: {confidence:.2f}", (10, y_offset),
-                font, font_scale, color, thickness)
-    y_offset += 25
-
-    # Reason
-    reason = decision.get('reason', 'N/A')
+    return (
+        str(decision.get('scene_type', 'N/A')),
+        str(decision.get('traffic_light', 'N/A')),
+        len(agents),
+        tuple((agent['type'], agent['position']) for agent in agents[:_MAX_AGENT_ROWS]),
+        ', '.join(decision.get('hazards', [])) or 'None',
+        decision.get('decision', 'N/A').upper(),
+        decision.get('confidence', 0.0),
+        decision.get('reason', 'N/A'),
+    )
+
+def _draw_frame_id(panel, decision):
+    """Draw the frame number onto a panel holding the background."""
+    text = str(decision.get('frame_id', 'N/A'))
+    cv2.putText(panel, text, (_value_x("Frame", text), _panel_rows(0)["Frame"]),
+                _FONT, _FONT_SCALE, _TEXT_COLOR, _THICKNESS)
+
+def _draw_panel_values(panel, key):
+    """Draw the decision values except the frame number onto a panel holding the background."""
+    scene, light, n_agents, agents, hazards, action, confidence, reason = key
+    rows = _panel_rows(len(agents))
+
+    values = (
+        ("Scene", scene),
+        ("Traffic Light", light),
+        ("Agents", str(n_agents)),
+        ("Hazards", hazards),
+        ("Confidence", f"{confidence:.2f}"),
+    )
+    for label, text in values:
+        cv2.putText(panel, text, (_value_x(label, text), rows[label]),
+                    _FONT, _FONT_SCALE, _TEXT_COLOR, _THICKNESS)
+    cv2.putText(panel, action, (_value_x("Decision", action), rows["Decision"]),
+                _FONT, _FONT_SCALE, _DECISION_COLOR, _THICKNESS)
+
+    for (agent_type, position), y in zip(agents, rows["agents"]):
+        cv2.putText(panel, f"  {agent_type} ({position})", (10, y),
+                    _FONT, _FONT_SCALE * 0.8, _TEXT_COLOR, _THICKNESS)
+
     # Wrap text if too long
-    wrapped_reason = wrap_text(reason, 35)
-    cv2.putText(info_panel, "Reason:", (10, y_offset),
-                font, font_scale, color, thickness)
-    y_offset += 25
-    for line in wrapped_reason:
-        cv2.putText(info_panel, line, (10, y_offset),
-                    font, font_scale * 0.8, color, thickness)
-        y_offset += 20
+    y = rows["reason"]
+    for line in wrap_text(reason, 35):
+        cv2.putText(panel, line, (10, y),
+                    _FONT, _FONT_SCALE * 0.8, _TEXT_COLOR, _THICKNESS)
+        y += 20
+
+# Panels are ~720 KB each at height 600, so only a few are kept
+@functools.lru_cache(maxsize=16)
+def _render_panel(height, key):
+    """Panel with everything but the frame number, memoized per decision content."""
+    panel = _panel_background(height, len(key[3])).copy()
+    _draw_panel_values(panel, key)
+    panel.flags.writeable = False
+    return panel
+
+def render_info_panel(decision, height):
+    """
+    Render the decision info panel shown to the right of the video.
 
-    # Combine video and info panel
-    combined = np.hstack([resized_frame, info_panel])
+    Static labels come from a cached background, and the decision values
+    are memoized per decision content (everything but the frame number),
+    so consecutive frames with the same decision only draw their frame
+    number.
 
-    return combined
+    Args:
+        decision: Decision dictionary
+        height (int): Panel height in pixels
+
+    Returns:
+        numpy array: (height, INFO_PANEL_WIDTH, 3) panel
+    """
+    panel = _render_panel(height, _panel_key(decision)).copy()
+    _draw_frame_id(panel, decision)
+    return panel
+
+class DisplayRenderer:
+    """
+    Render display frames into one preallocated, reused canvas.
+
+    Produces the same image as `create_display_frame`, but the resized
+    video is written straight into the left of the canvas with
+    `cv2.resize(dst=...)` and the info panel is copied or drawn into the
+    right, so steady-state rendering allocates no frame-sized arrays.
+
+    The returned canvas is overwritten by the next `render` call; copy it
+    if it must outlive that.
+
+    Args:
+        max_video_height (int): Video is scaled down to at most this height
+        memoize_panels (bool): Reuse memoized panels for repeated decision
+            content (interactive replay, runs of identical decisions). When
+            False, each panel is drawn directly into the canvas, which suits
+            streams of unique decisions.
+    """
+
+    def __init__(self, max_video_height=600, memoize_panels=True):
+        self.max_video_height = max_video_height
+        self.memoize_panels = memoize_panels
+        self._canvas = None
+
+    def output_size(self, frame_shape):
+        """(width, height) of the canvas produced for frames of `frame_shape`."""
+        height, width = frame_shape[:2]
+        scale = min(self.max_video_height / height, 1.0)
+        return int(width * scale) + INFO_PANEL_WIDTH, int(height * scale)
+
+    def render(self, frame, decision):
+        """
+        Render `frame` and `decision` into the canvas.
+
+        Args:
+            frame: Video frame (numpy array)
+            decision: Decision dictionary
+
+        Returns:
+            numpy array: The shared canvas holding the combined display frame
+        """
+        canvas_width, new_height = self.output_size(frame.shape)
+        new_width = canvas_width - INFO_PANEL_WIDTH
+        if self._canvas is None or self._canvas.shape[:2] != (new_height, canvas_width):
+            self._canvas = np.empty((new_height, canvas_width, 3), dtype=np.uint8)
+
+        video = self._canvas[:, :new_width]
+        if (new_height, new_width) == frame.shape[:2]:
+            np.copyto(video, frame)
+        else:
+            cv2.resize(frame, (new_width, new_height), dst=video)
+
+        panel = self._canvas[:, new_width:]
+        key = _panel_key(decision)
+        if self.memoize_panels:
+            np.copyto(panel, _render_panel(new_height, key))
+        else:
+            np.copyto(panel, _panel_background(new_height, len(key[3])))
+            _draw_panel_values(panel, key)
+        _draw_frame_id(panel, decision)
+        return self._canvas
+
+class AnnotatedVideoWriter:
+    """
+    Stream display frames (video + decision panel) into a video file.
+
+    Needs no display, so it runs on headless machines. Each frame is
+    rendered into a `DisplayRenderer` canvas and handed straight to
+    `cv2.VideoWriter`; nothing is buffered, so output length is unbounded.
+    The writer is opened on the first frame, once the output size is known.
+
+    Args:
+        output_path (str): Destination file, e.g. "annotated.mp4"
+        fps (float): Frame rate of the output video
+        fourcc (str): Four-character codec code
+    """
+
+    def __init__(self, output_path, fps, fourcc="mp4v"):
+        self.output_path = output_path
+        self.fps = fps
+        self.fourcc = fourcc
+        self.frames_written = 0
+        self._renderer = DisplayRenderer(memoize_panels=False)
+        self._writer = None
+        self._size = None
+
+    def write(self, frame, decision):
+        """
+        Render and append one annotated frame.
+
+        Args:
+            frame: Video frame (numpy array)
+            decision: Decision dictionary
+        """
+        size = self._renderer.output_size(frame.shape)
+        if self._writer is None:
+            self._writer = cv2.VideoWriter(self.output_path, cv2.VideoWriter_fourcc(*self.fourcc),
+                                           self.fps, size)
+            if not self._writer.isOpened():
+                raise ValueError(f"Could not open video writer: {self.output_path}")
+            self._size = size
+        elif size != self._size:
+            raise ValueError(f"Frame size changed mid-stream: {size} != {self._size}")
+
+        self._writer.write(self._renderer.render(frame, decision))
+        self.frames_written += 1
+
+    def close(self):
+        """Finalize the output file."""
+        if self._writer is not None:
+            self._writer.release()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
 def wrap_text(text, max_chars):
     """
@@ -0,0 +1,488 @@
+"""
+Native reader for Waymo Open Dataset TFRecord segments.
+
+Streams camera images straight out of segment files, without
+pre-extracting MP4s (which doubles storage and adds a lossy transcode) and
+without TensorFlow or the Waymo protobuf package. The file is mmap'd,
+TFRecord framing is parsed here, and only the few fields of the `Frame`
+protobuf that carry camera images are walked; lidar and labels are
+skipped by length. JPEGs are decoded only when a frame is actually used.
+
+TFRecord framing, per record:
+    uint64 length | uint32 masked_crc32c(length) | data | uint32 masked_crc32c(data)
+
+Protobuf fields used (waymo_open_dataset/dataset.proto):
+    Frame.context = 1 (Context.name = 1), Frame.timestamp_micros = 2,
+    Frame.images = 4 (repeated CameraImage)
+    CameraImage.name = 1 (CameraName.Name enum), CameraImage.image = 2 (JPEG)
+
+Functions:
+    - crc32c: CRC-32C (Castagnoli) checksum
+    - masked_crc32c: TFRecord's masked CRC
+
+Classes:
+    - TFRecordFile: mmap'd TFRecord file with indexed record access
+    - CameraImage: One camera's lazily decoded JPEG
+    - WaymoFrame: Camera images of one Frame record
+    - WaymoFrameStream: `VideoFrameStream`-compatible stream over one camera
+    - BundleRing: Preallocated ring of multi-camera frame slots
+    - MultiCameraStream: Time-aligned bundles of several cameras
+"""
+
+import mmap
+import os
+import struct
+import time
+
+import cv2
+import numpy as np
+
+from alpamayo_demo.utils.data_loader import SamplingStats
+
+try:  # optional C implementation; the pure-Python fallback is slow
+    from crc32c import crc32c as _crc32c_ext
+except ImportError:
+    _crc32c_ext = None
+
+# CameraName.Name values from dataset.proto
+CAMERA_NAMES = {
+    "FRONT": 1,
+    "FRONT_LEFT": 2,
+    "FRONT_RIGHT": 3,
+    "SIDE_LEFT": 4,
+    "SIDE_RIGHT": 5,
+}
+_CAMERA_BY_ID = {v: k for k, v in CAMERA_NAMES.items()}
+
+# Waymo camera frames are captured at 10 Hz
+WAYMO_CAMERA_FPS = 10.0
+
+# Protobuf wire types
+_VARINT, _I64, _LEN, _I32 = 0, 1, 2, 5
+
+_HEADER = struct.Struct("<QI")
+_FOOTER = struct.Struct("<I")
+
+
+def _crc32c_table():
+    table = []
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0x82F63B78 if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+
+_CRC32C_TABLE = _crc32c_table()
+
+
+def crc32c(data):
+    """
+    CRC-32C (Castagnoli) of `data`.
+
+    Uses the `crc32c` package when installed, otherwise a table-driven
+    pure-Python loop (a few MB/s: fine for headers, slow for payloads).
+    """
+    if _crc32c_ext is not None:
+        return _crc32c_ext(bytes(data))
+    table = _CRC32C_TABLE
+    crc = 0xFFFFFFFF
+    for byte in data:
+        crc = table[(crc ^ byte) & 0xFF] ^ (crc >> 8)
+    return crc ^ 0xFFFFFFFF
+
+
+def masked_crc32c(data):
+    """TFRecord's masked CRC: rotate right by 15 and add a constant."""
+    crc = crc32c(data)
+    return (((crc >> 15) | (crc << 17)) + 0xA282EAD8) & 0xFFFFFFFF
+
+
+class TFRecordFile:
+    """
+    Memory-mapped TFRecord file.
+
+    Opening scans the framing once (8 + 4 bytes per record, payloads are
+    not touched) to build an offset index, so records can be read in any
+    order. Record payloads are returned as memoryviews into the map.
+
+    Args:
+        path (str): TFRecord file
+        verify_data (bool, optional): Check each payload's CRC when it is
+            read. Defaults to on when the `crc32c` package is installed.
+            Length CRCs are always checked.
+    """
+
+    def __init__(self, path, verify_data=None):
+        self.path = path
+        self.verify_data = _crc32c_ext is not None if verify_data is None else verify_data
+        with open(path, "rb") as f:
+            # mmap cannot map an empty file
+            empty = os.fstat(f.fileno()).st_size == 0
+            self._map = None if empty else mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map) if self._map is not None else memoryview(b"")
+        self.offsets = self._index()
+
+    def _index(self):
+        view, size = self._view, len(self._view)
+        offsets, position = [], 0
+        while position < size:
+            if position + _HEADER.size > size:
+                raise ValueError(f"Truncated record header at byte {position} in {self.path}")
+            length, length_crc = _HEADER.unpack_from(view, position)
+            if masked_crc32c(view[position:position + 8]) != length_crc:
+                raise ValueError(f"Corrupt record length at byte {position} in {self.path}")
+            start = position + _HEADER.size
+            end = start + length
+            if end + _FOOTER.size > size:
+                raise ValueError(f"Truncated record at byte {position} in {self.path}")
+            offsets.append((start, length))
+            position = end + _FOOTER.size
+        return offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def record(self, index):
+        """
+        Payload of record `index`.
+
+        Returns:
+            memoryview: Zero-copy view into the mapped file
+        """
+        start, length = self.offsets[index]
+        data = self._view[start:start + length]
+        if self.verify_data:
+            (expected,) = _FOOTER.unpack_from(self._view, start + length)
+            if masked_crc32c(data) != expected:
+                raise ValueError(f"Corrupt record {index} in {self.path}")
+        return data
+
+    def __iter__(self):
+        return (self.record(i) for i in range(len(self)))
+
+    def close(self):
+        """Unmap the file. Views handed out earlier must not be used after."""
+        self._view.release()
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # A caller still holds a view; the map is freed with it
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _read_varint(buf, position):
+    result, shift = 0, 0
+    while True:
+        byte = buf[position]
+        position += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, position
+        shift += 7
+
+
+def _iter_fields(buf, start=0, end=None):
+    """
+    Walk protobuf fields in `buf[start:end]`.
+
+    Yields:
+        tuple: (field_number, wire_type, value) where value is an int for
+        varints and a (start, end) span for length-delimited fields;
+        fixed-width fields yield their span too
+    """
+    end = len(buf) if end is None else end
+    position = start
+    while position < end:
+        key, position = _read_varint(buf, position)
+        field, wire_type = key >> 3, key & 7
+        if wire_type == _VARINT:
+            value, position = _read_varint(buf, position)
+        elif wire_type == _LEN:
+            length, position = _read_varint(buf, position)
+            value = (position, position + length)
+            position += length
+        elif wire_type == _I64:
+            value = (position, position + 8)
+            position += 8
+        elif wire_type == _I32:
+            value = (position, position + 4)
+            position += 4
+        else:
+            raise ValueError(f"Unsupported protobuf wire type {wire_type}")
+        yield field, wire_type, value
+
+
+class CameraImage:
+    """
+    One camera image of a frame; the JPEG is decoded on demand.
+
+    Attributes:
+        camera (str): Camera name, e.g. "FRONT"
+        jpeg (memoryview): Encoded image bytes (a view into the record)
+    """
+
+    __slots__ = ("camera", "jpeg")
+
+    def __init__(self, camera, jpeg):
+        self.camera = camera
+        self.jpeg = jpeg
+
+    def decode(self):
+        """Decode the JPEG into a BGR frame."""
+        frame = cv2.imdecode(np.frombuffer(self.jpeg, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            raise ValueError(f"Could not decode {self.camera} image")
+        return frame
+
+
+class WaymoFrame:
+    """
+    Camera images of one `Frame` record.
+
+    Args:
+        record: Serialized `Frame` protobuf (bytes or memoryview)
+        cameras (iterable, optional): Camera names to keep; None keeps all
+
+    Attributes:
+        context_name (str): Segment name from the frame context
+        timestamp_micros (int): Frame timestamp in microseconds
+        images (dict): Camera name -> `CameraImage`
+    """
+
+    def __init__(self, record, cameras=None):
+        wanted = None if cameras is None else {CAMERA_NAMES[name] for name in cameras}
+        self.context_name = ""
+        self.timestamp_micros = 0
+        self.images = {}
+        for field, wire_type, value in _iter_fields(record):
+            if field == 2 and wire_type == _VARINT:
+                self.timestamp_micros = value
+            elif field == 1 and wire_type == _LEN:
+                for sub_field, sub_type, sub_value in _iter_fields(record, *value):
+                    if sub_field == 1 and sub_type == _LEN:
+                        self.context_name = bytes(record[sub_value[0]:sub_value[1]]).decode("utf-8", "replace")
+            elif field == 4 and wire_type == _LEN:
+                camera_id, image = None, None
+                for sub_field, sub_type, sub_value in _iter_fields(record, *value):
+                    if sub_field == 1 and sub_type == _VARINT:
+                        camera_id = sub_value
+                    elif sub_field == 2 and sub_type == _LEN:
+                        image = sub_value
+                if image is None or camera_id not in _CAMERA_BY_ID:
+                    continue
+                if wanted is None or camera_id in wanted:
+                    name = _CAMERA_BY_ID[camera_id]
+                    self.images[name] = CameraImage(name, record[image[0]:image[1]])
+
+    @property
+    def timestamp(self):
+        """Timestamp in seconds."""
+        return self.timestamp_micros / 1e6
+
+
+class BundleRing:
+    """
+    Preallocated ring of multi-camera frame slots.
+
+    All cameras share one slot index, so a bundle is a set of views into
+    the same slot and is overwritten as a whole after `size` further
+    bundles. Each camera's slots are one contiguous `(size, height, width,
+    3)` array, allocated from its first image (Waymo side cameras are
+    shorter than the front ones, so cameras cannot share an array).
+    Memory stays at `size` bundles however many cameras and frames stream
+    through.
+
+    Args:
+        size (int): Slots in the ring; consumers may hold at most
+            `size - 1` bundles
+        cameras (iterable): Camera names stored per slot
+    """
+
+    def __init__(self, size, cameras):
+        if size < 1:
+            raise ValueError(f"Ring size must be at least 1: {size}")
+        self.size = size
+        self._storage = dict.fromkeys(cameras)
+        self._next = 0
+
+    def next_slot(self):
+        """Claim the next slot index, round-robin."""
+        slot = self._next
+        self._next = (slot + 1) % self.size
+        return slot
+
+    def buffer(self, slot, camera, shape):
+        """
+        Buffer for `camera` in `slot`, (re)allocating that camera's
+        storage if the image geometry changed.
+
+        Returns:
+            np.ndarray: uint8 view of the requested shape, contents undefined
+        """
+        storage = self._storage[camera]
+        if storage is None or storage.shape[1:] != tuple(shape):
+            storage = np.empty((self.size,) + tuple(shape), dtype=np.uint8)
+            self._storage[camera] = storage
+        return storage[slot]
+
+    @property
+    def nbytes(self):
+        """Bytes currently allocated for all slots."""
+        return sum(storage.nbytes for storage in self._storage.values() if storage is not None)
+
+
+class WaymoFrameStream:
+    """
+    Sampled frames of one camera from a Waymo segment.
+
+    Mirrors `VideoFrameStream`: iterating yields `(frame_index, timestamp,
+    frame)` with `timestamp` in seconds from the first frame, and
+    `read_at`, `fps`, `total_frames`, `sample_interval` and `stats` work
+    the same way, so the pipeline, batching and adaptive sampling accept
+    either. Unsampled records are skipped without parsing or decoding.
+
+    Args:
+        path (str): TFRecord segment file
+        camera (str): Camera to stream, one of `CAMERA_NAMES`
+        sample_fps (float): Frames per second to sample
+        verify_data (bool, optional): See `TFRecordFile`
+    """
+
+    def __init__(self, path, camera="FRONT", sample_fps=1, verify_data=None):
+        if camera not in CAMERA_NAMES:
+            raise ValueError(f"Invalid camera: {camera}")
+        self.video_path = path
+        self.camera = camera
+        self.cameras = (camera,)
+        self.stats = SamplingStats()
+        try:
+            self.records = TFRecordFile(path, verify_data=verify_data)
+        except OSError as e:
+            raise ValueError(f"Could not open TFRecord file: {path}") from e
+        self.total_frames = len(self.records)
+        self.original_fps = WAYMO_CAMERA_FPS
+        self.sample_interval = max(1, int(self.fps / sample_fps))
+        self._start_micros = None
+
+    @property
+    def fps(self):
+        return WAYMO_CAMERA_FPS
+
+    def frame(self, index):
+        """Parse record `index` into a `WaymoFrame` keeping only this stream's cameras."""
+        return WaymoFrame(self.records.record(index), cameras=self.cameras)
+
+    def _decode(self, waymo_frame):
+        """Decoded item for a frame, or None if its camera is missing."""
+        image = waymo_frame.images.get(self.camera)
+        return image.decode() if image is not None else None
+
+    def _timestamp(self, waymo_frame):
+        if self._start_micros is None:
+            self._start_micros = WaymoFrame(self.records.record(0)).timestamp_micros if self.total_frames else 0
+        return (waymo_frame.timestamp_micros - self._start_micros) / 1e6
+
+    def read_at(self, frame_index):
+        """
+        Decode the camera image of record `frame_index`.
+
+        Returns:
+            tuple: (ok, frame) like `cv2.VideoCapture.read`
+        """
+        if not 0 <= frame_index < self.total_frames:
+            return False, None
+        start = time.perf_counter()
+        frame = self._decode(self.frame(frame_index))
+        self.stats.capture_seconds += time.perf_counter() - start
+        if frame is None:
+            return False, None
+        self.stats.sampled += 1
+        return True, frame
+
+    def __iter__(self):
+        try:
+            for index in range(0, self.total_frames, self.sample_interval):
+                start = time.perf_counter()
+                waymo_frame = self.frame(index)
+                frame = self._decode(waymo_frame)
+                self.stats.capture_seconds += time.perf_counter() - start
+                stride = min(self.sample_interval, self.total_frames - index)
+                if frame is None:
+                    # Frame without the camera(s): nothing to yield
+                    self.stats.skipped += stride
+                    continue
+                self.stats.sampled += 1
+                self.stats.skipped += stride - 1
+                yield index, self._timestamp(waymo_frame), frame
+        finally:
+            self.close()
+
+    def close(self):
+        """Unmap the segment file."""
+        self.records.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class MultiCameraStream(WaymoFrameStream):
+    """
+    Time-aligned bundles of several cameras from a Waymo segment.
+
+    The camera images of one `Frame` record are captured for the same
+    timestamp, so each record is one bundle; records missing any of the
+    requested cameras are skipped. Iterating yields `(frame_index,
+    timestamp, bundle)` where `bundle` maps camera name to frame in
+    `cameras` order, ready for `AlpamayoPolicy.decide_bundle`; `read_at`
+    returns `(ok, bundle)`, so adaptive sampling works unchanged.
+
+    Args:
+        path (str): TFRecord segment file
+        cameras (iterable, optional): Cameras per bundle; defaults to all five
+        sample_fps (float): Bundles per second to sample
+        buffer_size (int, optional): If set, bundles are stored in a
+            `BundleRing` of this many slots instead of freshly allocated
+            arrays, and each bundle is only valid until `buffer_size`
+            further bundles have been yielded
+        verify_data (bool, optional): See `TFRecordFile`
+    """
+
+    def __init__(self, path, cameras=None, sample_fps=1, buffer_size=None, verify_data=None):
+        cameras = tuple(CAMERA_NAMES) if cameras is None else tuple(cameras)
+        if not cameras:
+            raise ValueError("At least one camera is required")
+        for camera in cameras:
+            if camera not in CAMERA_NAMES:
+                raise ValueError(f"Invalid camera: {camera}")
+        super().__init__(path, camera=cameras[0], sample_fps=sample_fps, verify_data=verify_data)
+        self.cameras = cameras
+        self.ring = BundleRing(buffer_size, cameras) if buffer_size else None
+
+    def _decode(self, waymo_frame):
+        images = waymo_frame.images
+        if any(camera not in images for camera in self.cameras):
+            return None
+        if self.ring is None:
+            return {camera: images[camera].decode() for camera in self.cameras}
+        # imdecode cannot write into a given buffer, so each image is copied
+        # into its slot once and the decoder's array is dropped right away
+        slot = self.ring.next_slot()
+        bundle = {}
+        for camera in self.cameras:
+            frame = images[camera].decode()
+            buffer = self.ring.buffer(slot, camera, frame.shape)
+            np.copyto(buffer, frame)
+            bundle[camera] = buffer
+        return bundle
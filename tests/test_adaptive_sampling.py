@@ -0,0 +1,116 @@
+"""
+Unit tests for volatility-driven adaptive sampling.
+"""
+
+import cv2
+import numpy as np
+import pytest
+from alpamayo_demo.utils.adaptive_sampling import AdaptiveSampler
+from alpamayo_demo.utils.data_loader import VideoFrameStream
+
+
+def calm(action="maintain_speed", confidence=0.9):
+    return {"decision": action, "confidence": confidence, "hazards": [], "agents": []}
+
+
+@pytest.fixture
+def video_path(tmp_path):
+    """300 frames at 30 fps; frame i has intensity i % 256."""
+    path = str(tmp_path / "clip.mp4")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), 30, (32, 32))
+    for i in range(300):
+        writer.write(np.full((32, 32, 3), i % 256, dtype=np.uint8))
+    writer.release()
+    return path
+
+
+class TestVolatility:
+    def setup_method(self):
+        self.sampler = AdaptiveSampler(low_fps=1, high_fps=10, min_confidence=0.8, calm_after=2)
+
+    def test_stable_confident_decisions_go_calm(self):
+        for _ in range(2):
+            self.sampler.observe(calm())
+        assert self.sampler.state == "calm"
+        assert self.sampler.next_step(30) == 30
+
+    @pytest.mark.parametrize("decision", [
+        calm("stop"),
+        calm(confidence=0.5),
+        dict(calm(), hazards=["construction"]),
+        dict(calm(), agents=[{"type": "pedestrian", "position": "crossing"}]),
+        dict(calm(), agents=[{"type": "cyclist", "position": "left"}]),
+    ])
+    def test_triggers_jump_to_high_rate(self, decision):
+        for _ in range(3):
+            self.sampler.observe(calm())
+        self.sampler.observe(decision)
+        assert self.sampler.state == "volatile"
+        assert self.sampler.next_step(30) == 3
+
+    def test_vehicle_agent_is_not_volatile(self):
+        assert not self.sampler.is_volatile(dict(calm(), agents=[{"type": "vehicle", "position": "ahead"}]))
+
+    def test_volatile_decays_through_neutral(self):
+        self.sampler.observe(calm(confidence=0.1))
+        self.sampler.observe(calm())
+        assert self.sampler.state == "neutral"
+        assert self.sampler.next_step(30) == 9  # sqrt(1 * 10) fps
+
+    def test_invalid_rates_raise(self):
+        with pytest.raises(ValueError):
+            AdaptiveSampler(low_fps=5, high_fps=1)
+
+
+class TestBudget:
+    def test_step_is_fair_share_scaled_by_state(self):
+        sampler = AdaptiveSampler(low_fps=1, high_fps=16, calm_after=1, budget=10)
+        assert sampler.next_step(30, remaining_frames=100) == 10
+        sampler.observe(calm())
+        assert sampler.next_step(30, remaining_frames=100) == 44  # 100 / 9 * 4
+        sampler.observe(calm("stop"))
+        assert sampler.next_step(30, remaining_frames=100) == 3   # 100 / 8 / 4
+
+    def test_spent_budget_stops(self):
+        sampler = AdaptiveSampler(budget=1)
+        sampler.observe(calm())
+        assert sampler.next_step(30, remaining_frames=100) == 0
+
+    def test_needs_remaining_frames(self):
+        with pytest.raises(ValueError):
+            AdaptiveSampler(budget=5).next_step(30)
+
+
+class TestIterDecisions:
+    def test_calm_clip_uses_low_rate(self, video_path):
+        sampler = AdaptiveSampler(low_fps=1, high_fps=10, calm_after=1)
+        with VideoFrameStream(video_path) as stream:
+            indices = [i for i, _, _, _ in sampler.iter_decisions(stream, lambda frame: calm())]
+        # One neutral step (sqrt(10) fps), then one sample per second
+        assert indices[:3] == [0, 30, 60]
+        assert len(indices) == 10
+
+    def test_volatile_clip_uses_high_rate(self, video_path):
+        sampler = AdaptiveSampler(low_fps=1, high_fps=10)
+        with VideoFrameStream(video_path) as stream:
+            indices = [i for i, _, _, _ in sampler.iter_decisions(stream, lambda frame: calm(confidence=0.1))]
+        assert indices[:3] == [0, 3, 6]
+        assert len(indices) == 100
+
+    def test_frames_match_indices(self, video_path):
+        with VideoFrameStream(video_path, sample_fps=30) as stream:
+            reference = [frame for _, _, frame in stream]
+        sampler = AdaptiveSampler(low_fps=1, high_fps=10)
+        with VideoFrameStream(video_path) as stream:
+            for index, timestamp, frame, _ in sampler.iter_decisions(stream, lambda frame: calm()):
+                assert np.abs(frame.astype(int) - reference[index].astype(int)).mean() < 2.0
+                assert timestamp == pytest.approx(index / 30)
+
+    @pytest.mark.parametrize("volatile", [False, True])
+    def test_budget_is_never_exceeded(self, video_path, volatile):
+        sampler = AdaptiveSampler(low_fps=1, high_fps=10, budget=12)
+        decide = (lambda frame: calm(confidence=0.1)) if volatile else (lambda frame: calm())
+        with VideoFrameStream(video_path) as stream:
+            indices = [i for i, _, _, _ in sampler.iter_decisions(stream, decide)]
+        assert 1 < len(indices) <= 12
+        assert indices[-1] < 300
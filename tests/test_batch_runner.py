@@ -0,0 +1,93 @@
+"""
+Unit tests for the multi-clip batch runner.
+"""
+
+import json
+import os
+
+import cv2
+import numpy as np
+import pytest
+from alpamayo_demo.core.schema import validate_decision
+from alpamayo_demo.utils.batch_runner import discover_clips, run_batch, STAGES, _log_names
+
+
+def write_video(path, num_frames=6, fps=2, size=(64, 48)):
+    width, height = size
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    for i in range(num_frames):
+        writer.write(np.full((height, width, 3), 20 * i, dtype=np.uint8))
+    writer.release()
+    return str(path)
+
+
+@pytest.fixture
+def clip_dir(tmp_path):
+    clips = tmp_path / "clips"
+    clips.mkdir()
+    for name in ("a.mp4", "b.mp4", "c.mp4"):
+        write_video(clips / name)
+    (clips / "notes.txt").write_text("not a clip")
+    return clips
+
+
+class TestDiscoverClips:
+    def test_directory_lists_videos_only(self, clip_dir):
+        clips = discover_clips(str(clip_dir))
+        assert [os.path.basename(c) for c in clips] == ["a.mp4", "b.mp4", "c.mp4"]
+
+    def test_manifest_resolves_relative_paths(self, clip_dir):
+        manifest = clip_dir / "manifest.txt"
+        manifest.write_text("# nightly\nb.mp4\n\na.mp4\n")
+        clips = discover_clips(str(manifest))
+        assert clips == [str(clip_dir / "b.mp4"), str(clip_dir / "a.mp4")]
+
+    def test_missing_source_raises(self, tmp_path):
+        with pytest.raises(ValueError, match="Clip source not found"):
+            discover_clips(str(tmp_path / "nope"))
+
+
+class TestRunBatch:
+    def test_writes_one_log_per_clip(self, clip_dir, tmp_path):
+        out = tmp_path / "logs"
+        report = run_batch(discover_clips(str(clip_dir)), str(out), workers=2, sample_fps=1)
+        assert sorted(os.listdir(out)) == ["a.jsonl", "b.jsonl", "c.jsonl"]
+        assert not report.failed
+        assert report.frames == 9
+        assert report.clips_per_second > 0
+
+    def test_log_lines_are_valid_decisions(self, clip_dir, tmp_path):
+        out = tmp_path / "logs"
+        run_batch([str(clip_dir / "a.mp4")], str(out), workers=1, sample_fps=1)
+        lines = (out / "a.jsonl").read_text().splitlines()
+        decisions = [json.loads(line) for line in lines]
+        assert [d["frame_id"] for d in decisions] == [0, 1, 2]
+        assert [d["source_frame"] for d in decisions] == [0, 2, 4]
+        for d in decisions:
+            validate_decision(d)
+
+    def test_reports_stage_timings(self, clip_dir, tmp_path):
+        report = run_batch(discover_clips(str(clip_dir)), str(tmp_path / "logs"), workers=1)
+        totals = report.stage_totals()
+        assert set(totals) == set(STAGES)
+        assert totals["decide"] > 0
+        assert "clips/s" in report.summary()
+
+    def test_bad_clip_is_reported_not_raised(self, clip_dir, tmp_path):
+        clips = [str(clip_dir / "a.mp4"), str(clip_dir / "missing.mp4")]
+        report = run_batch(clips, str(tmp_path / "logs"), workers=2)
+        assert len(report.failed) == 1
+        assert "missing.mp4" in report.failed[0]["video_path"]
+
+    def test_colliding_names_get_unique_logs(self, clip_dir, tmp_path):
+        other = tmp_path / "other"
+        other.mkdir()
+        write_video(other / "a.mp4")
+        out = tmp_path / "logs"
+        run_batch([str(clip_dir / "a.mp4"), str(other / "a.mp4")], str(out), workers=1)
+        assert sorted(os.listdir(out)) == ["a.jsonl", "a_1.jsonl"]
+
+    def test_suffixes_skip_real_stems(self):
+        names = _log_names(["x/a.mp4", "x/a.avi", "x/a_1.mp4", "y/a.mp4"])
+        assert names == ["a.jsonl", "a_1.jsonl", "a_1_1.jsonl", "a_2.jsonl"]
+        assert len(set(_log_names(["a_1.mp4", "a.mp4", "a.avi"]))) == 3
@@ -0,0 +1,179 @@
+"""
+Unit tests for the content-addressed decision cache.
+"""
+
+import asyncio
+import sqlite3
+import numpy as np
+import pytest
+from alpamayo_demo.core.cache import DecisionCache, bundle_key, frame_key
+from alpamayo_demo.core.policy import AlpamayoPolicy
+
+
+GOAL_PROMPT = "Analyze the scene and decide the next action."
+
+
+def frame(value, h=48, w=64):
+    return np.full((h, w, 3), value, dtype=np.uint8)
+
+
+def decision(i):
+    return {"frame_id": 0, "decision": "stop", "confidence": 0.5, "reason": f"r{i}"}
+
+
+class TestFrameKey:
+    def test_same_inputs_same_key(self):
+        assert frame_key(frame(1), GOAL_PROMPT, "v1") == frame_key(frame(1), GOAL_PROMPT, "v1")
+
+    def test_frame_prompt_and_version_change_key(self):
+        base = frame_key(frame(1), GOAL_PROMPT, "v1")
+        assert frame_key(frame(2), GOAL_PROMPT, "v1") != base
+        assert frame_key(frame(1), "other prompt", "v1") != base
+        assert frame_key(frame(1), GOAL_PROMPT, "v2") != base
+
+    def test_shape_is_part_of_key(self):
+        flat = np.zeros((2, 6, 3), dtype=np.uint8)
+        assert frame_key(flat, "", "v") != frame_key(flat.reshape(4, 3, 3), "", "v")
+
+    def test_non_contiguous_frame(self):
+        big = np.arange(8 * 8 * 3, dtype=np.uint8).reshape(8, 8, 3)
+        view = big[::2, ::2]
+        assert frame_key(view, "", "v") == frame_key(view.copy(), "", "v")
+
+
+class TestBundleKey:
+    def test_same_bundle_same_key(self):
+        bundle = {"FRONT": frame(1), "SIDE_LEFT": frame(2)}
+        assert bundle_key(bundle, GOAL_PROMPT, "v1") == bundle_key(dict(bundle), GOAL_PROMPT, "v1")
+
+    def test_frames_and_cameras_change_key(self):
+        base = bundle_key({"FRONT": frame(1), "SIDE_LEFT": frame(2)}, GOAL_PROMPT, "v1")
+        assert bundle_key({"FRONT": frame(1), "SIDE_LEFT": frame(3)}, GOAL_PROMPT, "v1") != base
+        assert bundle_key({"FRONT": frame(1), "SIDE_RIGHT": frame(2)}, GOAL_PROMPT, "v1") != base
+        assert bundle_key({"FRONT": frame(1), "SIDE_LEFT": frame(2)}, GOAL_PROMPT, "v2") != base
+
+    def test_single_camera_bundle_differs_from_frame(self):
+        assert bundle_key({"FRONT": frame(1)}, GOAL_PROMPT, "v1") != frame_key(frame(1), GOAL_PROMPT, "v1")
+
+
+class TestDecisionCache:
+    def test_miss_then_hit(self):
+        cache = DecisionCache(":memory:")
+        assert cache.get(b"k") is None
+        cache.put(b"k", decision(1))
+        assert cache.get(b"k") == decision(1)
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert cache.hit_rate == 0.5
+
+    def test_returns_fresh_copies(self):
+        cache = DecisionCache(":memory:")
+        cache.put(b"k", decision(1))
+        cache.get(b"k")["decision"] = "accelerate"
+        assert cache.get(b"k")["decision"] == "stop"
+
+    def test_evicts_least_recently_used(self):
+        cache = DecisionCache(":memory:", max_entries=2)
+        cache.put(b"a", decision(1))
+        cache.put(b"b", decision(2))
+        cache.get(b"a")
+        cache.put(b"c", decision(3))
+        assert len(cache) == 2
+        assert cache.get(b"b") is None
+        assert cache.get(b"a") is not None
+        assert cache.get(b"c") is not None
+
+    def test_evicts_in_batches_to_ninety_percent(self):
+        cache = DecisionCache(":memory:", max_entries=20)
+        cache.put_many([(bytes([i]), decision(i)) for i in range(20)])
+        assert len(cache) == 20
+        cache.put(b"new", decision(20))
+        assert len(cache) == 18
+        assert cache.get_many([b"\x00", b"\x01", b"\x02", b"\x03", b"new"]) == [
+            None, None, None, decision(3), decision(20)]
+
+    def test_counts_rows_of_an_existing_file(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite")
+        db = sqlite3.connect(path)
+        db.execute("CREATE TABLE decisions (key BLOB PRIMARY KEY, value TEXT NOT NULL, last_used INTEGER NOT NULL)")
+        db.executemany("INSERT INTO decisions VALUES (?, '{}', ?)", [(bytes([i]), i) for i in range(5)])
+        db.commit()
+        db.close()
+        with DecisionCache(path) as cache:
+            assert len(cache) == 5
+            cache.put(b"k", decision(1))
+            assert len(cache) == 6
+
+    def test_get_many_preserves_order(self):
+        cache = DecisionCache(":memory:")
+        cache.put_many([(b"a", decision(1)), (b"c", decision(3))])
+        assert cache.get_many([b"c", b"b", b"a"]) == [decision(3), None, decision(1)]
+
+    def test_persists_to_disk(self, tmp_path):
+        path = str(tmp_path / "sub" / "cache.sqlite")
+        with DecisionCache(path) as cache:
+            cache.put(b"k", decision(1))
+        with DecisionCache(path) as cache:
+            assert len(cache) == 1
+            assert cache.get(b"k") == decision(1)
+
+    def test_shared_file_across_connections(self, tmp_path):
+        # Two connections stand in for two processes sharing the file
+        path = str(tmp_path / "cache.sqlite")
+        with DecisionCache(path, max_entries=3) as first, DecisionCache(path, max_entries=3) as second:
+            first.put_many([(b"a", decision(1)), (b"b", decision(2))])
+            second.put_many([(b"c", decision(3)), (b"d", decision(4))])
+            assert len(first) == len(second) == 3
+            # Recency continues from the other connection's writes
+            first.get(b"b")
+            second.put(b"e", decision(5))
+            assert first.get_many([b"a", b"b", b"c", b"d", b"e"]) == [
+                None, decision(2), None, decision(4), decision(5)]
+
+    def test_clear(self):
+        cache = DecisionCache(":memory:")
+        cache.put(b"k", decision(1))
+        cache.clear()
+        assert len(cache) == 0 and cache.get(b"k") is None
+
+    def test_invalid_max_entries_raises(self):
+        with pytest.raises(ValueError):
+            DecisionCache(":memory:", max_entries=0)
+
+
+class TestPolicyWithCache:
+    def test_rerun_is_served_from_cache(self):
+        policy = AlpamayoPolicy(mock=True, cache=DecisionCache(":memory:"))
+        frames = [frame(i) for i in range(5)]
+        first = policy.decide_batch(frames, GOAL_PROMPT, output="dict")
+        second = policy.decide_batch(frames, GOAL_PROMPT, output="dict")
+        assert first == second
+        assert policy.cache.hits == 5
+
+    def test_only_misses_reach_the_model(self):
+        policy = AlpamayoPolicy(mock=True, max_batch_size=8, cache=DecisionCache(":memory:"))
+        policy.decide(frame(1), GOAL_PROMPT)
+        calls = []
+        original = policy._mock_decide_batch
+        policy._mock_decide_batch = lambda frames, prompt: calls.append(len(frames)) or original(frames, prompt)
+        policy.decide_batch([frame(1), frame(2), frame(3)], GOAL_PROMPT)
+        assert calls == [2]
+
+    def test_decide_returns_cached_decision(self):
+        policy = AlpamayoPolicy(mock=True, cache=DecisionCache(":memory:"))
+        assert policy.decide(frame(7), GOAL_PROMPT) == policy.decide(frame(7), GOAL_PROMPT)
+
+    def test_adecide_uses_cache(self):
+        policy = AlpamayoPolicy(mock=True, cache=DecisionCache(":memory:"))
+        first = asyncio.run(policy.adecide(frame(3), GOAL_PROMPT, output="dict"))
+        assert asyncio.run(policy.adecide(frame(3), GOAL_PROMPT, output="dict")) == first
+        assert policy.cache.hits == 1
+
+    def test_version_separates_mock_and_real(self):
+        assert AlpamayoPolicy(mock=True).version != AlpamayoPolicy(mock=False).version
+
+    def test_decide_bundle_uses_cache(self):
+        policy = AlpamayoPolicy(mock=True, cache=DecisionCache(":memory:"))
+        bundle = {"FRONT": frame(4), "SIDE_LEFT": frame(5)}
+        first = policy.decide_bundle(bundle, GOAL_PROMPT, output="dict")
+        assert policy.decide_bundle(bundle, GOAL_PROMPT, output="dict") == first
+        assert policy.cache.hits == 1
@@ -0,0 +1,74 @@
+"""
+Unit tests for the Streamlit app's clip analysis generator.
+"""
+
+import threading
+import time
+
+import cv2
+import numpy as np
+import pytest
+from alpamayo_demo.core.policy import AlpamayoPolicy
+from alpamayo_demo.utils.adaptive_sampling import AdaptiveSampler
+from alpamayo_demo.utils.clip_analysis import analyze_clip
+from alpamayo_demo.utils.data_loader import VideoFrameStream
+from alpamayo_demo.utils.pipeline import BackgroundWorker
+
+
+GOAL_PROMPT = "Analyze the scene and decide the next action."
+
+
+def write_video(path, num_frames=30, fps=10, size=(64, 48)):
+    width, height = size
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    for i in range(num_frames):
+        writer.write(np.full((height, width, 3), (8 * i) % 256, dtype=np.uint8))
+    writer.release()
+    return str(path)
+
+
+@pytest.fixture
+def video_path(tmp_path):
+    return write_video(tmp_path / "clip.mp4")
+
+
+def prefetch_threads():
+    return [t for t in threading.enumerate() if t.name == "prefetch" and t.is_alive()]
+
+
+class FailingPolicy:
+    def decide(self, frame, prompt, output="json"):
+        raise RuntimeError("model down")
+
+
+class TestAnalyzeClip:
+    def test_yields_one_entry_per_sampled_frame(self, video_path):
+        stream = VideoFrameStream(video_path, sample_fps=5, buffer_size=6)
+        entries = list(analyze_clip(stream, AlpamayoPolicy(mock=True), GOAL_PROMPT))
+        assert [e["frame_count"] for e in entries] == list(range(0, 30, 2))
+        assert [e["decision"]["frame_id"] for e in entries] == list(range(1, 16))
+        assert all(e["thumbnail"][:2] == b"\xff\xd8" for e in entries)
+
+    def test_failed_decisions_become_error_entries(self, video_path):
+        stream = VideoFrameStream(video_path, sample_fps=1)
+        entries = list(analyze_clip(stream, FailingPolicy(), GOAL_PROMPT))
+        assert entries and all(e["decision"] == {"error": "model down"} for e in entries)
+
+    def test_stopping_worker_releases_prefetch_and_stream(self, video_path):
+        baseline = len(prefetch_threads())
+        for _ in range(2):
+            stream = VideoFrameStream(video_path, sample_fps=10, buffer_size=6)
+            worker = BackgroundWorker(analyze_clip(stream, AlpamayoPolicy(mock=True), GOAL_PROMPT)).start()
+            while not len(worker) and not worker.done:
+                time.sleep(0.01)
+            worker.stop(timeout=5)
+            assert worker.done and not worker.completed
+            assert not stream.cap.isOpened()
+        assert len(prefetch_threads()) == baseline
+
+    def test_closing_sampled_analysis_releases_stream(self, video_path):
+        stream = VideoFrameStream(video_path)
+        analysis = analyze_clip(stream, AlpamayoPolicy(mock=True), GOAL_PROMPT, sampler=AdaptiveSampler(1.0, 10.0))
+        next(analysis)
+        analysis.close()
+        assert not stream.cap.isOpened()
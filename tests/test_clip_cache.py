@@ -0,0 +1,79 @@
+"""
+Unit tests for per-clip analysis caching helpers.
+"""
+
+import numpy as np
+import pytest
+from alpamayo_demo.utils.clip_cache import (
+    ClipResultStore,
+    clip_key,
+    decode_thumbnail,
+    encode_thumbnail,
+    file_digest,
+)
+
+
+class TestFileDigest:
+    def test_same_content_same_digest(self, tmp_path):
+        a, b = tmp_path / "a.bin", tmp_path / "b.bin"
+        a.write_bytes(b"x" * 5000)
+        b.write_bytes(b"x" * 5000)
+        assert file_digest(str(a), chunk_size=1024) == file_digest(str(b))
+
+    def test_content_change_changes_digest(self, tmp_path):
+        a = tmp_path / "a.bin"
+        a.write_bytes(b"x" * 5000)
+        before = file_digest(str(a))
+        a.write_bytes(b"x" * 4999 + b"y")
+        assert file_digest(str(a)) != before
+
+
+class TestClipKey:
+    def test_settings_order_does_not_matter(self):
+        assert clip_key("d", "mock-1", fps=1, adaptive=False) == clip_key("d", "mock-1", adaptive=False, fps=1)
+
+    def test_each_component_changes_key(self):
+        base = clip_key("d", "mock-1", fps=1)
+        assert clip_key("e", "mock-1", fps=1) != base
+        assert clip_key("d", "alpamayo-r1-1", fps=1) != base
+        assert clip_key("d", "mock-1", fps=2) != base
+
+
+class TestThumbnails:
+    def test_downscales_and_round_trips(self):
+        frame = np.full((720, 1280, 3), (10, 120, 230), dtype=np.uint8)
+        data = encode_thumbnail(frame, max_width=320)
+        assert data[:2] == b"\xff\xd8"
+        thumb = decode_thumbnail(data)
+        assert thumb.shape == (180, 320, 3)
+        assert np.abs(thumb.astype(int) - (10, 120, 230)).max() < 6
+
+    def test_small_frames_are_not_upscaled(self):
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        assert decode_thumbnail(encode_thumbnail(frame, max_width=640)).shape == (48, 64, 3)
+
+    def test_much_smaller_than_raw_frame(self):
+        frame = np.random.default_rng(0).integers(0, 255, (1080, 1920, 3), dtype=np.uint8)
+        assert len(encode_thumbnail(frame)) < frame.nbytes / 20
+
+
+class TestClipResultStore:
+    def test_get_put(self):
+        store = ClipResultStore()
+        assert store.get("k") is None
+        store.put("k", [1, 2, 3])
+        assert store.get("k") == [1, 2, 3]
+        assert "k" in store
+
+    def test_evicts_least_recently_used(self):
+        store = ClipResultStore(max_clips=2)
+        store.put("a", [1])
+        store.put("b", [2])
+        store.get("a")
+        store.put("c", [3])
+        assert len(store) == 2
+        assert "b" not in store and "a" in store and "c" in store
+
+    def test_invalid_size_raises(self):
+        with pytest.raises(ValueError):
+            ClipResultStore(max_clips=0)
@@ -0,0 +1,148 @@
+"""
+Unit tests for columnar bulk validation of decision logs.
+"""
+
+import numpy as np
+import pytest
+from alpamayo_demo.core.columnar import (
+    DecisionColumns,
+    validate_columns,
+    validate_decisions_columnar,
+    describe_errors,
+    SCENE_TYPES,
+    ERR_MISSING_FIELD,
+    ERR_FRAME_ID,
+    ERR_SCENE_TYPE,
+    ERR_TRAFFIC_LIGHT,
+    ERR_DECISION,
+    ERR_CONFIDENCE,
+    ERR_AGENTS,
+    ERR_AGENT_TYPE,
+    ERR_AGENT_POSITION,
+    ERR_HAZARDS,
+    ERR_REASON,
+    ERR_AGENT_KINEMATICS,
+    ERR_NOT_OBJECT,
+)
+from alpamayo_demo.core.schema import Decision, validate_decision
+
+
+def make_valid_decision(**overrides):
+    base = {
+        "frame_id": 0,
+        "scene_type": "intersection",
+        "agents": [{"type": "vehicle", "position": "ahead"}],
+        "traffic_light": "green",
+        "hazards": [],
+        "decision": "maintain_speed",
+        "confidence": 0.85,
+        "reason": "Clear road ahead.",
+    }
+    base.update(overrides)
+    return base
+
+
+class TestDecisionColumns:
+    def test_columns_have_expected_dtypes(self):
+        cols = DecisionColumns([make_valid_decision(), make_valid_decision(scene_type="crosswalk")])
+        assert cols.scene_type.dtype == np.int8
+        assert cols.confidence.dtype == np.float32
+        assert cols.agent_count.dtype == np.int32
+        assert list(cols.scene_type) == [SCENE_TYPES.index("intersection"), SCENE_TYPES.index("crosswalk")]
+
+    def test_agents_are_flattened(self):
+        agents = [{"type": "pedestrian", "position": "crossing"}, {"type": "cyclist", "position": "left"}]
+        cols = DecisionColumns([make_valid_decision(agents=[]), make_valid_decision(agents=agents)])
+        assert list(cols.agent_count) == [0, 2]
+        assert list(cols.agent_offsets) == [0, 0, 2]
+        assert len(cols.agent_type) == 2
+
+    def test_accepts_decision_objects(self):
+        cols = DecisionColumns([Decision.from_dict(make_valid_decision())])
+        assert len(cols) == 1
+
+
+class TestValidateColumnar:
+    def test_valid_rows_have_zero_mask(self):
+        errors = validate_decisions_columnar([make_valid_decision(frame_id=i) for i in range(100)])
+        assert errors.dtype == np.uint16
+        assert not errors.any()
+
+    def test_empty_log(self):
+        assert len(validate_decisions_columnar([])) == 0
+
+    @pytest.mark.parametrize("overrides, flag", [
+        ({"scene_type": "highway"}, ERR_SCENE_TYPE),
+        ({"traffic_light": "purple"}, ERR_TRAFFIC_LIGHT),
+        ({"decision": "fly"}, ERR_DECISION),
+        ({"confidence": 1.01}, ERR_CONFIDENCE),
+        ({"confidence": -0.5}, ERR_CONFIDENCE),
+        ({"confidence": "high"}, ERR_CONFIDENCE),
+        ({"frame_id": "3"}, ERR_FRAME_ID),
+        ({"frame_id": 10**20}, ERR_FRAME_ID),
+        ({"agents": "none"}, ERR_AGENTS),
+        ({"agents": [{"type": "drone", "position": "ahead"}]}, ERR_AGENT_TYPE),
+        ({"agents": [{"type": "vehicle", "position": "behind"}]}, ERR_AGENT_POSITION),
+        ({"hazards": ["weather", 3]}, ERR_HAZARDS),
+        ({"reason": None}, ERR_REASON),
+        ({"scene_type": ["list"]}, ERR_SCENE_TYPE),
+        ({"agents": [{"type": "vehicle", "position": "ahead", "distance": -5.0}]}, ERR_AGENT_KINEMATICS),
+        ({"agents": [{"type": "vehicle", "position": "ahead", "speed": "fast"}]}, ERR_AGENT_KINEMATICS),
+        ({"agents": [{"type": "vehicle", "position": "ahead", "speed": True}]}, ERR_AGENT_KINEMATICS),
+        ({"agents": [{"type": "vehicle", "position": "ahead", "distance": float("nan")}]},
+         ERR_AGENT_KINEMATICS),
+    ])
+    def test_single_error_flag(self, overrides, flag):
+        errors = validate_decisions_columnar([make_valid_decision(), make_valid_decision(**overrides)])
+        assert errors[0] == 0
+        assert errors[1] == flag
+
+    def test_missing_field_flag(self):
+        d = make_valid_decision()
+        del d["confidence"]
+        errors = validate_decisions_columnar([d])
+        assert errors[0] == ERR_MISSING_FIELD
+
+    def test_non_object_rows_are_flagged(self):
+        rows = [make_valid_decision(), ["not", "a", "dict"], "stop", None]
+        errors = validate_decisions_columnar(rows)
+        assert list(errors) == [0, ERR_NOT_OBJECT, ERR_NOT_OBJECT, ERR_NOT_OBJECT]
+        assert describe_errors(errors[3]) == ["not_object"]
+
+    def test_multiple_errors_in_one_row(self):
+        errors = validate_decisions_columnar([make_valid_decision(scene_type="x", confidence=2.0)])
+        assert errors[0] == ERR_SCENE_TYPE | ERR_CONFIDENCE
+        assert describe_errors(errors[0]) == ["scene_type", "confidence"]
+
+    def test_agent_errors_map_to_owning_row(self):
+        rows = [
+            make_valid_decision(agents=[]),
+            make_valid_decision(agents=[{"type": "vehicle", "position": "ahead"}] * 3),
+            make_valid_decision(agents=[{"type": "vehicle", "position": "ahead"},
+                                        {"type": "ufo", "position": "ahead"}]),
+        ]
+        errors = validate_decisions_columnar(rows)
+        assert list(errors) == [0, 0, ERR_AGENT_TYPE]
+
+    def test_agrees_with_row_validator(self):
+        rows = [
+            make_valid_decision(),
+            make_valid_decision(decision="teleport"),
+            make_valid_decision(confidence=0.0),
+            make_valid_decision(agents=[{"type": "cyclist", "position": "nowhere"}]),
+            make_valid_decision(agents=[{"type": "vehicle", "position": "ahead", "distance": 12, "speed": -1.5}]),
+            make_valid_decision(agents=[{"type": "vehicle", "position": "ahead", "distance": 0.0}]),
+            make_valid_decision(agents=[{"type": "vehicle", "position": "ahead", "distance": -5.0}]),
+            make_valid_decision(agents=[{"type": "vehicle", "position": "ahead", "speed": "fast"}]),
+            make_valid_decision(agents=[{"type": "vehicle", "position": "ahead", "speed": True}]),
+            make_valid_decision(frame_id=2**63 - 1),
+            make_valid_decision(frame_id=10**20),
+        ]
+        errors = validate_columns(DecisionColumns(rows))
+        for row, mask in zip(rows, errors):
+            try:
+                validate_decision(row)
+                row_valid = True
+            except ValueError:
+                row_valid = False
+            assert row_valid == (mask == 0)
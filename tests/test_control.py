@@ -0,0 +1,102 @@
+"""
+Unit tests for the vectorized PID controller bank.
+"""
+
+import numpy as np
+import pytest
+from alpamayo_demo.core.columnar import ACTIONS
+from alpamayo_demo.physics.control import (
+    CODE_UNKNOWN,
+    PIDControllerBank,
+    encode_actions,
+    replay_speed_profiles,
+)
+from alpamayo_demo.physics.math_foundations import pid_control
+
+
+class TestEncodeActions:
+    def test_codes_index_actions(self):
+        codes = encode_actions([["brake", "accelerate"], ["stop", "fly"]])
+        assert codes.dtype == np.int8 and codes.shape == (2, 2)
+        assert ACTIONS[codes[0, 0]] == "brake" and ACTIONS[codes[0, 1]] == "accelerate"
+        assert codes[1, 1] == CODE_UNKNOWN
+
+
+class TestPIDControllerBank:
+    def test_matches_scalar_pid_while_unsaturated(self):
+        bank = PIDControllerBank(3, kp=0.5, ki=0.2, kd=0.1, dt=0.1, max_accel=1e9, max_decel=1e9)
+        bank.set_targets([10.0, 5.0, 0.0])
+        bank.prev_err[:] = 0.0  # match the Julia convention of a zero previous error
+        rng = np.random.default_rng(0)
+        integral = prev = np.zeros(3)
+        for _ in range(20):
+            speeds = rng.uniform(0, 12, 3)
+            expected, integral, prev = pid_control(bank.target, speeds, 0.5, 0.2, 0.1, integral, prev, 0.1)
+            np.testing.assert_allclose(bank.step(speeds), expected, rtol=1e-12)
+
+    def test_commands_are_clipped(self):
+        bank = PIDControllerBank(2, max_accel=3.0, max_decel=6.0)
+        bank.set_targets([100.0, 0.0])
+        assert bank.step(np.array([0.0, 100.0])).tolist() == [3.0, -6.0]
+
+    def test_no_derivative_kick_after_reset(self):
+        bank = PIDControllerBank(1, kp=1.0, ki=0.0, kd=10.0)
+        bank.set_targets(5.0)
+        assert bank.step(np.zeros(1))[0] == pytest.approx(min(5.0, bank.max_accel))
+        bank.reset()
+        assert np.isnan(bank.prev_err).all()
+
+    def test_integral_frozen_while_saturated(self):
+        bank = PIDControllerBank(1, max_accel=1.0)
+        bank.set_targets(50.0)
+        for _ in range(100):
+            bank.step(np.zeros(1))
+        assert bank.integral_err[0] == 0.0
+
+    def test_actions_never_oppose_the_decision(self):
+        bank = PIDControllerBank(4)
+        codes = encode_actions(["slow_down", "slow_down", "accelerate", "maintain_speed"])
+        bank.set_actions(codes, np.array([12.0, 2.0, 20.0, 7.5]))
+        assert bank.target.tolist() == [6.0, 2.0, 20.0, 7.5]
+
+    def test_masked_update(self):
+        bank = PIDControllerBank(3)
+        bank.set_actions(encode_actions(["brake"] * 3), np.full(3, 10.0), mask=np.array([True, False, True]))
+        assert bank.target.tolist() == [0.0, 0.0, 0.0]
+        bank.set_targets(np.array([1.0, 2.0, 3.0]), mask=np.array([False, True, False]))
+        assert bank.target.tolist() == [0.0, 2.0, 0.0]
+
+    def test_invalid_arguments_raise(self):
+        with pytest.raises(ValueError):
+            PIDControllerBank(0)
+        with pytest.raises(ValueError):
+            PIDControllerBank(1, dt=0.0)
+
+
+class TestReplaySpeedProfiles:
+    def test_decisions_shape_the_speed(self):
+        actions = [["accelerate"] * 10 + ["brake"] * 10]
+        speeds = replay_speed_profiles(actions, steps_per_decision=10)
+        assert speeds.shape == (1, 201)
+        peak = speeds[0, 100]
+        assert 12.0 < peak < 15.0
+        assert speeds[0, -1] == pytest.approx(0.0, abs=0.2)
+        assert (speeds >= 0).all()
+
+    def test_maintain_holds_speed(self):
+        speeds = replay_speed_profiles([["maintain_speed"] * 20], initial_speed=8.0)
+        np.testing.assert_allclose(speeds, 8.0)
+
+    def test_fleet_replay_matches_vehicles_replayed_alone(self):
+        rng = np.random.default_rng(2)
+        codes = rng.integers(0, len(ACTIONS), (10_000, 100)).astype(np.int8)
+        speeds = replay_speed_profiles(codes, initial_speed=10.0)
+        assert speeds.shape == (10_000, 101)
+        assert (speeds >= 0).all()
+        for n in range(0, 10_000, 997):
+            alone = replay_speed_profiles(codes[n:n + 1], initial_speed=10.0)
+            np.testing.assert_array_equal(speeds[n], alone[0])
+
+    def test_bank_size_must_match(self):
+        with pytest.raises(ValueError):
+            replay_speed_profiles([["stop"]], bank=PIDControllerBank(2))
@@ -0,0 +1,179 @@
+"""
+Unit tests for the frame data loader.
+
+Videos are generated on the fly into pytest's tmp_path so no sample
+data is required.
+"""
+
+import cv2
+import numpy as np
+import pytest
+from alpamayo_demo.utils.data_loader import (
+    FrameRing,
+    VideoFrameStream,
+    iter_video_frames,
+    load_video_frames,
+)
+
+
+def write_video(path, num_frames=30, fps=10, size=(64, 48)):
+    """Write a tiny video whose frame i is filled with intensity 8 * i."""
+    width, height = size
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    for i in range(num_frames):
+        writer.write(np.full((height, width, 3), (8 * i) % 256, dtype=np.uint8))
+    writer.release()
+    return str(path)
+
+
+@pytest.fixture
+def video_path(tmp_path):
+    return write_video(tmp_path / "clip.mp4")
+
+
+# --- FrameRing Tests ---
+
+class TestFrameRing:
+    def test_buffers_are_reused_round_robin(self):
+        ring = FrameRing(2)
+        a = ring.next_buffer((4, 4, 3))
+        b = ring.next_buffer((4, 4, 3))
+        assert a is not b
+        assert ring.next_buffer((4, 4, 3)) is a
+        assert ring.next_buffer((4, 4, 3)) is b
+
+    def test_reallocates_on_shape_change(self):
+        ring = FrameRing(1)
+        a = ring.next_buffer((4, 4, 3))
+        b = ring.next_buffer((8, 8, 3))
+        assert b.shape == (8, 8, 3)
+        assert a is not b
+
+    def test_zero_size_raises(self):
+        with pytest.raises(ValueError):
+            FrameRing(0)
+
+
+# --- Streaming Tests ---
+
+class TestIterVideoFrames:
+    def test_yields_index_timestamp_frame(self, video_path):
+        items = list(iter_video_frames(video_path, sample_fps=10))
+        assert len(items) == 30
+        index, timestamp, frame = items[3]
+        assert index == 3
+        assert timestamp == pytest.approx(0.3)
+        assert frame.shape == (48, 64, 3)
+
+    def test_samples_at_requested_fps(self, video_path):
+        indices = [i for i, _, _ in iter_video_frames(video_path, sample_fps=2)]
+        assert indices == [0, 5, 10, 15, 20, 25]
+
+    def test_is_lazy(self, video_path):
+        gen = iter_video_frames(video_path, sample_fps=10)
+        first = next(gen)
+        assert first[0] == 0
+        gen.close()
+
+    def test_ring_buffer_reuses_memory(self, video_path):
+        frames = [f for _, _, f in iter_video_frames(video_path, sample_fps=10, buffer_size=3)]
+        assert len({id(f) for f in frames}) == 3
+
+    def test_ring_buffer_matches_fresh_decode(self, video_path):
+        fresh = [f.copy() for _, _, f in iter_video_frames(video_path, sample_fps=10)]
+        ringed = [f.copy() for _, _, f in iter_video_frames(video_path, sample_fps=10, buffer_size=2)]
+        assert all(np.array_equal(a, b) for a, b in zip(fresh, ringed))
+
+    def test_missing_file_raises(self, tmp_path):
+        with pytest.raises(ValueError, match="Could not open video file"):
+            list(iter_video_frames(str(tmp_path / "missing.mp4")))
+
+
+class TestVideoFrameStream:
+    def test_exposes_metadata(self, video_path):
+        with VideoFrameStream(video_path, sample_fps=5) as stream:
+            assert stream.fps == pytest.approx(10)
+            assert stream.total_frames == 30
+            assert stream.sample_interval == 2
+
+
+class TestLoadVideoFrames:
+    def test_returns_frames_and_fps(self, video_path):
+        frames, fps = load_video_frames(video_path, sample_fps=5)
+        assert len(frames) == 15
+        assert fps == pytest.approx(10)
+
+
+class TestSamplingModes:
+    @pytest.mark.parametrize("mode", ["read", "grab", "seek"])
+    def test_modes_sample_same_indices(self, video_path, mode):
+        indices = [i for i, _, _ in iter_video_frames(video_path, sample_fps=3, mode=mode)]
+        assert indices == [0, 3, 6, 9, 12, 15, 18, 21, 24, 27]
+
+    @pytest.mark.parametrize("mode", ["grab", "seek"])
+    def test_modes_decode_same_pixels(self, video_path, mode):
+        reference = [f for _, _, f in iter_video_frames(video_path, sample_fps=2, mode="read")]
+        frames = [f for _, _, f in iter_video_frames(video_path, sample_fps=2, mode=mode)]
+        assert len(frames) == len(reference)
+        for a, b in zip(reference, frames):
+            assert np.abs(a.astype(int) - b.astype(int)).mean() < 2.0
+
+    @pytest.mark.parametrize("mode", ["read", "grab", "seek"])
+    def test_stats_count_sampled_and_skipped(self, video_path, mode):
+        stream = VideoFrameStream(video_path, sample_fps=2, mode=mode)
+        list(stream)
+        assert stream.stats.sampled == 6
+        assert stream.stats.skipped == 24
+        assert stream.stats.capture_seconds > 0.0
+
+    def test_read_mode_skips_do_not_use_ring_slots(self, video_path):
+        # sample_fps=2 over 10 fps skips 4 frames between samples
+        frames = iter(iter_video_frames(video_path, sample_fps=2, buffer_size=2, mode="read"))
+        _, _, first = next(frames)
+        held = first.copy()
+        next(frames)
+        np.testing.assert_array_equal(first, held)
+
+    def test_invalid_mode_raises(self, video_path):
+        with pytest.raises(ValueError, match="Invalid sampling mode"):
+            VideoFrameStream(video_path, mode="teleport")
+
+
+class TestReadAt:
+    @pytest.fixture
+    def reference(self, video_path):
+        return [f for _, _, f in iter_video_frames(video_path, sample_fps=10, mode="read")]
+
+    @pytest.mark.parametrize("mode", ["read", "grab", "seek"])
+    def test_reads_requested_frames(self, video_path, reference, mode):
+        with VideoFrameStream(video_path, mode=mode) as stream:
+            for index in (0, 1, 5, 12, 29):
+                ok, frame = stream.read_at(index)
+                assert ok
+                assert np.abs(frame.astype(int) - reference[index].astype(int)).mean() < 2.0
+            assert stream.stats.sampled == 5
+            assert stream.stats.skipped == 25
+
+    def test_backwards_seeks(self, video_path, reference):
+        with VideoFrameStream(video_path) as stream:
+            stream.read_at(20)
+            ok, frame = stream.read_at(4)
+            assert ok
+            assert np.abs(frame.astype(int) - reference[4].astype(int)).mean() < 2.0
+
+    @pytest.mark.parametrize("mode", ["read", "grab", "seek"])
+    def test_held_frames_survive_gaps(self, video_path, mode):
+        buffer_size = 3
+        with VideoFrameStream(video_path, buffer_size=buffer_size, mode=mode) as stream:
+            held = []
+            for index in (0, 7, 15, 23):
+                ok, frame = stream.read_at(index)
+                assert ok
+                held = (held + [(frame, frame.copy())])[-(buffer_size - 1):]
+                for frame, snapshot in held:
+                    np.testing.assert_array_equal(frame, snapshot)
+
+    def test_past_end_fails(self, video_path):
+        with VideoFrameStream(video_path) as stream:
+            ok, frame = stream.read_at(40)
+            assert not ok and frame is None
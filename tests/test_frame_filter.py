@@ -0,0 +1,116 @@
+"""
+Unit tests for near-duplicate frame skipping.
+"""
+
+import numpy as np
+import pytest
+from alpamayo_demo.core.policy import AlpamayoPolicy
+from alpamayo_demo.utils.frame_filter import (
+    DuplicateFrameSkipper,
+    frame_signature,
+    signature_distance,
+)
+
+
+GOAL_PROMPT = "Analyze the scene and decide the next action."
+
+
+def scene(seed, h=120, w=160):
+    """Blocky random scene with structure that survives downsampling."""
+    blocks = np.random.default_rng(seed).integers(0, 255, (4, 4, 3), dtype=np.uint8)
+    return np.kron(blocks, np.ones((h // 4, w // 4, 1), dtype=np.uint8))
+
+
+def noisy(frame, amplitude=3, seed=0):
+    noise = np.random.default_rng(seed).integers(-amplitude, amplitude + 1, frame.shape)
+    return np.clip(frame.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+
+
+class CountingPolicy(AlpamayoPolicy):
+    def __init__(self):
+        super().__init__(mock=True)
+        self.calls = []
+
+    def _mock_decide_batch(self, frames, prompt):
+        self.calls.append(len(frames))
+        return [self.mock_response(frame, prompt) for frame in frames]
+
+
+class TestSignature:
+    def test_shape_and_dtype(self):
+        signature = frame_signature(scene(0), size=16)
+        assert signature.shape[:2] == (16, 16)
+        assert signature.dtype == np.float32
+
+    def test_keeps_color_channels(self):
+        assert frame_signature(scene(0), size=16).shape == (16, 16, 3)
+
+    def test_grayscale_input(self):
+        assert frame_signature(scene(0)[:, :, 0]).shape == (16, 16)
+
+    def test_noise_is_close_scene_change_is_far(self):
+        base = frame_signature(scene(0))
+        assert signature_distance(base, frame_signature(noisy(scene(0)))) <= 1.0
+        assert signature_distance(base, frame_signature(scene(1))) > 10.0
+
+    def test_small_local_change_is_far(self):
+        frame = scene(0)
+        changed = frame.copy()
+        # A "pedestrian" covering a quarter of one signature cell
+        changed[:4, :5] = (0, 0, 255)
+        assert signature_distance(frame_signature(frame), frame_signature(changed)) > 10.0
+
+
+class TestDuplicateFrameSkipper:
+    def test_first_frame_is_never_duplicate(self):
+        assert not DuplicateFrameSkipper().is_duplicate(scene(0))
+
+    def test_near_identical_frames_are_skipped(self):
+        skipper = DuplicateFrameSkipper(threshold=2.0)
+        flags = [skipper.is_duplicate(noisy(scene(0), seed=i)) for i in range(5)]
+        assert flags == [False, True, True, True, True]
+        assert skipper.skipped == 4 and skipper.decided == 1
+
+    def test_compares_against_last_decided_frame(self):
+        skipper = DuplicateFrameSkipper(threshold=2.0)
+        base = scene(0).astype(np.int16)
+        # Each step brightens by 1.5 gray levels: under the threshold step to
+        # step, but drifts past it relative to the anchor
+        flags = [skipper.is_duplicate(np.clip(base + int(1.5 * i), 0, 255).astype(np.uint8)) for i in range(4)]
+        assert flags == [False, True, False, True]
+
+    def test_max_skip_forces_fresh_decision(self):
+        skipper = DuplicateFrameSkipper(threshold=2.0, max_skip=2)
+        flags = [skipper.is_duplicate(scene(0)) for _ in range(6)]
+        assert flags == [False, True, True, False, True, True]
+
+    def test_resolution_change_is_not_duplicate(self):
+        skipper = DuplicateFrameSkipper(size=16)
+        skipper.is_duplicate(scene(0))
+        skipper.size = 8
+        assert not skipper.is_duplicate(scene(0))
+
+    def test_negative_threshold_raises(self):
+        with pytest.raises(ValueError):
+            DuplicateFrameSkipper(threshold=-1)
+
+
+class TestDecideBatch:
+    def test_only_fresh_frames_reach_policy(self):
+        policy = CountingPolicy()
+        skipper = DuplicateFrameSkipper()
+        frames = [scene(0), noisy(scene(0)), scene(1), noisy(scene(1), seed=2)]
+        decisions = skipper.decide_batch(policy, frames, GOAL_PROMPT)
+        assert policy.calls == [2]
+        assert len(decisions) == 4
+        assert decisions[1] == decisions[0] and decisions[1] is not decisions[0]
+        assert decisions[3] == decisions[2]
+
+    def test_reuse_carries_across_batches(self):
+        policy = CountingPolicy()
+        skipper = DuplicateFrameSkipper()
+        first = skipper.decide(policy, scene(0), GOAL_PROMPT)
+        second = skipper.decide(policy, noisy(scene(0)), GOAL_PROMPT)
+        assert second == first
+        assert policy.calls == [1]
+        assert skipper.skip_ratio == 0.5
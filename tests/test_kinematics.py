@@ -0,0 +1,100 @@
+"""
+Unit tests for the vectorized kinematic bicycle model.
+"""
+
+import math
+
+import numpy as np
+import pytest
+from alpamayo_demo.physics.kinematics import (
+    DT,
+    WHEELBASE,
+    control_grid,
+    kinematic_bicycle_step,
+    rollout,
+)
+
+
+def scalar_step(x, y, theta, v, delta, wheelbase, dt):
+    # Line-for-line transcription of the Julia reference with math.*
+    dx = v * math.cos(theta)
+    dy = v * math.sin(theta)
+    dtheta = (v / wheelbase) * math.tan(delta)
+    return x + dx * dt, y + dy * dt, theta + dtheta * dt
+
+
+def scalar_rollout(steering, speed, x, y, theta, wheelbase=WHEELBASE, dt=DT):
+    xs, ys, thetas = [x], [y], [theta]
+    for delta, v in zip(steering, speed):
+        x, y, theta = scalar_step(x, y, theta, v, delta, wheelbase, dt)
+        xs.append(x)
+        ys.append(y)
+        thetas.append(theta)
+    return np.array(xs), np.array(ys), np.array(thetas)
+
+
+class TestKinematicBicycleStep:
+    def test_matches_scalar_reference(self):
+        expected = scalar_step(1.0, -2.0, 0.3, 8.0, 0.05, 2.7, 0.1)
+        np.testing.assert_allclose(kinematic_bicycle_step(1.0, -2.0, 0.3, 8.0, 0.05, 2.7, 0.1),
+                                   expected, rtol=1e-15)
+
+    def test_straight_line(self):
+        x, y, theta = kinematic_bicycle_step(0.0, 0.0, 0.0, 10.0, 0.0, dt=0.5)
+        assert (x, y, theta) == (5.0, 0.0, 0.0)
+
+    def test_broadcasts_over_fleet(self):
+        theta = np.array([0.0, np.pi / 2])
+        x, y, _ = kinematic_bicycle_step(np.zeros(2), np.zeros(2), theta, 10.0, 0.0, dt=1.0)
+        np.testing.assert_allclose(x, [10.0, 0.0], atol=1e-12)
+        np.testing.assert_allclose(y, [0.0, 10.0], atol=1e-12)
+
+
+class TestRollout:
+    def test_matches_stepping_point_by_point(self):
+        rng = np.random.default_rng(0)
+        steering = rng.uniform(-0.3, 0.3, (16, 40))
+        speed = rng.uniform(0.0, 15.0, (16, 40))
+        x0, y0, theta0 = rng.normal(size=(3, 16))
+        x, y, theta = rollout(steering, speed, x0, y0, theta0)
+        assert x.shape == y.shape == theta.shape == (16, 41)
+        for n in range(16):
+            expected = scalar_rollout(steering[n], speed[n], x0[n], y0[n], theta0[n])
+            np.testing.assert_allclose(x[n], expected[0], rtol=1e-12, atol=1e-12)
+            np.testing.assert_allclose(y[n], expected[1], rtol=1e-12, atol=1e-12)
+            np.testing.assert_allclose(theta[n], expected[2], rtol=1e-12, atol=1e-12)
+
+    def test_constant_turn_follows_circle(self):
+        # Small steps approach a circle of radius L / tan(delta)
+        delta, v, steps, dt = 0.1, 5.0, 4000, 0.001
+        x, y, _ = rollout(np.full(steps, delta), v, dt=dt)
+        radius = WHEELBASE / math.tan(delta)
+        np.testing.assert_allclose(np.hypot(x, y - radius), radius, rtol=1e-3)
+
+    def test_single_sequence_and_scalar_speed(self):
+        x, y, theta = rollout([0.0, 0.0, 0.0], 2.0, dt=0.5)
+        np.testing.assert_allclose(x, [0.0, 1.0, 2.0, 3.0])
+        assert not y.any() and not theta.any()
+
+    def test_scalar_controls_raise(self):
+        with pytest.raises(ValueError):
+            rollout(0.1, 5.0)
+
+    def test_control_grid_matches_scalar_loop(self):
+        steering, speed = control_grid(np.linspace(-0.4, 0.4, 64), np.linspace(0.0, 20.0, 64), 50)
+        x, y, theta = rollout(steering, speed)
+        assert x.shape == (4096, 51)
+        for n in range(0, 4096, 97):
+            expected = scalar_rollout(steering[n], speed[n], 0.0, 0.0, 0.0)
+            np.testing.assert_allclose(x[n], expected[0], rtol=1e-12, atol=1e-12)
+            np.testing.assert_allclose(y[n], expected[1], rtol=1e-12, atol=1e-12)
+            np.testing.assert_allclose(theta[n], expected[2], rtol=1e-12, atol=1e-12)
+
+
+class TestControlGrid:
+    def test_every_combination(self):
+        steering, speed = control_grid([-0.1, 0.0, 0.1], [5.0, 10.0], 4)
+        assert steering.shape == speed.shape == (6, 4)
+        pairs = {(s[0], v[0]) for s, v in zip(steering, speed)}
+        assert pairs == {(s, v) for s in (-0.1, 0.0, 0.1) for v in (5.0, 10.0)}
+        assert (steering == steering[:, :1]).all()
@@ -0,0 +1,98 @@
+"""
+Unit tests for the NumPy port of math_foundations.jl.
+
+The CSVs in tests/fixtures/math_foundations/ are NOT Julia outputs: they
+are written by scripts/generate_math_fixtures.py, a scalar Python
+transcription of scripts/generate_math_fixtures.jl (no Julia toolchain
+was available). The `*_scalar_reference` tests therefore check the
+vectorized port against the scalar formulas only. Parity with
+math_foundations.jl itself is unverified until the fixtures are
+regenerated with `julia scripts/generate_math_fixtures.jl`.
+"""
+
+import csv
+import os
+
+import numpy as np
+import pytest
+from alpamayo_demo.physics.math_foundations import (
+    pid_control,
+    pid_track,
+    pure_pursuit_steering,
+    time_to_collision,
+)
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "math_foundations")
+
+
+def load_fixture(name):
+    """Columns of a fixture CSV as float arrays keyed by header name."""
+    with open(os.path.join(FIXTURES, name), newline="") as f:
+        rows = list(csv.reader(f))
+    return {column: np.array([float(v) for v in values]) for column, *values in zip(*rows)}
+
+
+class TestPurePursuitSteering:
+    def test_matches_scalar_reference(self):
+        ref = load_fixture("pure_pursuit_steering.csv")
+        delta = pure_pursuit_steering(ref["rx"], ref["ry"], ref["x"], ref["y"], ref["theta"], ref["wheelbase"])
+        np.testing.assert_allclose(delta, ref["delta"], rtol=1e-12, atol=1e-15)
+
+    def test_target_on_vehicle_gives_zero(self):
+        assert pure_pursuit_steering(1.0, 2.0, 1.0, 2.0, 0.5, 2.7) == 0.0
+
+    def test_broadcasts_one_target_over_agents(self):
+        # Agents straight behind the target, facing it: no steering needed
+        x = np.array([-5.0, -10.0, -20.0])
+        np.testing.assert_allclose(pure_pursuit_steering(0.0, 0.0, x, 0.0, 0.0, 2.7), 0.0, atol=1e-15)
+
+    def test_target_to_the_left_steers_left(self):
+        assert pure_pursuit_steering(5.0, 5.0, 0.0, 0.0, 0.0, 2.7) > 0
+
+
+class TestPidControl:
+    def test_matches_scalar_reference_step_by_step(self):
+        ref = load_fixture("pid_control.csv")
+        output, integral, error = pid_control(ref["target"], ref["current"], ref["kp"], ref["ki"], ref["kd"],
+                                              ref["integral_err"], ref["prev_err"], ref["dt"])
+        np.testing.assert_allclose(output, ref["output"], rtol=1e-12)
+        np.testing.assert_allclose(integral, ref["new_integral_err"], rtol=1e-12)
+        np.testing.assert_allclose(error, ref["error"], rtol=1e-12)
+
+    def test_track_matches_scalar_reference_sequence(self):
+        ref = load_fixture("pid_control.csv")
+        outputs, integral, error = pid_track(ref["target"], ref["current"], 0.8, 0.2, 0.05, 0.1)
+        np.testing.assert_allclose(outputs, ref["output"], rtol=1e-12)
+        assert integral == pytest.approx(ref["new_integral_err"][-1], rel=1e-12)
+        assert error == pytest.approx(ref["error"][-1], rel=1e-12)
+
+    def test_track_over_many_controllers(self):
+        rng = np.random.default_rng(1)
+        targets = rng.uniform(0, 20, (8, 30))
+        measured = rng.uniform(0, 20, (8, 30))
+        outputs, _, _ = pid_track(targets, measured, 0.5, 0.1, 0.02, 0.1)
+        integral = prev = np.zeros(8)
+        for t in range(30):
+            expected, integral, prev = pid_control(targets[:, t], measured[:, t], 0.5, 0.1, 0.02,
+                                                   integral, prev, 0.1)
+            np.testing.assert_allclose(outputs[:, t], expected, rtol=1e-12)
+
+    def test_track_needs_time_axis(self):
+        with pytest.raises(ValueError):
+            pid_track(1.0, 0.0, 1.0, 0.0, 0.0, 0.1)
+
+
+class TestTimeToCollision:
+    def test_matches_scalar_reference(self):
+        ref = load_fixture("time_to_collision.csv")
+        np.testing.assert_allclose(time_to_collision(ref["v_ego"], ref["v_target"], ref["distance"]),
+                                   ref["ttc"], rtol=1e-15)
+
+    def test_not_closing_is_infinite(self):
+        ttc = time_to_collision(np.array([10.0, 8.0, 12.0]), np.array([10.0, 12.0, 8.0]), 20.0)
+        assert ttc.tolist() == [np.inf, np.inf, 5.0]
+
+    def test_agents_by_time_steps(self):
+        ttc = time_to_collision(np.full((4, 10), 15.0), 5.0, np.linspace(10.0, 100.0, 10))
+        assert ttc.shape == (4, 10)
+        np.testing.assert_allclose(ttc[0], np.linspace(1.0, 10.0, 10))
@@ -0,0 +1,195 @@
+"""
+Unit tests for pipeline stages (prefetching, batching).
+"""
+
+import threading
+import time
+
+import pytest
+from alpamayo_demo.utils.pipeline import BackgroundWorker, batched, prefetch
+
+
+def slow_range(n, delay):
+    for i in range(n):
+        time.sleep(delay)
+        yield i
+
+
+class TestPrefetch:
+    def test_preserves_order(self):
+        assert list(prefetch(range(100), maxsize=3)) == list(range(100))
+
+    def test_empty_source(self):
+        assert list(prefetch([])) == []
+
+    def test_source_exception_is_reraised(self):
+        def failing():
+            yield 1
+            raise RuntimeError("decode failed")
+
+        it = prefetch(failing())
+        assert next(it) == 1
+        with pytest.raises(RuntimeError, match="decode failed"):
+            next(it)
+
+    def test_queue_is_bounded(self):
+        produced = []
+
+        def source():
+            for i in range(50):
+                produced.append(i)
+                yield i
+
+        it = prefetch(source(), maxsize=2)
+        time.sleep(0.2)
+        # At most maxsize queued plus one waiting in the producer
+        assert len(produced) <= 3
+        it.close()
+
+    def test_overlaps_producer_and_consumer(self):
+        next_item_started = threading.Event()
+
+        def source():
+            yield 0
+            next_item_started.set()
+            yield 1
+
+        it = prefetch(source(), maxsize=4)
+        assert next(it) == 0
+        # The next item is produced while the consumer still holds this one;
+        # a serial pipeline would never set the event here
+        assert next_item_started.wait(timeout=5)
+        assert list(it) == [1]
+
+    def test_close_stops_producer_thread(self):
+        it = prefetch(slow_range(1000, 0.001), maxsize=2)
+        next(it)
+        it.close()
+        assert not any(t.name == "prefetch" and t.is_alive() for t in threading.enumerate())
+
+    def test_context_manager_closes(self):
+        with prefetch(range(10)) as it:
+            assert next(it) == 0
+        assert list(it) == []
+
+    def test_invalid_size_raises(self):
+        with pytest.raises(ValueError):
+            prefetch(range(3), maxsize=0)
+
+
+class TestBatched:
+    def test_groups_by_max_size(self):
+        assert list(batched(range(7), max_size=3)) == [[0, 1, 2], [3, 4, 5], [6]]
+
+    def test_empty_source(self):
+        assert list(batched([], max_size=3)) == []
+
+    def test_prefetched_source_keeps_order(self):
+        batches = list(batched(prefetch(range(20), maxsize=4), max_size=6, max_wait=1.0))
+        assert [i for b in batches for i in b] == list(range(20))
+        assert all(len(b) <= 6 for b in batches)
+
+    def test_max_wait_flushes_partial_batch(self):
+        release = threading.Event()
+
+        def source():
+            yield 0
+            # Blocks until the test releases it, so a second item can only
+            # join the first batch if max_wait is ignored
+            release.wait(timeout=5)
+            yield 1
+
+        items = prefetch(source(), maxsize=4)
+        first = next(batched(items, max_size=4, max_wait=0.02))
+        release.set()
+        items.close()
+        assert first == [0]
+
+    def test_invalid_size_raises(self):
+        with pytest.raises(ValueError):
+            list(batched(range(3), max_size=0))
+
+
+class TestBackgroundWorker:
+    def test_collects_all_items_in_order(self):
+        worker = BackgroundWorker(range(50)).start()
+        worker.join(timeout=5)
+        assert worker.done
+        assert worker.results == list(range(50))
+        assert worker.error is None
+        assert worker.completed
+
+    def test_results_grow_while_running(self):
+        halfway = threading.Event()
+        release = threading.Event()
+
+        def source():
+            for i in range(20):
+                if i == 10:
+                    halfway.set()
+                    release.wait(timeout=5)
+                yield i
+
+        worker = BackgroundWorker(source()).start()
+        assert halfway.wait(timeout=5)
+        assert len(worker) == 10
+        assert not worker.done
+        release.set()
+        worker.join(timeout=5)
+        assert len(worker) == 20
+
+    def test_runs_ahead_of_reader(self):
+        worker = BackgroundWorker(range(1000)).start()
+        worker.join(timeout=5)
+        # Nobody consumed anything, yet everything was produced
+        assert len(worker) == 1000
+
+    def test_error_is_recorded(self):
+        def failing():
+            yield 1
+            raise RuntimeError("decode failed")
+
+        worker = BackgroundWorker(failing()).start()
+        worker.join(timeout=5)
+        assert worker.results == [1]
+        assert isinstance(worker.error, RuntimeError)
+        assert not worker.completed
+
+    def test_stop_ends_early_and_closes_source(self):
+        closed = threading.Event()
+
+        def endless():
+            try:
+                while True:
+                    time.sleep(0.001)
+                    yield 0
+            finally:
+                closed.set()
+
+        worker = BackgroundWorker(endless()).start()
+        time.sleep(0.02)
+        worker.stop(timeout=5)
+        assert worker.done and not worker.completed
+        assert closed.is_set()
+
+    def test_not_done_before_start(self):
+        assert not BackgroundWorker([]).done
+
+    def test_max_results_keeps_newest(self):
+        worker = BackgroundWorker(range(100), max_results=10).start()
+        worker.join(timeout=5)
+        assert worker.completed
+        assert len(worker) == 100
+        assert worker.dropped == 90
+        assert worker.snapshot() == (90, list(range(90, 100)))
+
+    def test_snapshot_is_a_stable_copy(self):
+        worker = BackgroundWorker(range(5)).start()
+        worker.join(timeout=5)
+        first, items = worker.snapshot()
+        items.append("x")
+        assert (first, worker.results) == (0, list(range(5)))
+
+    def test_invalid_max_results_raises(self):
+        with pytest.raises(ValueError):
+            BackgroundWorker([], max_results=0)
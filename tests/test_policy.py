@@ -2,10 +2,13 @@
 Unit tests for AlpamayoPolicy — mock mode behavior and edge cases.
 """
 
+import asyncio
 import json
+import random
 import numpy as np
 import pytest
 from alpamayo_demo.core.policy import AlpamayoPolicy
+from alpamayo_demo.core.schema import Decision, validate_decision
 
 
 GOAL_PROMPT = "Analyze the scene and decide the next action."
@@ -87,8 +90,172 @@ class TestAlpamayoPolicyMock:
         assert all(r["decision"] in VALID_DECISIONS for r in results)
 
 
+class TestAlpamayoPolicyOutputFormats:
+    def setup_method(self):
+        self.policy = AlpamayoPolicy(mock=True)
+
+    def test_dict_output(self):
+        result = self.policy.decide(blank_frame(), GOAL_PROMPT, output="dict")
+        assert isinstance(result, dict)
+        assert result["decision"] in VALID_DECISIONS
+
+    def test_decision_output(self):
+        result = self.policy.decide(blank_frame(), GOAL_PROMPT, output="decision")
+        assert isinstance(result, Decision)
+        assert result.decision in VALID_DECISIONS
+
+    def test_structured_outputs_validate(self):
+        for output in ("dict", "decision"):
+            result = self.policy.decide(blank_frame(), GOAL_PROMPT, output=output)
+            assert validate_decision(result)["scene_type"] in VALID_SCENES
+
+    def test_batch_respects_output(self):
+        results = self.policy.decide_batch([blank_frame()] * 3, GOAL_PROMPT, output="decision")
+        assert all(isinstance(r, Decision) for r in results)
+
+    def test_invalid_output_raises(self):
+        with pytest.raises(ValueError, match="Invalid output format"):
+            self.policy.decide(blank_frame(), GOAL_PROMPT, output="xml")
+
+
+class TestAlpamayoPolicyBatch:
+    def test_returns_one_decision_per_frame(self):
+        policy = AlpamayoPolicy(mock=True, max_batch_size=4)
+        results = policy.decide_batch([blank_frame() for _ in range(10)], GOAL_PROMPT)
+        assert len(results) == 10
+        assert all(json.loads(r)["decision"] in VALID_DECISIONS for r in results)
+
+    def test_empty_batch_returns_empty_list(self):
+        assert AlpamayoPolicy(mock=True).decide_batch([], GOAL_PROMPT) == []
+
+    def test_chunks_by_max_batch_size(self):
+        policy = AlpamayoPolicy(mock=True, max_batch_size=3)
+        calls = []
+        original = policy._mock_decide_batch
+        policy._mock_decide_batch = lambda frames, prompt: calls.append(len(frames)) or original(frames, prompt)
+        policy.decide_batch([blank_frame() for _ in range(7)], GOAL_PROMPT)
+        assert calls == [3, 3, 1]
+
+    def test_batching_amortizes_call_latency(self):
+        policy = AlpamayoPolicy(mock=True, max_batch_size=8)
+        batch_calls, single_calls = [], []
+        original = policy._mock_decide_batch
+        policy._mock_decide_batch = lambda frames, prompt: batch_calls.append(len(frames)) or original(frames, prompt)
+        policy._mock_decide = lambda frame, prompt: single_calls.append(frame)
+        policy.decide_batch([blank_frame() for _ in range(8)], GOAL_PROMPT)
+        # One call overhead for all eight frames instead of eight
+        assert batch_calls == [8]
+        assert single_calls == []
+
+    def test_invalid_batch_size_raises(self):
+        with pytest.raises(ValueError):
+            AlpamayoPolicy(mock=True, max_batch_size=0)
+
+
+class TestAlpamayoPolicyBundle:
+    def bundle(self):
+        return {"FRONT": blank_frame(), "FRONT_LEFT": blank_frame(), "SIDE_LEFT": blank_frame(320, 480)}
+
+    def test_one_valid_decision_per_bundle(self):
+        result = AlpamayoPolicy(mock=True).decide_bundle(self.bundle(), GOAL_PROMPT, output="dict")
+        assert validate_decision(result)["decision"] in VALID_DECISIONS
+
+    def test_one_call_per_bundle(self):
+        policy = AlpamayoPolicy(mock=True)
+        calls, single_calls = [], []
+        original = policy._decide_bundle
+        policy._decide_bundle = lambda bundle, prompt: calls.append(list(bundle)) or original(bundle, prompt)
+        policy._mock_decide = lambda frame, prompt: single_calls.append(frame)
+        policy.decide_bundle(self.bundle(), GOAL_PROMPT)
+        # All three views go to the model together, not one call per camera
+        assert calls == [["FRONT", "FRONT_LEFT", "SIDE_LEFT"]]
+        assert single_calls == []
+
+    def test_empty_bundle_raises(self):
+        with pytest.raises(ValueError):
+            AlpamayoPolicy(mock=True).decide_bundle({}, GOAL_PROMPT)
+
+
+class TestAlpamayoPolicyAsync:
+    def test_adecide_returns_valid_decision(self):
+        result = asyncio.run(AlpamayoPolicy(mock=True).adecide(blank_frame(), GOAL_PROMPT))
+        assert validate_decision(result)["decision"] in VALID_DECISIONS
+
+    def test_adecide_batch_overlaps_calls(self):
+        policy = AlpamayoPolicy(mock=True, max_in_flight=8)
+        original = policy.adecide
+        active, peak = [0], [0]
+
+        async def tracked_adecide(frame, prompt, output):
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            try:
+                return await original(frame, prompt, output)
+            finally:
+                active[0] -= 1
+
+        policy.adecide = tracked_adecide
+        results = asyncio.run(policy.adecide_batch([blank_frame() for _ in range(8)], GOAL_PROMPT, output="dict"))
+        assert len(results) == 8
+        # All eight calls were awaiting the mock latency at the same time
+        assert peak[0] == 8
+
+    def test_results_keep_input_order_and_respect_limit(self):
+        policy = AlpamayoPolicy(mock=True, max_in_flight=3)
+        active, peak = [0], [0]
+
+        async def fake_adecide(frame, prompt, output):
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            await asyncio.sleep(random.uniform(0.0, 0.02))
+            active[0] -= 1
+            return frame
+
+        policy.adecide = fake_adecide
+        results = asyncio.run(policy.adecide_batch(list(range(20)), GOAL_PROMPT))
+        assert results == list(range(20))
+        assert peak[0] == 3
+
+    def test_stream_pulls_frames_lazily(self):
+        policy = AlpamayoPolicy(mock=True, max_in_flight=2)
+        pulled = []
+
+        def frames():
+            for i in range(100):
+                pulled.append(i)
+                yield blank_frame(8, 8)
+
+        async def first_two():
+            stream = policy.adecide_stream(frames(), GOAL_PROMPT)
+            out = [await stream.__anext__(), await stream.__anext__()]
+            await stream.aclose()
+            return out
+
+        assert len(asyncio.run(first_two())) == 2
+        assert len(pulled) <= 4
+
+    def test_invalid_in_flight_raises(self):
+        with pytest.raises(ValueError):
+            AlpamayoPolicy(mock=True, max_in_flight=0)
+
+
 class TestAlpamayoPolicyReal:
     def test_real_mode_raises_not_implemented(self):
         policy = AlpamayoPolicy(mock=False)
         with pytest.raises(NotImplementedError):
             policy.decide(blank_frame(), GOAL_PROMPT)
+
+    def test_real_mode_batch_raises_not_implemented(self):
+        policy = AlpamayoPolicy(mock=False)
+        with pytest.raises(NotImplementedError):
+            policy.decide_batch([blank_frame()], GOAL_PROMPT)
+
+    def test_real_mode_bundle_raises_not_implemented(self):
+        policy = AlpamayoPolicy(mock=False)
+        with pytest.raises(NotImplementedError):
+            policy.decide_bundle({"FRONT": blank_frame()}, GOAL_PROMPT)
+
+    def test_real_mode_adecide_without_client_raises(self):
+        policy = AlpamayoPolicy(mock=False)
+        with pytest.raises(NotImplementedError):
+            asyncio.run(policy.adecide(blank_frame(), GOAL_PROMPT))
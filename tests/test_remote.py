@@ -0,0 +1,144 @@
+"""
+Unit tests for the remote inference client against the local stub server.
+"""
+
+import asyncio
+import base64
+import json
+import numpy as np
+import pytest
+from alpamayo_demo.core.policy import AlpamayoPolicy
+from alpamayo_demo.core.remote import RemoteInferenceClient, encode_frame, serve_stub
+from alpamayo_demo.core.schema import validate_decision
+
+
+GOAL_PROMPT = "Analyze the scene and decide the next action."
+
+
+def blank_frame(h=120, w=160):
+    return np.zeros((h, w, 3), dtype=np.uint8)
+
+
+async def with_stub(body, latency=0.1, jitter=0.0):
+    """Run `body(port)` against a stub server on a free port."""
+    server = await serve_stub(port=0, latency=latency, jitter=jitter)
+    try:
+        return await body(server.sockets[0].getsockname()[1])
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+def track_in_flight(client):
+    """Wrap `client.decide` to record the peak number of requests in flight."""
+    original = client.decide
+    active, peak = [0], [0]
+
+    async def tracked_decide(frame, prompt):
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        try:
+            return await original(frame, prompt)
+        finally:
+            active[0] -= 1
+
+    client.decide = tracked_decide
+    return peak
+
+
+class TestEncodeFrame:
+    def test_returns_base64_jpeg(self):
+        data = base64.b64decode(encode_frame(blank_frame()))
+        assert data[:2] == b"\xff\xd8"
+
+
+class TestRemoteInferenceClient:
+    def test_single_decision_is_valid(self):
+        async def body(port):
+            async with RemoteInferenceClient(port=port) as client:
+                return await client.decide(blank_frame(), GOAL_PROMPT)
+
+        decision = asyncio.run(with_stub(body, latency=0.01))
+        assert validate_decision(decision)["confidence"] <= 1.0
+
+    def test_out_of_order_responses_are_matched(self):
+        async def body(port):
+            async with RemoteInferenceClient(port=port) as client:
+                return await asyncio.gather(*(client.decide(blank_frame(), GOAL_PROMPT) for _ in range(10)))
+
+        decisions = asyncio.run(with_stub(body, latency=0.0, jitter=0.05))
+        assert len(decisions) == 10
+        assert all(validate_decision(d)["confidence"] <= 1.0 for d in decisions)
+
+    def test_server_shutdown_fails_pending_requests(self):
+        async def body():
+            server = await serve_stub(port=0, latency=10.0)
+            client = RemoteInferenceClient(port=server.sockets[0].getsockname()[1])
+            await client.connect()
+            pending = asyncio.ensure_future(client.decide(blank_frame(), GOAL_PROMPT))
+            await asyncio.sleep(0.05)
+            client._writer.transport.abort()
+            try:
+                with pytest.raises(ConnectionError):
+                    await pending
+            finally:
+                server.close()
+
+        asyncio.run(body())
+
+
+    def test_reconnects_after_server_closes_connection(self):
+        async def one_reply(reader, writer):
+            request = json.loads(await reader.readline())
+            writer.write(json.dumps({"id": request["id"], "decision": {"decision": "stop"}}).encode() + b"\n")
+            await writer.drain()
+            writer.close()
+
+        async def body():
+            server = await asyncio.start_server(one_reply, "127.0.0.1", 0)
+            client = RemoteInferenceClient(port=server.sockets[0].getsockname()[1], timeout=5.0)
+            try:
+                first = await client.decide(blank_frame(), GOAL_PROMPT)
+                await asyncio.wait_for(client._listener, 5.0)
+                second = await client.decide(blank_frame(), GOAL_PROMPT)
+                return first, second
+            finally:
+                await client.close()
+                server.close()
+
+        assert asyncio.run(body()) == ({"decision": "stop"}, {"decision": "stop"})
+
+    def test_unanswered_request_times_out(self):
+        async def body(port):
+            async with RemoteInferenceClient(port=port, timeout=0.05) as client:
+                with pytest.raises(TimeoutError):
+                    await client.decide(blank_frame(), GOAL_PROMPT)
+                return client._pending
+
+        assert asyncio.run(with_stub(body, latency=10.0)) == {}
+
+
+class TestPolicyWithRemoteClient:
+    def test_in_flight_requests_overlap_latency(self):
+        async def body(port):
+            async with RemoteInferenceClient(port=port) as client:
+                peak = track_in_flight(client)
+                policy = AlpamayoPolicy(mock=False, max_in_flight=10, client=client)
+                decisions = await policy.adecide_batch([blank_frame() for _ in range(10)], GOAL_PROMPT,
+                                                       output="dict")
+                return decisions, peak[0]
+
+        decisions, peak = asyncio.run(with_stub(body, latency=0.1))
+        assert len(decisions) == 10
+        # All ten round trips were waiting on the server at once
+        assert peak == 10
+
+    def test_in_flight_limit_bounds_throughput(self):
+        async def body(port):
+            async with RemoteInferenceClient(port=port) as client:
+                peak = track_in_flight(client)
+                policy = AlpamayoPolicy(mock=False, max_in_flight=2, client=client)
+                await policy.adecide_batch([blank_frame() for _ in range(6)], GOAL_PROMPT)
+                return peak[0]
+
+        assert asyncio.run(with_stub(body, latency=0.05)) == 2
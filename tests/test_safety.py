@@ -0,0 +1,101 @@
+"""
+Unit tests for the time-to-collision safety gate.
+"""
+
+import math
+import time
+
+import numpy as np
+import pytest
+from alpamayo_demo.core.policy import AlpamayoPolicy
+from alpamayo_demo.core.schema import validate_decision
+from alpamayo_demo.physics.safety import SafetyGate
+
+
+def decision(action="accelerate", agents=()):
+    return {
+        "frame_id": 0,
+        "scene_type": "straight_road",
+        "agents": list(agents),
+        "traffic_light": "green",
+        "hazards": [],
+        "decision": action,
+        "confidence": 0.9,
+        "reason": "Clear road ahead, safe to maintain speed",
+    }
+
+
+def agent(position="ahead", distance=20.0, speed=0.0, agent_type="vehicle"):
+    return {"type": agent_type, "position": position, "distance": distance, "speed": speed}
+
+
+class TestTimeToCollision:
+    def test_minimum_over_in_path_agents(self):
+        gate = SafetyGate()
+        decisions = [
+            decision(agents=[agent(distance=30.0, speed=5.0), agent("crossing", distance=12.0)]),
+            decision(agents=[agent("left", distance=1.0)]),
+            decision(),
+        ]
+        ttc = gate.time_to_collision(decisions, 10.0)
+        assert ttc[0] == pytest.approx(1.2)
+        assert math.isinf(ttc[1]) and math.isinf(ttc[2])
+
+    def test_agents_without_kinematics_are_ignored(self):
+        ttc = SafetyGate().time_to_collision([decision(agents=[{"type": "vehicle", "position": "ahead"}])], 10.0)
+        assert math.isinf(ttc[0])
+
+    def test_per_decision_ego_speed(self):
+        decisions = [decision(agents=[agent(distance=20.0)]) for _ in range(3)]
+        ttc = SafetyGate().time_to_collision(decisions, [0.0, 10.0, 20.0])
+        assert ttc.tolist() == [math.inf, 2.0, 1.0]
+
+
+class TestApply:
+    def test_overrides_gated_action_below_threshold(self):
+        gate = SafetyGate(min_ttc=2.0)
+        d = gate.check(decision("maintain_speed", [agent(distance=15.0, speed=2.0)]), 10.0)
+        assert d["decision"] == "brake"
+        assert d["safety_override"] == {"from": "maintain_speed",
+                                        "reason": "Clear road ahead, safe to maintain speed", "ttc": 1.88}
+        assert "Safety override" in d["reason"]
+        validate_decision(d)
+
+    def test_leaves_safe_and_cautious_decisions(self):
+        gate = SafetyGate(min_ttc=2.0)
+        decisions = [
+            decision("accelerate", [agent(distance=50.0)]),
+            decision("slow_down", [agent(distance=2.0)]),
+            decision("accelerate", [agent("right", distance=2.0)]),
+        ]
+        mask = gate.apply(decisions, 10.0)
+        assert not mask.any()
+        assert [d["decision"] for d in decisions] == ["accelerate", "slow_down", "accelerate"]
+        assert gate.checked == 3 and gate.overridden == 0
+
+    def test_whole_clip_in_one_pass(self):
+        gate = SafetyGate(min_ttc=2.0, override="stop")
+        decisions = [decision(agents=[agent(distance=float(d))]) for d in range(5, 50, 5)]
+        mask = gate.apply(decisions, 10.0)
+        assert mask.tolist() == [True, True, True, False, False, False, False, False, False]
+        assert gate.overridden == 3
+        assert decisions[0]["decision"] == "stop"
+
+    def test_mock_decisions_validate_after_gating(self):
+        policy = AlpamayoPolicy(mock=True)
+        decisions = policy.decide_batch([np.zeros((8, 8, 3), np.uint8)] * 16, "Decide.", output="dict")
+        SafetyGate(min_ttc=10.0).apply(decisions, 30.0)
+        for d in decisions:
+            validate_decision(d)
+
+    def test_inline_latency(self):
+        gate = SafetyGate()
+        d = decision(agents=[agent(distance=40.0), agent("crossing", distance=25.0, agent_type="pedestrian")])
+        for _ in range(200):
+            gate.check(dict(d), 10.0)
+        # Tens of microseconds in practice; policy calls take ~100 ms
+        assert gate.us_per_decision < 1000
+
+    def test_invalid_threshold_raises(self):
+        with pytest.raises(ValueError):
+            SafetyGate(min_ttc=0)
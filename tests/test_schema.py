@@ -4,7 +4,9 @@ Unit tests for the DecisionSchema validation logic.
 
 import json
 import pytest
-from alpamayo_demo.core.schema import validate_decision, DECISION_SCHEMA
+from alpamayo_demo.core.schema import (
+    validate_decision, validate_decisions, Decision, DecisionValidator, DECISION_SCHEMA,
+)
 
 
 # --- Helpers ---
@@ -81,6 +83,36 @@ class TestValidDecision:
         assert isinstance(result, dict)
 
 
+# --- Structured Input Tests ---
+
+class TestStructuredDecision:
+    def test_dict_is_validated_without_json(self):
+        result = validate_decision(make_valid_decision())
+        assert result["decision"] == "maintain_speed"
+
+    def test_decision_object_is_validated(self):
+        result = validate_decision(Decision.from_dict(make_valid_decision()))
+        assert result == make_valid_decision()
+
+    def test_invalid_dict_raises(self):
+        with pytest.raises(ValueError, match="Invalid decision"):
+            validate_decision(make_valid_decision(decision="fly"))
+
+    def test_round_trip_through_json(self):
+        d = Decision.from_dict(make_valid_decision(frame_id=7))
+        assert Decision.from_dict(json.loads(d.to_json())) == d
+
+    def test_decision_is_slotted(self):
+        d = Decision.from_dict(make_valid_decision())
+        assert not hasattr(d, "__dict__")
+        with pytest.raises(AttributeError):
+            d.extra = 1
+
+    def test_to_dict_preserves_schema_field_order(self):
+        d = Decision.from_dict(make_valid_decision())
+        assert list(d.to_dict()) == list(DECISION_SCHEMA["properties"])
+
+
 # --- Invalid Input Tests ---
 
 class TestInvalidDecision:
@@ -119,6 +151,10 @@ class TestInvalidDecision:
         with pytest.raises(ValueError, match="Confidence"):
             validate_decision(to_json(d))
 
+    def test_nan_confidence_raises(self):
+        with pytest.raises(ValueError, match="Confidence must be between 0.0 and 1.0"):
+            validate_decision(to_json(make_valid_decision(confidence=float("nan"))))
+
     def test_invalid_agent_type_raises(self):
         d = make_valid_decision(agents=[{"type": "drone", "position": "ahead"}])
         with pytest.raises(ValueError, match="Invalid agent type"):
@@ -136,3 +172,111 @@ class TestInvalidDecision:
     def test_empty_json_object_raises(self):
         with pytest.raises(ValueError, match="Missing required field"):
             validate_decision("{}")
+
+
+# --- Schema Keyword Tests ---
+
+class TestSchemaTypes:
+    def test_frame_id_must_be_integer(self):
+        with pytest.raises(ValueError, match="Invalid type for frame_id"):
+            validate_decision(to_json(make_valid_decision(frame_id="3")))
+
+    def test_frame_id_rejects_bool(self):
+        with pytest.raises(ValueError, match="Invalid type for frame_id"):
+            validate_decision(make_valid_decision(frame_id=True))
+
+    def test_frame_id_must_fit_int64(self):
+        with pytest.raises(ValueError, match="Frame_id must be between"):
+            validate_decision(make_valid_decision(frame_id=10**20))
+
+    def test_frame_id_is_optional(self):
+        d = make_valid_decision()
+        del d["frame_id"]
+        assert validate_decision(to_json(d))["decision"] == "maintain_speed"
+
+    def test_confidence_must_be_number(self):
+        with pytest.raises(ValueError, match="Invalid type for confidence"):
+            validate_decision(to_json(make_valid_decision(confidence="high")))
+
+    def test_integer_confidence_accepted(self):
+        assert validate_decision(to_json(make_valid_decision(confidence=1)))["confidence"] == 1
+
+    def test_hazard_items_must_be_strings(self):
+        with pytest.raises(ValueError, match=r"Invalid type for hazards\[1\]"):
+            validate_decision(to_json(make_valid_decision(hazards=["weather", 5])))
+
+    def test_agents_must_be_array(self):
+        with pytest.raises(ValueError, match="Invalid type for agents"):
+            validate_decision(to_json(make_valid_decision(agents="none")))
+
+    def test_agent_missing_position_raises(self):
+        with pytest.raises(ValueError, match=r"Missing required field: agents\[0\].position"):
+            validate_decision(to_json(make_valid_decision(agents=[{"type": "vehicle"}])))
+
+    def test_reason_must_be_string(self):
+        with pytest.raises(ValueError, match="Invalid type for reason"):
+            validate_decision(to_json(make_valid_decision(reason=None)))
+
+    def test_non_object_raises(self):
+        with pytest.raises(ValueError, match="expected object"):
+            validate_decision("[1, 2]")
+
+    def test_custom_schema(self):
+        validator = DecisionValidator({
+            "type": "object",
+            "properties": {"speed": {"type": "number", "minimum": 0, "maximum": 40}},
+            "required": ["speed"],
+        })
+        assert validator.validate({"speed": 12.5}) == {"speed": 12.5}
+        with pytest.raises(ValueError, match="Speed must be between"):
+            validator.validate({"speed": 41})
+
+
+    def test_minimum_only_range_message(self):
+        d = make_valid_decision(agents=[{"type": "vehicle", "position": "ahead", "distance": -5.0}])
+        with pytest.raises(ValueError, match=r"Agent distance must be at least 0.0: -5.0"):
+            validate_decision(d)
+
+    def test_maximum_only_range_message(self):
+        validator = DecisionValidator({"type": "object", "properties": {"level": {"type": "number", "maximum": 1}}})
+        with pytest.raises(ValueError, match="Level must be at most 1: 2"):
+            validator.validate({"level": 2})
+
+    def test_numpy_scalar_confidence_accepted(self):
+        np = pytest.importorskip("numpy")
+        assert validate_decision(make_valid_decision(confidence=np.float64(0.5)))["confidence"] == 0.5
+
+    def test_bool_confidence_rejected(self):
+        with pytest.raises(ValueError, match="Invalid type for confidence"):
+            validate_decision(make_valid_decision(confidence=True))
+
+    def test_agent_optional_fields_checked(self):
+        agent = {"type": "vehicle", "position": "ahead", "distance": 12.0, "speed": "fast"}
+        with pytest.raises(ValueError, match=r"Invalid type for agents\[0\].speed"):
+            validate_decision(make_valid_decision(agents=[agent]))
+
+    def test_required_key_without_property(self):
+        validator = DecisionValidator({"type": "object", "properties": {"a": {"type": "string"}},
+                                       "required": ["a", "b"]})
+        assert validator.validate({"a": "x", "b": None}) == {"a": "x", "b": None}
+        with pytest.raises(ValueError, match="Missing required field: b"):
+            validator.validate({"a": "x", "c": None})
+
+
+class TestValidateDecisions:
+    def test_validates_mixed_batch(self):
+        batch = [
+            to_json(make_valid_decision()),
+            make_valid_decision(decision="stop"),
+            Decision.from_dict(make_valid_decision(decision="yield")),
+        ]
+        results = validate_decisions(batch)
+        assert [r["decision"] for r in results] == ["maintain_speed", "stop", "yield"]
+
+    def test_reports_index_of_invalid_decision(self):
+        batch = [make_valid_decision(), make_valid_decision(traffic_light="blue")]
+        with pytest.raises(ValueError, match="Decision 1: Invalid traffic_light"):
+            validate_decisions(batch)
+
+    def test_empty_batch(self):
+        assert validate_decisions([]) == []
@@ -0,0 +1,93 @@
+"""
+Unit tests for the closed-loop decision simulation.
+"""
+
+import json
+
+import numpy as np
+import pytest
+from alpamayo_demo.core.columnar import ACTIONS
+from alpamayo_demo.physics.control import PIDControllerBank
+from alpamayo_demo.physics.simulation import METRICS, load_decision_log, simulate_clips
+
+
+def arc_path(radius=50.0, angle=np.pi / 2):
+    t = np.linspace(0.0, angle, 60)
+    return np.column_stack([radius * np.sin(t), radius * (1 - np.cos(t))])
+
+
+class TestSimulateClips:
+    def test_decisions_drive_speed(self):
+        result = simulate_clips([["accelerate"] * 10, ["stop"] * 10], initial_speed=8.0)
+        assert result.speed.shape == (2, 101)
+        assert result.speed[0, -1] > 12.0
+        assert result.speed[1, -1] == pytest.approx(0.0, abs=0.1)
+        metrics = result.metrics()
+        assert metrics["distance"][0] > metrics["distance"][1]
+        assert metrics["stopped_seconds"][1] > 5.0
+
+    def test_straight_path_stays_on_line(self):
+        result = simulate_clips([["maintain_speed"] * 5], initial_speed=10.0)
+        np.testing.assert_allclose(result.y, 0.0, atol=1e-9)
+        assert result.x[0, -1] == pytest.approx(50.0)
+        assert result.metrics()["max_cross_track"][0] == pytest.approx(0.0, abs=1e-9)
+
+    def test_pure_pursuit_follows_curve(self):
+        result = simulate_clips([["maintain_speed"] * 12], path=arc_path(), initial_speed=8.0)
+        assert result.metrics()["max_cross_track"][0] < 1.0
+        # Past the end of the 78 m arc: turned left by the arc angle
+        assert result.theta[0, -1] == pytest.approx(np.pi / 2, abs=0.2)
+        assert np.abs(result.steering).max() <= 0.5
+
+    def test_short_clips_freeze(self):
+        result = simulate_clips([["maintain_speed"] * 2, ["maintain_speed"] * 6], initial_speed=10.0)
+        assert result.ticks.tolist() == [20, 60]
+        assert (result.x[0, 20:] == result.x[0, 20]).all()
+        metrics = result.metrics()
+        assert metrics["distance"].tolist() == pytest.approx([20.0, 60.0])
+        assert metrics["mean_speed"].tolist() == pytest.approx([10.0, 10.0])
+
+    def test_decision_interval_sets_ticks_per_decision(self):
+        result = simulate_clips([["brake"] * 4], decision_interval=0.5)
+        assert result.ticks.tolist() == [20]
+        assert result.steps_per_decision == 5
+
+    def test_short_decision_interval_holds_each_decision_one_tick(self):
+        result = simulate_clips([["brake"] * 4], decision_interval=0.02)
+        assert result.steps_per_decision == 1
+        assert result.ticks.tolist() == [4]
+
+    def test_accepts_action_codes(self):
+        codes = np.array([ACTIONS.index("accelerate")] * 5, dtype=np.int8)
+        by_code = simulate_clips([codes], initial_speed=5.0)
+        by_name = simulate_clips([["accelerate"] * 5], initial_speed=5.0)
+        np.testing.assert_array_equal(by_code.x, by_name.x)
+
+    def test_metrics_cover_every_clip(self):
+        metrics = simulate_clips([["yield"] * 3] * 4).metrics()
+        assert set(metrics) == set(METRICS)
+        assert all(values.shape == (4,) for values in metrics.values())
+
+    def test_thousands_of_clips(self):
+        rng = np.random.default_rng(0)
+        logs = [rng.choice(ACTIONS, 30) for _ in range(2000)]
+        result = simulate_clips(logs)
+        assert len(result) == 2000 and (result.speed >= 0).all()
+
+    def test_invalid_inputs_raise(self):
+        with pytest.raises(ValueError):
+            simulate_clips([])
+        with pytest.raises(ValueError):
+            simulate_clips([["stop"]], bank=PIDControllerBank(2))
+        with pytest.raises(ValueError):
+            simulate_clips([["stop"]], path=[[0.0, 0.0]])
+
+
+class TestLoadDecisionLog:
+    def test_reads_actions_and_interval(self, tmp_path):
+        path = tmp_path / "clip.jsonl"
+        lines = [{"decision": a, "timestamp": round(0.5 * i, 3)} for i, a in enumerate(["stop", "yield", "brake"])]
+        path.write_text("\n".join(json.dumps(line) for line in lines) + "\n")
+        actions, interval = load_decision_log(str(path))
+        assert actions == ["stop", "yield", "brake"]
+        assert interval == 0.5
@@ -0,0 +1,94 @@
+"""
+Unit tests for spooling uploads to disk.
+"""
+
+import gc
+import io
+import os
+import pytest
+from alpamayo_demo.utils.uploads import SpooledUpload, copy_in_chunks
+
+
+class RecordingReader(io.BytesIO):
+    """BytesIO that records the buffer size of every readinto call."""
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.requests = []
+
+    def readinto(self, buffer):
+        self.requests.append(len(buffer))
+        return super().readinto(buffer)
+
+
+class FailingReader(io.RawIOBase):
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        raise ConnectionError("upload interrupted")
+
+
+class TestCopyInChunks:
+    def test_copies_all_bytes(self):
+        data = os.urandom(10_000)
+        out = io.BytesIO()
+        assert copy_in_chunks(io.BytesIO(data), out, chunk_size=1024) == len(data)
+        assert out.getvalue() == data
+
+    def test_buffer_is_bounded(self):
+        source = RecordingReader(b"x" * 10_000)
+        copy_in_chunks(source, io.BytesIO(), chunk_size=1024)
+        assert set(source.requests) == {1024}
+
+    def test_source_without_readinto(self):
+        class ReadOnly:
+            def __init__(self, data):
+                self._io = io.BytesIO(data)
+
+            def read(self, n):
+                return self._io.read(n)
+
+        out = io.BytesIO()
+        copy_in_chunks(ReadOnly(b"abc" * 1000), out, chunk_size=100)
+        assert out.getvalue() == b"abc" * 1000
+
+
+class TestSpooledUpload:
+    def test_writes_file_with_suffix(self, tmp_path):
+        with SpooledUpload(io.BytesIO(b"video"), suffix=".mov", dir=tmp_path) as upload:
+            assert upload.path.endswith(".mov")
+            assert upload.size == 5
+            with open(upload.path, "rb") as f:
+                assert f.read() == b"video"
+
+    def test_rewinds_partially_read_upload(self, tmp_path):
+        source = io.BytesIO(b"video")
+        source.read()
+        with SpooledUpload(source, dir=tmp_path) as upload:
+            assert upload.size == 5
+
+    def test_close_removes_file(self, tmp_path):
+        upload = SpooledUpload(io.BytesIO(b"video"), dir=tmp_path)
+        upload.close()
+        assert upload.closed
+        assert not os.path.exists(upload.path)
+        upload.close()  # idempotent
+
+    def test_context_exit_removes_file_on_error(self, tmp_path):
+        with pytest.raises(RuntimeError):
+            with SpooledUpload(io.BytesIO(b"video"), dir=tmp_path) as upload:
+                raise RuntimeError("analysis failed")
+        assert not os.path.exists(upload.path)
+
+    def test_garbage_collection_removes_file(self, tmp_path):
+        upload = SpooledUpload(io.BytesIO(b"video"), dir=tmp_path)
+        path = upload.path
+        del upload
+        gc.collect()
+        assert not os.path.exists(path)
+
+    def test_failed_copy_leaves_nothing_behind(self, tmp_path):
+        with pytest.raises(ConnectionError):
+            SpooledUpload(FailingReader(), dir=tmp_path)
+        assert os.listdir(tmp_path) == []
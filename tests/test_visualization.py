@@ -1,13 +1,18 @@
 """
 Unit tests for visualization utility functions.
 
-Tests the pure utility functions (wrap_text, create_display_frame)
-without requiring a display / GUI.
+Tests the pure utility functions (wrap_text, create_display_frame,
+render_info_panel, DisplayRenderer, AnnotatedVideoWriter) without
+requiring a display / GUI.
 """
 
+import cv2
 import numpy as np
 import pytest
-from alpamayo_demo.utils.visualization import wrap_text, create_display_frame
+from alpamayo_demo.utils.visualization import (
+    wrap_text, create_display_frame, render_info_panel, DisplayRenderer, AnnotatedVideoWriter,
+    _panel_key, _render_panel,
+)
 
 
 # --- wrap_text Tests ---
@@ -118,3 +123,138 @@ class TestCreateDisplayFrame:
         d = make_minimal_decision(reason=long_reason)
         result = create_display_frame(frame, d)
         assert isinstance(result, np.ndarray)
+
+
+# --- render_info_panel Tests ---
+
+def reference_panel(decision, height):
+    """The original uncached panel: every label and value drawn per frame."""
+    panel = np.ones((height, 400, 3), dtype=np.uint8) * 240
+    font, scale, color = cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0)
+    y = 30
+    cv2.putText(panel, "Alpamayo R1 Decision", (10, y), font, 0.8, color, 2)
+    y += 40
+    for text in (f"Frame: {decision.get('frame_id', 'N/A')}",
+                 f"Scene: {decision.get('scene_type', 'N/A')}",
+                 f"Traffic Light: {decision.get('traffic_light', 'N/A')}"):
+        cv2.putText(panel, text, (10, y), font, scale, color, 1)
+        y += 25
+    agents = decision.get('agents', [])
+    cv2.putText(panel, f"Agents: {len(agents)}", (10, y), font, scale, color, 1)
+    y += 25
+    for agent in agents[:3]:
+        cv2.putText(panel, f"  {agent['type']} ({agent['position']})", (10, y), font, scale * 0.8, color, 1)
+        y += 20
+    hazards = decision.get('hazards', [])
+    cv2.putText(panel, f"Hazards: {', '.join(hazards) if hazards else 'None'}", (10, y), font, scale, color, 1)
+    y += 25
+    cv2.putText(panel, f"Decision: {decision.get('decision', 'N/A').upper()}", (10, y),
+                font, scale, (0, 100, 0), 1)
+    y += 25
+    cv2.putText(panel, f"Confidence: {decision.get('confidence', 0.0):.2f}", (10, y), font, scale, color, 1)
+    y += 25
+    cv2.putText(panel, "Reason:", (10, y), font, scale, color, 1)
+    y += 25
+    for line in wrap_text(decision.get('reason', 'N/A'), 35):
+        cv2.putText(panel, line, (10, y), font, scale * 0.8, color, 1)
+        y += 20
+    return panel
+
+
+class TestRenderInfoPanel:
+    @pytest.mark.parametrize("overrides", [
+        {},
+        {"agents": [{"type": "pedestrian", "position": "crossing"}]},
+        {"agents": [{"type": "vehicle", "position": "ahead"}] * 5, "hazards": ["construction", "weather"]},
+        {"decision": "maintain_speed", "confidence": 0.7, "frame_id": 1234},
+        {"reason": "The vehicle detected an unusual scenario " * 3},
+    ])
+    def test_matches_uncached_rendering(self, overrides):
+        decision = make_minimal_decision(**overrides)
+        assert np.array_equal(render_info_panel(decision, 480), reference_panel(decision, 480))
+
+    def test_memo_ignores_frame_id(self):
+        _render_panel.cache_clear()
+        render_info_panel(make_minimal_decision(frame_id=98), 480)
+        render_info_panel(make_minimal_decision(frame_id=99), 480)
+        info = _render_panel.cache_info()
+        assert (info.hits, info.currsize) == (1, 1)
+
+    def test_frame_id_drawn_per_frame(self):
+        a = render_info_panel(make_minimal_decision(frame_id=98), 480)
+        b = render_info_panel(make_minimal_decision(frame_id=99), 480)
+        assert not np.array_equal(a, b)
+        assert np.array_equal(b, reference_panel(make_minimal_decision(frame_id=99), 480))
+
+    def test_different_decisions_render_differently(self):
+        a = render_info_panel(make_minimal_decision(decision="stop"), 480)
+        b = render_info_panel(make_minimal_decision(decision="yield"), 480)
+        assert not np.array_equal(a, b)
+
+    def test_memoized_panel_is_read_only(self):
+        panel = _render_panel(480, _panel_key(make_minimal_decision()))
+        with pytest.raises(ValueError):
+            panel[0, 0] = 0
+
+    def test_panel_matches_requested_height(self):
+        assert render_info_panel(make_minimal_decision(), 123).shape == (123, 400, 3)
+
+
+# --- DisplayRenderer Tests ---
+
+def noise_frame(h, w, seed=0):
+    return np.random.default_rng(seed).integers(0, 255, (h, w, 3), dtype=np.uint8)
+
+
+class TestDisplayRenderer:
+    @pytest.mark.parametrize("size", [(480, 640), (1080, 1920), (100, 100)])
+    @pytest.mark.parametrize("memoize", [True, False])
+    def test_matches_create_display_frame(self, size, memoize):
+        frame = noise_frame(*size)
+        decision = make_minimal_decision(agents=[{"type": "cyclist", "position": "left"}])
+        expected = create_display_frame(frame, decision)
+        result = DisplayRenderer(memoize_panels=memoize).render(frame, decision)
+        assert np.array_equal(result, expected)
+
+    def test_canvas_is_reused(self):
+        renderer = DisplayRenderer()
+        first = renderer.render(noise_frame(720, 1280, 1), make_minimal_decision(frame_id=1))
+        second = renderer.render(noise_frame(720, 1280, 2), make_minimal_decision(frame_id=2))
+        assert first is second
+
+    def test_canvas_reallocated_on_new_frame_size(self):
+        renderer = DisplayRenderer()
+        first = renderer.render(noise_frame(480, 640), make_minimal_decision())
+        first_shape = first.shape
+        second = renderer.render(noise_frame(720, 1280), make_minimal_decision())
+        assert second.shape != first_shape
+
+    def test_output_size(self):
+        assert DisplayRenderer().output_size((1080, 1920, 3)) == (1066 + 400, 600)
+        assert DisplayRenderer().output_size((480, 640, 3)) == (640 + 400, 480)
+
+
+# --- AnnotatedVideoWriter Tests ---
+
+class TestAnnotatedVideoWriter:
+    def test_writes_annotated_frames(self, tmp_path):
+        path = str(tmp_path / "annotated.mp4")
+        with AnnotatedVideoWriter(path, fps=5) as writer:
+            for i in range(6):
+                writer.write(noise_frame(240, 320, i), make_minimal_decision(frame_id=i))
+        assert writer.frames_written == 6
+
+        cap = cv2.VideoCapture(path)
+        assert int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) == 6
+        assert int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) == 320 + 400
+        assert int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) == 240
+        cap.release()
+
+    def test_frame_size_change_raises(self, tmp_path):
+        with AnnotatedVideoWriter(str(tmp_path / "out.mp4"), fps=5) as writer:
+            writer.write(noise_frame(240, 320), make_minimal_decision())
+            with pytest.raises(ValueError, match="Frame size changed"):
+                writer.write(noise_frame(480, 640), make_minimal_decision())
+
+    def test_close_without_frames_is_safe(self, tmp_path):
+        AnnotatedVideoWriter(str(tmp_path / "out.mp4"), fps=5).close()
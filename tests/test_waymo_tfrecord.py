@@ -0,0 +1,265 @@
+"""
+Unit tests for the native Waymo TFRecord reader.
+
+Segments are generated on the fly: Frame protobufs are hand-encoded with
+the same field numbers as waymo_open_dataset/dataset.proto and framed as
+TFRecords, so neither TensorFlow nor the Waymo package is needed.
+"""
+
+import struct
+
+import cv2
+import numpy as np
+import pytest
+from alpamayo_demo.core.policy import AlpamayoPolicy
+from alpamayo_demo.utils.adaptive_sampling import AdaptiveSampler
+from alpamayo_demo.utils.data_loader import VideoFrameStream, open_frame_stream
+from alpamayo_demo.utils.waymo_tfrecord import (
+    CAMERA_NAMES,
+    BundleRing,
+    MultiCameraStream,
+    TFRecordFile,
+    WaymoFrame,
+    WaymoFrameStream,
+    crc32c,
+    masked_crc32c,
+)
+
+
+def varint(value):
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def field_varint(number, value):
+    return varint(number << 3) + varint(value)
+
+
+def field_bytes(number, data):
+    return varint(number << 3 | 2) + varint(len(data)) + data
+
+
+def camera_image(camera, intensity, size=(32, 24)):
+    width, height = size if camera.startswith("FRONT") else (size[0], size[1] * 2 // 3)
+    ok, jpeg = cv2.imencode(".jpg", np.full((height, width, 3), intensity, dtype=np.uint8))
+    # pose (3) and velocity (4) submessages precede the camera-trigger fields in
+    # real data; an opaque one checks that unknown fields are skipped
+    return field_varint(1, CAMERA_NAMES[camera]) + field_bytes(2, jpeg.tobytes()) + field_bytes(3, b"\x09" + b"\0" * 8)
+
+
+def frame_record(index, cameras=("FRONT", "FRONT_LEFT", "FRONT_RIGHT", "SIDE_LEFT", "SIDE_RIGHT")):
+    context = field_bytes(1, b"segment-test")
+    record = field_bytes(1, context) + field_varint(2, 1_500_000_000_000_000 + index * 100_000)
+    record += field_bytes(3, b"\x0d\0\0\0\0")  # pose: one fixed32 field
+    for camera in cameras:
+        record += field_bytes(4, camera_image(camera, (10 * index + CAMERA_NAMES[camera]) % 256))
+    record += field_bytes(5, b"\0" * 64)  # lidar, skipped
+    return record
+
+
+def write_tfrecord(path, records):
+    with open(path, "wb") as f:
+        for data in records:
+            length = struct.pack("<Q", len(data))
+            f.write(length + struct.pack("<I", masked_crc32c(length)))
+            f.write(data + struct.pack("<I", masked_crc32c(data)))
+    return str(path)
+
+
+@pytest.fixture
+def segment(tmp_path):
+    return write_tfrecord(tmp_path / "segment.tfrecord", [frame_record(i) for i in range(20)])
+
+
+def intensity(frame):
+    return int(round(frame.mean()))
+
+
+class TestCrc:
+    def test_crc32c_check_value(self):
+        assert crc32c(b"123456789") == 0xE3069283
+
+    def test_masked_crc_rotates_and_offsets(self):
+        crc = crc32c(b"tfrecord")
+        assert masked_crc32c(b"tfrecord") == (((crc >> 15) | (crc << 17)) + 0xA282EAD8) & 0xFFFFFFFF
+
+
+class TestTFRecordFile:
+    def test_indexes_records(self, segment):
+        with TFRecordFile(segment, verify_data=True) as records:
+            assert len(records) == 20
+            assert bytes(records.record(3)) == frame_record(3)
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.tfrecord"
+        path.write_bytes(b"")
+        with TFRecordFile(str(path)) as records:
+            assert len(records) == 0
+
+    def test_corrupt_length_raises(self, tmp_path, segment):
+        data = bytearray(open(segment, "rb").read())
+        data[0] ^= 0xFF
+        path = tmp_path / "bad.tfrecord"
+        path.write_bytes(bytes(data))
+        with pytest.raises(ValueError, match="Corrupt record length"):
+            TFRecordFile(str(path))
+
+    def test_corrupt_payload_detected_when_verifying(self, tmp_path, segment):
+        data = bytearray(open(segment, "rb").read())
+        data[40] ^= 0xFF
+        path = tmp_path / "bad.tfrecord"
+        path.write_bytes(bytes(data))
+        with TFRecordFile(str(path), verify_data=True) as records:
+            with pytest.raises(ValueError, match="Corrupt record 0"):
+                records.record(0)
+
+    def test_truncated_file_raises(self, tmp_path, segment):
+        data = open(segment, "rb").read()
+        path = tmp_path / "short.tfrecord"
+        path.write_bytes(data[:-10])
+        with pytest.raises(ValueError, match="Truncated"):
+            TFRecordFile(str(path))
+
+
+class TestWaymoFrame:
+    def test_parses_metadata_and_cameras(self):
+        frame = WaymoFrame(frame_record(2))
+        assert frame.context_name == "segment-test"
+        assert frame.timestamp_micros == 1_500_000_000_200_000
+        assert set(frame.images) == set(CAMERA_NAMES)
+
+    def test_selects_cameras(self):
+        frame = WaymoFrame(frame_record(2), cameras=("FRONT", "SIDE_LEFT"))
+        assert set(frame.images) == {"FRONT", "SIDE_LEFT"}
+
+    def test_decodes_lazily(self):
+        frame = WaymoFrame(frame_record(2), cameras=("FRONT_LEFT",))
+        image = frame.images["FRONT_LEFT"]
+        assert isinstance(image.jpeg, (bytes, memoryview))
+        decoded = image.decode()
+        assert decoded.shape == (24, 32, 3)
+        assert abs(intensity(decoded) - 22) <= 2
+
+
+class TestWaymoFrameStream:
+    def test_streams_one_camera_at_sample_rate(self, segment):
+        stream = WaymoFrameStream(segment, camera="FRONT", sample_fps=2)
+        items = list(stream)
+        assert [i for i, _, _ in items] == [0, 5, 10, 15]
+        assert [t for _, t, _ in items] == pytest.approx([0.0, 0.5, 1.0, 1.5])
+        assert [intensity(f) for _, _, f in items] == pytest.approx([1, 51, 101, 151], abs=2)
+        assert stream.stats.sampled == 4 and stream.stats.skipped == 16
+
+    def test_read_at_supports_adaptive_sampling(self, segment):
+        sampler = AdaptiveSampler(low_fps=1, high_fps=10)
+        decision = {"decision": "stop", "confidence": 0.1, "hazards": [], "agents": []}
+        with WaymoFrameStream(segment, camera="SIDE_RIGHT") as stream:
+            indices = [i for i, _, _, _ in sampler.iter_decisions(stream, lambda frame: decision)]
+        assert indices == list(range(20))
+
+    def test_missing_camera_frames_are_skipped(self, tmp_path):
+        path = write_tfrecord(tmp_path / "partial.tfrecord",
+                              [frame_record(0), frame_record(1, cameras=("SIDE_LEFT",)), frame_record(2)])
+        indices = [i for i, _, _ in WaymoFrameStream(path, sample_fps=10)]
+        assert indices == [0, 2]
+
+    def test_invalid_camera_raises(self, segment):
+        with pytest.raises(ValueError, match="Invalid camera"):
+            WaymoFrameStream(segment, camera="REAR")
+
+    def test_missing_file_raises(self, tmp_path):
+        with pytest.raises(ValueError):
+            WaymoFrameStream(str(tmp_path / "nope.tfrecord"))
+
+
+class TestBundleRing:
+    def test_cameras_share_slot_index(self):
+        ring = BundleRing(2, ("FRONT", "SIDE_LEFT"))
+        slot = ring.next_slot()
+        front = ring.buffer(slot, "FRONT", (24, 32, 3))
+        side = ring.buffer(slot, "SIDE_LEFT", (16, 32, 3))
+        assert front.shape == (24, 32, 3) and side.shape == (16, 32, 3)
+        assert ring.nbytes == 2 * (24 + 16) * 32 * 3
+
+    def test_slots_are_reused_round_robin(self):
+        ring = BundleRing(2, ("FRONT",))
+        buffers = [ring.buffer(ring.next_slot(), "FRONT", (4, 4, 3)) for _ in range(3)]
+        assert np.shares_memory(buffers[0], buffers[2])
+        assert not np.shares_memory(buffers[0], buffers[1])
+
+    def test_invalid_size_raises(self):
+        with pytest.raises(ValueError):
+            BundleRing(0, ("FRONT",))
+
+
+class TestMultiCameraStream:
+    def test_yields_time_aligned_bundles(self, segment):
+        cameras = ("FRONT", "FRONT_LEFT", "SIDE_RIGHT")
+        items = list(MultiCameraStream(segment, cameras=cameras, sample_fps=5))
+        assert [i for i, _, _ in items] == list(range(0, 20, 2))
+        for index, _, bundle in items:
+            assert tuple(bundle) == cameras
+            for camera, frame in bundle.items():
+                assert abs(intensity(frame) - (10 * index + CAMERA_NAMES[camera]) % 256) <= 2
+        assert items[0][2]["SIDE_RIGHT"].shape == (16, 32, 3)
+
+    def test_defaults_to_all_cameras(self, segment):
+        with MultiCameraStream(segment) as stream:
+            ok, bundle = stream.read_at(3)
+        assert ok and set(bundle) == set(CAMERA_NAMES)
+
+    def test_ring_bounds_memory(self, segment):
+        stream = MultiCameraStream(segment, cameras=("FRONT", "SIDE_LEFT"), sample_fps=10, buffer_size=3)
+        bundles = [bundle for _, _, bundle in stream]
+        assert len(bundles) == 20
+        assert stream.ring.nbytes == 3 * (24 + 16) * 32 * 3
+        # Bundle 4 lives in the slot of bundle 1, for every camera
+        assert all(np.shares_memory(bundles[1][c], bundles[4][c]) for c in ("FRONT", "SIDE_LEFT"))
+
+    def test_ring_contents_match_fresh_decode(self, segment):
+        fresh = MultiCameraStream(segment, cameras=("FRONT", "SIDE_LEFT"), sample_fps=2)
+        ringed = MultiCameraStream(segment, cameras=("FRONT", "SIDE_LEFT"), sample_fps=2, buffer_size=2)
+        for (_, _, expected), (_, _, actual) in zip(fresh, ringed):
+            for camera in expected:
+                np.testing.assert_array_equal(expected[camera], actual[camera])
+
+    def test_incomplete_records_are_skipped(self, tmp_path):
+        path = write_tfrecord(tmp_path / "partial.tfrecord",
+                              [frame_record(0), frame_record(1, cameras=("FRONT",)), frame_record(2)])
+        stream = MultiCameraStream(path, cameras=("FRONT", "SIDE_LEFT"), sample_fps=10)
+        assert [i for i, _, _ in stream] == [0, 2]
+        assert stream.stats.sampled == 2 and stream.stats.skipped == 1
+
+    def test_decide_bundle_accepts_stream_output(self, segment):
+        with MultiCameraStream(segment, cameras=("FRONT", "FRONT_RIGHT")) as stream:
+            ok, bundle = stream.read_at(0)
+        decision = AlpamayoPolicy(mock=True).decide_bundle(bundle, "Decide.", output="dict")
+        assert "decision" in decision
+
+    def test_invalid_cameras_raise(self, segment):
+        with pytest.raises(ValueError, match="Invalid camera"):
+            MultiCameraStream(segment, cameras=("FRONT", "REAR"))
+        with pytest.raises(ValueError):
+            MultiCameraStream(segment, cameras=())
+
+
+class TestOpenFrameStream:
+    def test_tfrecord_path_opens_waymo_stream(self, segment):
+        with open_frame_stream(segment, sample_fps=1, camera="FRONT_RIGHT") as stream:
+            assert isinstance(stream, WaymoFrameStream)
+            assert stream.camera == "FRONT_RIGHT"
+
+    def test_video_path_opens_video_stream(self, tmp_path):
+        path = str(tmp_path / "clip.mp4")
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), 10, (32, 24))
+        writer.write(np.zeros((24, 32, 3), dtype=np.uint8))
+        writer.release()
+        with open_frame_stream(path) as stream:
+            assert isinstance(stream, VideoFrameStream)